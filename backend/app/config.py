@@ -11,14 +11,80 @@ CORS_ORIGINS = [NEXT_PUBLIC_API_BASE]
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./data/uploads")
 SQLITE_PATH = os.getenv("SQLITE_PATH", "./data/hinder.db")
+# Connection settings applied to every SQLite connection (db/tuning.py)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # DELETE on filesystems without shared memory
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "16"))  # page cache per connection
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))  # per engine (sync and async)
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "16"))
 
 CHROMA_DIR = os.getenv("CHROMA_DIR", "./chroma_data")
 CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "profiles_vectors")
 
+# Vector index backend: chroma (persistent HNSW) | numpy (exact, in-process, snapshotted)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+NUMPY_INDEX_DIR = os.getenv("NUMPY_INDEX_DIR", "./data/vector_index")
+NUMPY_SNAPSHOT_EVERY = int(os.getenv("NUMPY_SNAPSHOT_EVERY", "500"))  # writes between snapshots; 0 = only on flush
+VECTOR_WRITE_CHUNK = int(os.getenv("VECTOR_WRITE_CHUNK", "500"))  # rows per bulk upsert/delete call
+STORED_VECTOR_CACHE_SIZE = int(os.getenv("STORED_VECTOR_CACHE_SIZE", "4096"))  # profile vectors kept in memory for /matches
+MATCH_TOPIC_WEIGHT = float(os.getenv("MATCH_TOPIC_WEIGHT", "0.5"))  # weight of the topic vector added to the stored profile vector
+# Materialized /matches lists (services/match_table.py): rows kept per user, and how many
+# vector neighbours of a re-indexed profile get it re-scored into their lists
+MATCH_TABLE_ENABLED = os.getenv("MATCH_TABLE_ENABLED", "1") == "1"
+MATCH_TABLE_K = int(os.getenv("MATCH_TABLE_K", "50"))
+MATCH_TABLE_NEIGHBORS = int(os.getenv("MATCH_TABLE_NEIGHBORS", "200"))
+# /matches response cache (services/match_cache.py)
+MATCH_CACHE_ENABLED = os.getenv("MATCH_CACHE_ENABLED", "1") == "1"
+MATCH_CACHE_TTL_S = float(os.getenv("MATCH_CACHE_TTL_S", "60"))
+MATCH_CACHE_MAX_MB = int(os.getenv("MATCH_CACHE_MAX_MB", "64"))
+# /search keyword side (db/fts.py): BM25 hits fused with vector hits in mode=hybrid
+SEARCH_KEYWORD_CANDIDATES = int(os.getenv("SEARCH_KEYWORD_CANDIDATES", "200"))
+SEARCH_RRF_K = int(os.getenv("SEARCH_RRF_K", "60"))
+# /search ranked-result cache behind next_cursor (services/search_cursors.py)
+SEARCH_CURSOR_DEPTH = int(os.getenv("SEARCH_CURSOR_DEPTH", "1000"))  # ids ranked per query
+SEARCH_CURSOR_TTL_S = float(os.getenv("SEARCH_CURSOR_TTL_S", "300"))
+SEARCH_CURSOR_MAX_IDS = int(os.getenv("SEARCH_CURSOR_MAX_IDS", "200000"))  # across all cached queries
+# In-memory skill/topic/hackathon/availability bitmaps (services/bitmap_index.py): filtered
+# queries whose candidate set is at most BITMAP_EXACT_MAX profiles score just those vectors
+BITMAP_INDEX_ENABLED = os.getenv("BITMAP_INDEX_ENABLED", "1") == "1"
+BITMAP_EXACT_MAX = int(os.getenv("BITMAP_EXACT_MAX", "2000"))
+# Profile-processing job queue (services/jobs.py): async workers per process (0 = this
+# process only enqueues), concurrent calls per pipeline stage, the claim lease a worker
+# renews while it runs a job, and retries with exponential backoff
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_PDF_CONCURRENCY = int(os.getenv("JOB_PDF_CONCURRENCY", "2"))
+JOB_LLM_CONCURRENCY = int(os.getenv("JOB_LLM_CONCURRENCY", "4"))
+JOB_EMBED_CONCURRENCY = int(os.getenv("JOB_EMBED_CONCURRENCY", "4"))
+JOB_LEASE_S = float(os.getenv("JOB_LEASE_S", "60"))
+JOB_POLL_S = float(os.getenv("JOB_POLL_S", "1"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_BACKOFF_S = float(os.getenv("JOB_BACKOFF_S", "5"))
+JOB_BACKOFF_MAX_S = float(os.getenv("JOB_BACKOFF_MAX_S", "300"))
+BATCH_MATCH_CHUNK = int(os.getenv("BATCH_MATCH_CHUNK", "256"))  # users per multi-query in /admin/matches/batch
+# Open the vector store in a background thread at startup (0 = on first request)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 EMBEDDINGS_PROVIDER = os.getenv("EMBEDDINGS_PROVIDER", "local")  # local|gemini
+GEMINI_EMBED_MODEL = os.getenv("GEMINI_EMBED_MODEL", "text-embedding-004")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "4"))
+GEMINI_BATCH_WINDOW_MS = float(os.getenv("GEMINI_BATCH_WINDOW_MS", "5"))
+GEMINI_TIMEOUT_S = float(os.getenv("GEMINI_TIMEOUT_S", "30"))
+# Embedding cache: in-process LRU in front of a size-bounded SQLite file ("" disables the file tier)
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "./data/embed_cache.db")
+EMBED_CACHE_MAX_MB = int(os.getenv("EMBED_CACHE_MAX_MB", "256"))
+EMBED_CACHE_LRU_SIZE = int(os.getenv("EMBED_CACHE_LRU_SIZE", "4096"))
+# Extracted resume text (by PDF sha256) and parse output (by model, prompt and text
+# sha256), so a repeated upload or a reembed skips PDF extraction and the LLM ("" disables)
+CONTENT_CACHE_PATH = os.getenv("CONTENT_CACHE_PATH", "./data/content_cache.db")
+CONTENT_CACHE_MAX_MB = int(os.getenv("CONTENT_CACHE_MAX_MB", "64"))
+PARSE_CACHE_MAX_MB = int(os.getenv("PARSE_CACHE_MAX_MB", "64"))
+PARSE_CACHE_TTL_S = float(os.getenv("PARSE_CACHE_TTL_S", str(30 * 24 * 3600)))  # 0 = no expiry
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-5-haiku-latest")
 
 RERANK_PROVIDER = os.getenv("RERANK_PROVIDER", "none")
@@ -31,6 +97,13 @@ BRIGHTDATA_ENABLED = os.getenv("BRIGHTDATA_ENABLED", "0") == "1"
 BRIGHTDATA_API_KEY = os.getenv("BRIGHTDATA_API_KEY", "")
 
 ALLOWED_PDF_MB = 10
+# Resume text extraction (services/pdf.py): worker processes (0 = a thread in the API
+# process) and per-document budgets. Parsing sends the LLM at most 12000 characters,
+# so extraction stops there.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "12000"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_TIMEOUT_S = float(os.getenv("PDF_TIMEOUT_S", "20"))
 
 # Auth
 JWT_SECRET = os.getenv("JWT_SECRET", "dev_secret_change_me")
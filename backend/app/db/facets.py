@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from collections import Counter
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, delete
+from .models import FacetCount, Profile
+from ..utils.json import json_to_list
+from ..services.normalize import normalize_list
+
+# Facet counts over ready profiles, kept as counters rather than computed per request:
+# each write path snapshots the profile before and after the change and applies the
+# difference, so reading a facet touches one row per distinct value, however many
+# profiles there are. Counters for one (hackathon, availability) cell are stored both
+# under the profile's hackathon and under ALL.
+
+ALL = "*"
+TOTAL = "_total"
+FIELDS = ("skills", "topics", "hackathon", "school", "company")
+
+
+class Snapshot(NamedTuple):
+    hackathon: str
+    available_now: bool
+    values: FrozenSet[Tuple[str, str]]  # (field, value), TOTAL included
+
+
+def snapshot(p: Optional[Profile]) -> Optional[Snapshot]:
+    """What p contributes to the counters; None unless it is ready (searchable)."""
+    if p is None or p.status != "ready":
+        return None
+    values = {(TOTAL, "")}
+    # the same names the term tables and search filters use, so "Rust" and "rust" share a bucket
+    values.update(("skills", s) for s in normalize_list(json_to_list(p.skills_norm_json)) if s)
+    values.update(("topics", t) for t in normalize_list(json_to_list(p.topics_json)) if t)
+    for field in ("hackathon", "school", "company"):
+        v = getattr(p, field)
+        if v:
+            values.add((field, v))
+    return Snapshot(p.hackathon or "", bool(p.available_now), frozenset(values))
+
+
+def _deltas(changes: Iterable[Tuple[Optional[Snapshot], Optional[Snapshot]]]) -> Counter:
+    out: Counter = Counter()
+    for before, after in changes:
+        if before == after:
+            continue
+        for snap, sign in ((before, -1), (after, 1)):
+            if snap is None:
+                continue
+            scopes = (ALL, snap.hackathon) if snap.hackathon else (ALL,)
+            for scope in scopes:
+                for field, value in snap.values:
+                    out[(scope, snap.available_now, field, value)] += sign
+    return out
+
+
+def apply(db: Session, changes: Iterable[Tuple[Optional[Snapshot], Optional[Snapshot]]]) -> None:
+    """Apply (before, after) snapshot pairs inside the caller's transaction."""
+    deltas = {k: d for k, d in _deltas(changes).items() if d}
+    if not deltas:
+        return
+    conn = db.connection()
+    stmt = sqlite_insert(FacetCount)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["hackathon", "available_now", "field", "value"],
+            set_={"n": FacetCount.n + stmt.excluded.n},
+        ),
+        [{"hackathon": h, "available_now": a, "field": f, "value": v, "n": d} for (h, a, f, v), d in deltas.items()],
+    )
+    if any(d < 0 for d in deltas.values()):
+        conn.execute(delete(FacetCount).where(FacetCount.n <= 0))
+
+
+def rebuild(db: Session, chunk_size: int = 1000) -> int:
+    """Recount from the ready profiles in SQLite; returns the number of profiles counted."""
+    db.connection().execute(delete(FacetCount))
+    total, offset = 0, 0
+    while True:
+        batch = db.exec(
+            select(Profile).where(Profile.status == "ready").order_by(Profile.id).offset(offset).limit(chunk_size)
+        ).all()
+        if not batch:
+            break
+        apply(db, [(None, snapshot(p)) for p in batch])
+        total += len(batch)
+        offset += len(batch)
+    db.commit()
+    return total
+
+
+def counts(db: Session, hackathon: Optional[str] = None, available_now: Optional[bool] = None,
+           fields: Sequence[str] = FIELDS, limit: Optional[int] = None) -> Tuple[int, Dict[str, List[Tuple[str, int]]]]:
+    """(profiles in scope, {field: [(value, count)] most common first})."""
+    stmt = (
+        select(FacetCount.field, FacetCount.value, func.sum(FacetCount.n))
+        .where(FacetCount.hackathon == (hackathon or ALL), FacetCount.field.in_([TOTAL, *fields]))
+        .group_by(FacetCount.field, FacetCount.value)
+    )
+    if available_now is not None:
+        stmt = stmt.where(FacetCount.available_now == available_now)
+    total = 0
+    out: Dict[str, List[Tuple[str, int]]] = {f: [] for f in fields}
+    for field, value, n in db.exec(stmt):
+        if field == TOTAL:
+            total = int(n)
+        else:
+            out[field].append((value, int(n)))
+    for field, rows in out.items():
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        if limit is not None:
+            del rows[limit:]
+    return total, out
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Any, Iterable, List, Optional, Sequence
+import re
+from sqlalchemy import column, table, text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+from .models import Profile
+from ..utils.json import json_to_list
+
+# Keyword index over indexed (ready) profiles, written wherever the vector index is
+# written so the two hold the same profiles. profile_text is a plain table keyed by
+# profile id; profile_fts is an external-content FTS5 table over it, kept in step by
+# triggers, so a profile's row is replaced through the id index rather than a scan.
+
+TABLE = "profile_fts"
+CONTENT = "profile_text"
+COLUMNS = ("name", "headline", "skills", "topics", "company", "school")
+# bm25() weights, in COLUMNS order
+WEIGHTS = (3.0, 1.0, 2.0, 1.5, 2.0, 2.0)
+
+_fts = table(TABLE, column("rowid"))
+_content = table(CONTENT, column("rowid"), column("id"))
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def create(conn: Connection) -> None:
+    cols = ", ".join(COLUMNS)
+    new = ", ".join("new." + c for c in COLUMNS)
+    old = ", ".join("old." + c for c in COLUMNS)
+    for ddl in (
+        f"CREATE TABLE IF NOT EXISTS {CONTENT} (rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, "
+        + ", ".join(f"{c} TEXT" for c in COLUMNS) + ")",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5({cols}, content='{CONTENT}', "
+        "content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {CONTENT}_ai AFTER INSERT ON {CONTENT} BEGIN "
+        f"INSERT INTO {TABLE} (rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {CONTENT}_ad AFTER DELETE ON {CONTENT} BEGIN "
+        f"INSERT INTO {TABLE} ({TABLE}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {CONTENT}_au AFTER UPDATE ON {CONTENT} BEGIN "
+        f"INSERT INTO {TABLE} ({TABLE}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {TABLE} (rowid, {cols}) VALUES (new.rowid, {new}); END",
+    ):
+        conn.execute(text(ddl))
+
+
+def is_empty(conn: Connection) -> bool:
+    return conn.execute(text(f"SELECT 1 FROM {CONTENT} LIMIT 1")).first() is None
+
+
+def _row(p: Profile) -> dict:
+    return {
+        "id": p.id,
+        "name": p.name or "",
+        "headline": p.headline or "",
+        "skills": ", ".join(json_to_list(p.skills_norm_json)),
+        "topics": ", ".join(json_to_list(p.topics_json)),
+        "company": p.company or "",
+        "school": p.school or "",
+    }
+
+
+def delete(db: Session, ids: Iterable[str]) -> None:
+    ids = list(ids)
+    if ids:
+        db.connection().execute(text(f"DELETE FROM {CONTENT} WHERE id = :id"), [{"id": pid} for pid in ids])
+
+
+def upsert(db: Session, profiles: Sequence[Profile]) -> None:
+    """(Re)write profiles' rows inside the session's transaction; the caller commits."""
+    if not profiles:
+        return
+    db.connection().execute(
+        text(
+            f"INSERT INTO {CONTENT} (id, {', '.join(COLUMNS)}) VALUES (:id, {', '.join(':' + c for c in COLUMNS)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in COLUMNS)}"
+        ),
+        [_row(p) for p in profiles],
+    )
+
+
+def rebuild(db: Session, chunk_size: int = 1000) -> int:
+    """Replace the whole table with the ready profiles in SQLite (backfill, reindex)."""
+    db.connection().execute(text(f"DELETE FROM {CONTENT}"))
+    total, offset = 0, 0
+    while True:
+        batch = db.exec(
+            select(Profile).where(Profile.status == "ready").order_by(Profile.id).offset(offset).limit(chunk_size)
+        ).all()
+        if not batch:
+            break
+        upsert(db, batch)
+        total += len(batch)
+        offset += len(batch)
+    db.commit()
+    return total
+
+
+def match_expression(query: Optional[str]) -> Optional[str]:
+    """User text as an FTS5 query: every word must match, each quoted so operators
+    and punctuation in the input are taken literally. None when there are no words."""
+    terms = _TOKEN.findall(query or "")
+    if not terms:
+        return None
+    return " ".join('"' + t + '"' for t in terms)
+
+
+def search(db: Session, query: Optional[str], limit: Optional[int] = None, within: Optional[Any] = None) -> List[str]:
+    """Profile ids matching query, best BM25 first; within is an optional subquery of
+    allowed profile ids, applied in the same statement."""
+    expr = match_expression(query)
+    if expr is None:
+        return []
+    stmt = (
+        select(_content.c.id)
+        .select_from(_fts.join(_content, _content.c.rowid == _fts.c.rowid))
+        .where(text(f"{TABLE} MATCH :q").bindparams(q=expr))
+        .order_by(text(f"bm25({TABLE}, {', '.join(map(str, WEIGHTS))})"))
+    )
+    if within is not None:
+        stmt = stmt.where(_content.c.id.in_(within))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [r[0] for r in db.connection().execute(stmt)]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Callable, List
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from .models import MatchLog, Profile, Upload
+
+# Schema changes for databases created by earlier versions. create_all() creates
+# missing tables with every current column and index but leaves existing tables
+# alone, so each step here brings an existing table forward. A step must be a no-op
+# on a table create_all() just made, and on one it already changed (a crash between
+# a step and its version bump re-runs it). The schema version is SQLite's
+# user_version: step i (0-based) has run once user_version > i. Append new steps;
+# never reorder.
+
+
+def _columns(conn: Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))}
+
+
+def _profile_contact_info(conn: Connection) -> None:
+    if "contact_info_json" not in _columns(conn, "profile"):
+        conn.execute(text("ALTER TABLE profile ADD COLUMN contact_info_json TEXT DEFAULT '{}'"))
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    # the indexes declared on the models: Profile by owner, status and
+    # (hackathon, available_now); MatchLog by user and candidate
+    for table in (Profile.__table__, MatchLog.__table__):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _upload_sha256(conn: Connection) -> None:
+    # content hash for deduplicated storage; older uploads keep their own files
+    columns = _columns(conn, "upload")
+    if not columns:
+        return  # no table to bring forward
+    if "sha256" not in columns:
+        conn.execute(text("ALTER TABLE upload ADD COLUMN sha256 VARCHAR"))
+    for index in Upload.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _normalize_terms(conn: Connection) -> None:
+    # term names are now normalized (lowercase, aliases); drop the links and terms so
+    # init_db's backfill rebuilds them from the profiles
+    for table in ("profile_skill", "profile_topic", "skill", "topic"):
+        if _columns(conn, table):
+            conn.execute(text(f"DELETE FROM {table}"))
+
+
+
+def _normalize_facets(conn: Connection) -> None:
+    # skill/topic facet values are normalized the same way; init_db recounts them
+    if _columns(conn, "facet_count"):
+        conn.execute(text("DELETE FROM facet_count"))
+
+
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _profile_contact_info,
+    _hot_path_indexes,
+    _upload_sha256,
+    _normalize_terms,
+    _normalize_facets,
+]
+
+
+def version(conn: Connection) -> int:
+    return int(conn.execute(text("PRAGMA user_version")).scalar() or 0)
+
+
+def migrate(engine: Engine) -> int:
+    """Run the pending steps in order, recording each in user_version; returns the schema version."""
+    with engine.connect() as conn:
+        current = version(conn)
+    for i in range(current, len(MIGRATIONS)):
+        with engine.begin() as conn:
+            MIGRATIONS[i](conn)
+            conn.execute(text(f"PRAGMA user_version = {i + 1}"))
+    return max(current, len(MIGRATIONS))
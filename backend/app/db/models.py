@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 import json
@@ -8,6 +9,9 @@ import json
 class Upload(SQLModel, table=True):
     file_id: str = Field(primary_key=True)
     user_id: int
+    # Uploads with the same content share one stored file (services/upload_store.py); the
+    # rows with its sha256 are its references. NULL for uploads stored before dedupe.
+    sha256: Optional[str] = Field(default=None, index=True)
     path: str
     mime: str
     size: int
@@ -24,8 +28,10 @@ class User(SQLModel, table=True):
 
 
 class Profile(SQLModel, table=True):
+    # indexes on tables that predate them are added by db/migrations.py
+    __table_args__ = (Index("ix_profile_hackathon_available", "hackathon", "available_now"),)
     id: str = Field(primary_key=True)
-    user_id: Optional[int] = None
+    user_id: Optional[int] = Field(default=None, index=True)
     name: Optional[str] = None
     headline: Optional[str] = None
     email: Optional[str] = None
@@ -39,7 +45,7 @@ class Profile(SQLModel, table=True):
     interests_json: str = Field(default_factory=lambda: json.dumps([]))
     topics_json: str = Field(default_factory=lambda: json.dumps([]))
     available_now: bool = Field(default=False)
-    status: str = Field(default="pending")
+    status: str = Field(default="pending", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     source: Optional[str] = None
@@ -51,8 +57,8 @@ class Profile(SQLModel, table=True):
 
 class MatchLog(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str
-    candidate_id: str
+    user_id: str = Field(index=True)
+    candidate_id: str = Field(index=True)
     score_vector: Optional[float] = None
     score_keyword: Optional[float] = None
     score_blended: Optional[float] = None
@@ -68,3 +74,83 @@ class Intro(SQLModel, table=True):
     message: str
     delivered: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Job(SQLModel, table=True):
+    # Durable profile-processing queue (services/jobs.py): queued -> running -> done | failed.
+    # A running job belongs to lease_owner until lease_expires_at; the owner renews the
+    # lease while it works, so a lapsed lease means the worker died and the job is requeued.
+    # claim order: the first due row walking (state, priority DESC, id)
+    __table_args__ = (Index("ix_job_claim", "state", text("priority DESC"), "id"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    profile_id: str = Field(index=True)
+    state: str = Field(default="queued")
+    priority: int = 0  # higher runs first
+    attempts: int = 0
+    max_attempts: int = 3
+    run_after: datetime = Field(default_factory=datetime.utcnow)  # retries back off by pushing this out
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class MatchCandidateSet(SQLModel, table=True):
+    # One materialized /matches list per (user, hackathon filter; "" = any hackathon).
+    # size = leading rows known to be the exact top of the pool; exhausted = the pool
+    # had fewer than the materialized k, so the list is complete at any k.
+    user_id: str = Field(primary_key=True)
+    hackathon: str = Field(default="", primary_key=True)
+    size: int = 0
+    exhausted: bool = Field(default=False)
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class MatchCandidate(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    hackathon: str = Field(default="", primary_key=True)
+    candidate_id: str = Field(primary_key=True, index=True)
+    rank: int
+    score_vector: float
+    score_keyword: float
+    score_blended: float
+
+
+# Skills and topics normalized out of Profile's JSON columns (which stay the API's
+# source of truth). Each link table's primary key serves per-profile rewrites; the
+# reverse (term, profile) index serves IN filters and GROUP BY counts.
+
+class Skill(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(index=True, sa_column_kwargs={"unique": True})
+
+
+class Topic(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(index=True, sa_column_kwargs={"unique": True})
+
+
+class ProfileSkill(SQLModel, table=True):
+    __tablename__ = "profile_skill"
+    __table_args__ = (Index("ix_profile_skill_skill_profile", "skill_id", "profile_id"),)
+    profile_id: str = Field(primary_key=True)
+    skill_id: int = Field(primary_key=True)
+
+
+class ProfileTopic(SQLModel, table=True):
+    __tablename__ = "profile_topic"
+    __table_args__ = (Index("ix_profile_topic_topic_profile", "topic_id", "profile_id"),)
+    profile_id: str = Field(primary_key=True)
+    topic_id: int = Field(primary_key=True)
+
+
+class FacetCount(SQLModel, table=True):
+    # Ready profiles per facet value, maintained incrementally on writes (db/facets.py).
+    # hackathon "*" aggregates every hackathon; field "_total" / value "" counts profiles.
+    __tablename__ = "facet_count"
+    hackathon: str = Field(primary_key=True)
+    available_now: bool = Field(primary_key=True)
+    field: str = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    n: int = 0
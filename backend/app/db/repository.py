@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import Profile
+from ..utils.json import json_to_list, json_to_dict
+
+# SQLite caps bound parameters per statement (999 on older builds)
+_IN_CHUNK = 500
+
+
+class ProfileRow:
+    """A Profile with its JSON columns parsed once, for read-only hydration."""
+
+    __slots__ = ("profile", "skills_norm", "interests", "topics", "contact_info")
+
+    def __init__(self, profile: Profile) -> None:
+        self.profile = profile
+        self.skills_norm: List[str] = json_to_list(profile.skills_norm_json)
+        self.interests: List[str] = json_to_list(profile.interests_json)
+        self.topics: List[str] = json_to_list(profile.topics_json)
+        self.contact_info: Dict[str, Any] = json_to_dict(getattr(profile, "contact_info_json", None))
+
+    @property
+    def id(self) -> str:
+        return self.profile.id
+
+
+class ProfileRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get(self, profile_id: str) -> Optional[ProfileRow]:
+        p = self.db.get(Profile, profile_id)
+        return ProfileRow(p) if p else None
+
+    def get_many(self, ids: Iterable[str]) -> List[ProfileRow]:
+        """Rows for ids in input order, one SELECT ... IN per 500 ids; unknown ids are skipped."""
+        ids = list(dict.fromkeys(ids))
+        found: Dict[str, Profile] = {}
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            for p in self.db.exec(select(Profile).where(Profile.id.in_(chunk))):
+                found[p.id] = p
+        return [ProfileRow(found[pid]) for pid in ids if pid in found]
+
+
+class AsyncProfileRepository:
+    """ProfileRepository over an AsyncSession."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, profile_id: str) -> Optional[ProfileRow]:
+        p = await self.db.get(Profile, profile_id)
+        return ProfileRow(p) if p else None
+
+    async def get_many(self, ids: Iterable[str]) -> List[ProfileRow]:
+        ids = list(dict.fromkeys(ids))
+        found: Dict[str, Profile] = {}
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            for p in await self.db.exec(select(Profile).where(Profile.id.in_(chunk))):
+                found[p.id] = p
+        return [ProfileRow(found[pid]) for pid in ids if pid in found]
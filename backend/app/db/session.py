@@ -1,25 +1,51 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
 import os
 from ..config import SQLITE_PATH
+from . import facets, fts, migrations, terms, tuning
 
 os.makedirs(os.path.dirname(SQLITE_PATH), exist_ok=True)
-engine = create_engine(f"sqlite:///{SQLITE_PATH}", echo=False)
+engine = tuning.install(create_engine(f"sqlite:///{SQLITE_PATH}", echo=False, **tuning.ENGINE_KWARGS))
+# Same database through aiosqlite: statements run on the driver's thread, so request
+# handlers await them instead of blocking the event loop. Startup, the pipeline and
+# the admin routes keep the sync engine.
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLITE_PATH}", echo=False, **tuning.ENGINE_KWARGS)
+tuning.install(async_engine.sync_engine)
 
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
-    # Add contact_info_json column if missing (for existing databases)
-    try:
-        with engine.connect() as conn:
-            res = conn.execute(text("PRAGMA table_info('profile')"))
-            cols = {row[1] for row in res}
-            if 'contact_info_json' not in cols:
-                conn.execute(text("ALTER TABLE profile ADD COLUMN contact_info_json TEXT DEFAULT '{}'"))
-                conn.commit()
-    except Exception:
-        pass
+    # bring tables from earlier versions forward (columns, indexes)
+    migrations.migrate(engine)
+    # keyword index; backfilled once for databases that predate it
+    with engine.begin() as conn:
+        fts.create(conn)
+        backfill = fts.is_empty(conn)
+    if backfill:
+        with Session(engine) as db:
+            fts.rebuild(db)
+    # skill/topic link tables, likewise
+    with engine.connect() as conn:
+        backfill = terms.is_empty(conn) and conn.execute(text("SELECT 1 FROM profile LIMIT 1")).first() is not None
+    if backfill:
+        with Session(engine) as db:
+            terms.rebuild(db)
+    # facet counters, likewise
+    with engine.connect() as conn:
+        backfill = (conn.execute(text("SELECT 1 FROM facet_count LIMIT 1")).first() is None
+                    and conn.execute(text("SELECT 1 FROM profile WHERE status = 'ready' LIMIT 1")).first() is not None)
+    if backfill:
+        with Session(engine) as db:
+            facets.rebuild(db)
 
 
 def get_session() -> Session:
     return Session(engine)
+
+
+def get_async_session() -> AsyncSession:
+    # objects stay loaded after commit: an expired attribute would need a lazy load,
+    # which an async session can't do implicitly
+    return AsyncSession(async_engine, expire_on_commit=False)
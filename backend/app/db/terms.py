@@ -0,0 +1,106 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select, delete
+from .models import Profile, ProfileSkill, ProfileTopic, Skill, Topic
+from ..utils.json import json_to_list
+from ..services.normalize import normalize_list
+
+# profile_skill / profile_topic rows mirror skills_norm_json / topics_json; every
+# path that writes those columns calls sync() in the same transaction. Fields are
+# named as in vector-store filters ("skills_norm", "topics"). Names are stored and
+# looked up through normalize_list, as the vector store and bitmap index key them, so
+# filters match case-insensitively on every search path.
+
+_IN_CHUNK = 500
+
+# field -> (term model, link model, link term column, Profile JSON column)
+FIELDS: Dict[str, Tuple[Any, Any, Any, str]] = {
+    "skills_norm": (Skill, ProfileSkill, ProfileSkill.skill_id, "skills_norm_json"),
+    "topics": (Topic, ProfileTopic, ProfileTopic.topic_id, "topics_json"),
+}
+
+
+def _chunks(seq: Sequence, n: int = _IN_CHUNK):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+def _term_ids(conn: Connection, model: Any, names: Iterable[str], create: bool) -> Dict[str, int]:
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    if create:
+        conn.execute(sqlite_insert(model).on_conflict_do_nothing(index_elements=["name"]), [{"name": n} for n in names])
+    out: Dict[str, int] = {}
+    for chunk in _chunks(names):
+        out.update((name, tid) for tid, name in conn.execute(select(model.id, model.name).where(model.name.in_(chunk))))
+    return out
+
+
+def delete_profiles(db: Session, ids: Iterable[str]) -> None:
+    ids = list(ids)
+    conn = db.connection()
+    for _, link, _, _ in FIELDS.values():
+        for chunk in _chunks(ids):
+            conn.execute(delete(link).where(link.profile_id.in_(chunk)))
+
+
+def sync(db: Session, profiles: Sequence[Profile]) -> None:
+    """Rewrite the link rows of profiles from their JSON columns; the caller commits."""
+    if not profiles:
+        return
+    conn = db.connection()
+    delete_profiles(db, [p.id for p in profiles])
+    for model, link, term_col, column in FIELDS.values():
+        values = {p.id: [n for n in normalize_list(json_to_list(getattr(p, column))) if n] for p in profiles}
+        ids = _term_ids(conn, model, (n for names in values.values() for n in names), create=True)
+        rows = [{"profile_id": pid, term_col.key: ids[n]} for pid, names in values.items() for n in set(names)]
+        if rows:
+            conn.execute(insert(link), rows)
+
+
+def is_empty(conn: Connection) -> bool:
+    return all(conn.execute(select(link.profile_id).limit(1)).first() is None for _, link, _, _ in FIELDS.values())
+
+
+def rebuild(db: Session, chunk_size: int = 1000) -> int:
+    """Repopulate both link tables from every profile's JSON columns (backfill)."""
+    conn = db.connection()
+    for _, link, _, _ in FIELDS.values():
+        conn.execute(delete(link))
+    total, offset = 0, 0
+    while True:
+        batch = db.exec(select(Profile).order_by(Profile.id).offset(offset).limit(chunk_size)).all()
+        if not batch:
+            break
+        sync(db, batch)
+        total += len(batch)
+        offset += len(batch)
+    db.commit()
+    return total
+
+
+def having_any(db: Session, field: str, names: Sequence[str]):
+    """Subquery of profile ids holding at least one of names, for Profile.id.in_()."""
+    model, link, term_col, _ = FIELDS[field]
+    ids = list(_term_ids(db.connection(), model, normalize_list(list(names)), create=False).values())
+    return select(link.profile_id).where(term_col.in_(ids)).distinct()
+
+
+def counts(db: Session, field: str, where: Sequence[Any] = (), limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """(term, profiles) pairs, most common first; where filters the Profile rows counted."""
+    model, link, term_col, _ = FIELDS[field]
+    stmt = (
+        select(model.name, func.count(link.profile_id).label("n"))
+        .join(link, term_col == model.id)
+        .group_by(model.id)
+        .order_by(func.count(link.profile_id).desc(), model.name)
+    )
+    if where:
+        stmt = stmt.join(Profile, Profile.id == link.profile_id).where(*where)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [(name, int(n)) for name, n in db.exec(stmt)]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..config import (
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_MB, SQLITE_MMAP_MB,
+    SQLITE_POOL_SIZE, SQLITE_MAX_OVERFLOW,
+)
+
+# Per-connection SQLite settings. WAL lets readers run alongside the single writer
+# instead of waiting out its lock, and with synchronous=NORMAL a commit no longer
+# fsyncs (the WAL is synced at checkpoints; a power loss can drop the last commits,
+# never corrupt the file). busy_timeout makes a second writer wait for the lock
+# rather than fail with "database is locked".
+
+PRAGMAS: List[Tuple[str, Any]] = [
+    ("journal_mode", SQLITE_JOURNAL_MODE),
+    ("synchronous", SQLITE_SYNCHRONOUS),
+    ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),
+    ("cache_size", -SQLITE_CACHE_MB * 1024),  # negative: KiB rather than pages
+    ("mmap_size", SQLITE_MMAP_MB * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+]
+
+# create_engine() arguments shared by the sync and async engines; connections are
+# used from the threadpool, the pipeline's threads and aiosqlite's worker threads
+ENGINE_KWARGS: Dict[str, Any] = {
+    "pool_size": SQLITE_POOL_SIZE,
+    "max_overflow": SQLITE_MAX_OVERFLOW,
+    "connect_args": {"check_same_thread": False},
+}
+
+
+def _apply(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in PRAGMAS:
+            cur.execute(f"PRAGMA {name}={value}")
+    finally:
+        cur.close()
+
+
+def install(engine: Engine) -> Engine:
+    """Apply PRAGMAS to every new connection of engine (for an AsyncEngine pass .sync_engine)."""
+    event.listen(engine, "connect", _apply)
+    return engine
+
+
+def settings(conn) -> Dict[str, Any]:
+    """The PRAGMAS as a connection reports them, for /admin/stats."""
+    return {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name, _ in PRAGMAS}
@@ -1,7 +1,8 @@
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 from fastapi import Depends
 from sqlmodel import Session
-from .db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .db.session import get_session, get_async_session
 
 def get_db() -> Iterator[Session]:
     db = get_session()
@@ -9,3 +10,11 @@ def get_db() -> Iterator[Session]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    db = get_async_session()
+    try:
+        yield db
+    finally:
+        await db.close()
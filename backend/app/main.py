@@ -1,8 +1,14 @@
 import os
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .config import CORS_ORIGINS
+from fastapi.responses import JSONResponse
+from .config import CORS_ORIGINS, WARMUP_ON_STARTUP, BITMAP_INDEX_ENABLED
 from .db.session import init_db
+from .services.gemini_embeddings import gemini_embedder
+from .services import pdf, vector_store
+from .services.bitmap_index import bitmap_index
+from .services.jobs import job_pool
 from .routers.uploads import router as uploads_router
 from .routers.profiles import router as profiles_router
 from .routers.status import router as status_router
@@ -13,6 +19,7 @@ from .routers.admin import router as admin_router
 from .routers.brightdata import router as brightdata_router
 from .routers.auth import router as auth_router
 from .routers.search import router as search_router
+from .routers.facets import router as facets_router
 
 
 app = FastAPI(title="Hinder API", version="1.0.0")
@@ -29,6 +36,29 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    # Heavy dependencies (chromadb, numpy) load off the request path; /ready reports when done
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=vector_store.warmup, name="vector-store-warmup", daemon=True).start()
+    # Filtered queries use the bitmaps once built and the vector-store filters until then
+    if BITMAP_INDEX_ENABLED:
+        if WARMUP_ON_STARTUP:
+            threading.Thread(target=bitmap_index.build, name="bitmap-index-build", daemon=True).start()
+        else:
+            bitmap_index.build()
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    # profile-processing workers; runs left by a crashed process are picked up again
+    await job_pool.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await job_pool.stop()
+    await gemini_embedder.aclose()
+    vector_store.flush()
+    pdf.shutdown()
 
 
 @app.get("/")
@@ -41,6 +71,13 @@ def health():
     return {"ok": True}
 
 
+@app.get("/ready")
+def ready():
+    info = vector_store.readiness()
+    body = {"ready": info["loaded"], "vector_store": info}
+    return body if info["loaded"] else JSONResponse(status_code=503, content=body)
+
+
 # Routers
 app.include_router(uploads_router)
 app.include_router(profiles_router)
@@ -51,4 +88,5 @@ app.include_router(intro_router)
 app.include_router(admin_router)
 app.include_router(brightdata_router)
 app.include_router(auth_router)
-app.include_router(search_router)
\ No newline at end of file
+app.include_router(search_router)
+app.include_router(facets_router)
@@ -1,13 +1,31 @@
 from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy import func
 from sqlmodel import Session, select
 from ..deps import get_db
 from ..db.models import Profile, MatchLog, User
 from ..services.seeding import generate_synthetic_profiles
+from ..services.indexing import reindex_all
+from ..services.embedding_cache import embedding_cache
+from ..services.match_cache import match_cache
+from ..services.search_cursors import result_sets
+from ..services.bitmap_index import bitmap_index
+from ..services import jobs, upload_store
+from ..services.content_cache import content_cache
 from ..services.auth import decode_token
+from ..services.matching import match_many
+from ..db.repository import ProfileRepository
+from ..db import facets, migrations, terms, tuning
+from ..db.session import get_session
+from ..schemas.matches import BatchMatchInput
+from ..config import BATCH_MATCH_CHUNK
+from fastapi.responses import StreamingResponse
+import json
 
 router = APIRouter(prefix="/admin", tags=["admin"]) 
 
+FACET_LIMIT = 20
+
 
 def _require_admin(authorization: str | None, db: Session) -> User:
     if not authorization or not authorization.lower().startswith("bearer "):
@@ -29,7 +47,7 @@ def _require_admin(authorization: str | None, db: Session) -> User:
 @router.get("/stats")
 async def get_stats(db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
     _require_admin(authorization, db)
-    profiles = db.exec(select(Profile)).all()
+    profiles = db.exec(select(func.count()).select_from(Profile)).one()
     matches_served = db.exec(select(MatchLog)).all()
     good = len([m for m in matches_served if m.feedback == "good"])
     meh = len([m for m in matches_served if m.feedback == "meh"])
@@ -37,9 +55,23 @@ async def get_stats(db: Session = Depends(get_db), authorization: str | None = H
     total = good + meh + bad
     positive_rate = (good / total) if total else 0.0
     return {
-        "profiles": len(profiles),
+        "profiles": profiles,
         "matchesServed": len(matches_served),
         "feedback": {"good": good, "meh": meh, "bad": bad, "positiveRate": positive_rate},
+        "embeddingCache": embedding_cache.stats(),
+        "matchCache": match_cache.stats(),
+        "searchCursors": result_sets.stats(),
+        "bitmapIndex": bitmap_index.stats(),
+        "jobs": {**jobs.counts(db), **jobs.job_pool.stats()},
+        # dedupe: bytes not stored twice, and PDF/LLM time served from the content cache
+        "uploads": upload_store.stats(db),
+        "contentCache": content_cache.stats(),
+        "database": {"schemaVersion": migrations.version(db.connection()), **tuning.settings(db.connection())},
+        # ready profiles per skill/topic, one GROUP BY over the link tables each
+        "facets": {
+            "skills": dict(terms.counts(db, "skills_norm", [Profile.status == "ready"], limit=FACET_LIMIT)),
+            "topics": dict(terms.counts(db, "topics", [Profile.status == "ready"], limit=FACET_LIMIT)),
+        },
     }
 
 
@@ -50,6 +82,57 @@ async def seed(count: int = 12, db: Session = Depends(get_db), authorization: st
     return {"added": added}
 
 
+@router.post("/reindex")
+def reindex(db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
+    # Sync handler: FastAPI runs it in the threadpool, so bulk embedding doesn't block the loop
+    _require_admin(authorization, db)
+    return {"reindexed": reindex_all(db)}
+
+
+@router.post("/facets/rebuild")
+def rebuild_facets(db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
+    # Recount /facets from the profiles, e.g. after editing rows outside the API
+    _require_admin(authorization, db)
+    return {"profiles": facets.rebuild(db)}
+
+
+@router.post("/matches/batch")
+async def batch_matches(body: BatchMatchInput, db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
+    """Match many users in one go, streamed back as NDJSON (one line per user)."""
+    _require_admin(authorization, db)
+    user_ids = body.user_ids
+    if user_ids is None:
+        if not body.hackathon:
+            raise HTTPException(status_code=400, detail="user_ids or hackathon is required")
+        user_ids = list(db.exec(
+            select(Profile.id).where(Profile.hackathon == body.hackathon, Profile.status == "ready").order_by(Profile.id)
+        ).all())
+
+    async def lines():
+        # own session: the request's one is closed before a streamed body finishes
+        with get_session() as s:
+            repo = ProfileRepository(s)
+            step = max(1, BATCH_MATCH_CHUNK)
+            for i in range(0, len(user_ids), step):
+                chunk = user_ids[i:i + step]
+                rows = {r.id: r for r in repo.get_many(chunk)}
+                users = [{"id": r.id, "skills_norm": r.skills_norm, "topics": r.topics,
+                          "name": r.profile.name, "headline": r.profile.headline} for r in rows.values()]
+                results = dict(zip(rows, await match_many(users, k=body.k, topic=body.topic, hackathon=body.hackathon)))
+                for uid in chunk:
+                    if uid not in results:
+                        yield json.dumps({"user_id": uid, "error": "not found"}) + "\n"
+                        continue
+                    ids, metas, sv, sk, sb = results[uid]
+                    yield json.dumps({"user_id": uid, "matches": [
+                        {"candidate_id": cid, "name": m.get("name"), "headline": m.get("headline"),
+                         "score_vector": v, "score_keyword": kw, "score_blended": b}
+                        for cid, m, v, kw, b in zip(ids, metas, sv, sk, sb)
+                    ]}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/clear")
 async def clear_cache(db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
     _require_admin(authorization, db)
@@ -4,10 +4,11 @@ from datetime import datetime, timedelta, timezone
 from sqlmodel import Session
 from ..deps import get_db
 from ..db.models import Profile, User
+from ..db import facets, fts, terms
 from ..services.brightdata import enrich_profile
 from ..services.normalize import normalize_list
-from ..services.embeddings import embed
-from ..services.chroma_store import upsert as chroma_upsert
+from ..services.indexing import index_profiles
+from ..services import match_table
 from ..db.session import get_session
 from ..utils.json import json_to_list, list_to_json
 import threading
@@ -95,6 +96,7 @@ def _merge_enrichment_and_reindex(profile_id: str, linkedin_url: str) -> None:
         new_skills = _extract_skills(data)
         if not new_skills:
             print("BrightData enrichment returned no skills. Data keys:", list(data.keys()))
+        before = facets.snapshot(p)
         skills = normalize_list(list(set(json_to_list(p.skills_norm_json) + new_skills)))
         if not skills:
             print("After merge/normalize, skills still empty for profile", profile_id)
@@ -102,29 +104,17 @@ def _merge_enrichment_and_reindex(profile_id: str, linkedin_url: str) -> None:
         p.updated_at = datetime.now(timezone.utc)
         p.last_linkedin_enrich_at = datetime.now(timezone.utc)
         db.add(p)
+        fts.upsert(db, [p])
+        terms.sync(db, [p])
+        facets.apply(db, [(before, facets.snapshot(p))])
         db.commit()
 
-        # Re-embed and upsert to Chroma
-        summary = f"{p.name or ''} | {p.headline or ''} | {', '.join(skills)} | {', '.join(json_to_list(p.topics_json))}"
+        # Re-embed and upsert to the vector store (enrichment-only fields ride along as metadata)
         try:
-            vec = embed(summary)
-            metadata = {
-                "id": p.id,
-                "name": p.name,
-                "headline": p.headline,
-                "skills_norm": skills,
-                "topics": json_to_list(p.topics_json),
-                "school": p.school,
-                "company": p.company,
-                "seniority": p.seniority,
-                "available_now": p.available_now,
-                "hackathon": p.hackathon,
-                "city": data.get("city"),
-                "country_code": data.get("country_code"),
-            }
-            chroma_upsert(p.id, vec, metadata)
+            index_profiles([p], {p.id: {"city": data.get("city"), "country_code": data.get("country_code")}})
+            match_table.profile_changed(db, p.id)
         except Exception as e:
-            print("Embedding/Chroma upsert failed:", type(e).__name__, str(e))
+            print("Embedding/vector upsert failed:", type(e).__name__, str(e))
     finally:
         db.close()
 
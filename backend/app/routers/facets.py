@@ -0,0 +1,40 @@
+from __future__ import annotations
+from fastapi import APIRouter, Depends, HTTPException, Header
+from typing import Optional
+from sqlmodel import Session
+from ..deps import get_db
+from ..db import facets
+from ..services.auth import decode_token
+
+router = APIRouter(prefix="/facets", tags=["facets"]) 
+
+
+@router.get("")
+async def get_facets(
+    hackathon: Optional[str] = None,
+    available_now: Optional[bool] = None,
+    fields: Optional[str] = None,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(default=None),
+):
+    # Require auth
+    if not authorization or not authorization.lower().startswith("bearer "):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    token = authorization.split(" ", 1)[1]
+    if not decode_token(token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    wanted = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(facets.FIELDS)
+    unknown = [f for f in wanted if f not in facets.FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facet fields: {', '.join(unknown)}")
+
+    # served from the maintained counters: cost follows distinct values, not profiles
+    total, counts = facets.counts(db, hackathon, available_now, wanted, limit=max(limit, 0))
+    return {
+        "hackathon": hackathon,
+        "available_now": available_now,
+        "total": total,
+        "facets": {f: [{"value": v, "count": n} for v, n in rows] for f, rows in counts.items()},
+    }
@@ -1,68 +1,103 @@
 from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
-from sqlmodel import Session
-from ..deps import get_db
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..deps import get_async_db
 from ..db.models import Profile, MatchLog
 from ..services.matching import retrieve_candidates, blend_scores
 from ..services.explanations import rationale
-from ..utils.json import json_to_list, json_to_dict
+from ..db.repository import AsyncProfileRepository, ProfileRow
+from ..services import match_table
+from ..services.match_cache import match_cache
+from ..config import MATCH_TABLE_ENABLED, MATCH_TABLE_K
+from datetime import datetime
 
 router = APIRouter(prefix="/matches", tags=["matches"]) 
 
 
-def prof_to_dict(p: Profile) -> dict:
+def row_to_dict(r: ProfileRow) -> dict:
+    p = r.profile
     return {
         "id": p.id,
         "name": p.name,
         "headline": p.headline,
-        "skills_norm": json_to_list(p.skills_norm_json),
-        "topics": json_to_list(p.topics_json),
+        "skills_norm": r.skills_norm,
+        "topics": r.topics,
         "available_now": p.available_now,
         "hackathon": p.hackathon,
     }
 
 
+def candidate_to_dict(r: ProfileRow) -> dict:
+    p = r.profile
+    return {
+        "id": p.id,
+        "name": p.name,
+        "headline": p.headline,
+        "email": p.email,
+        "school": p.school,
+        "company": p.company,
+        "seniority": p.seniority,
+        "linkedin_url": p.linkedin_url,
+        "resume_file_id": p.resume_file_id,
+        "resume_file_name": p.resume_file_name,
+        "skills_norm": r.skills_norm,
+        "interests": r.interests,
+        "topics": r.topics,
+        "available_now": p.available_now,
+        "contact_info": r.contact_info,
+        "created_at": p.created_at.isoformat(),
+        "updated_at": p.updated_at.isoformat(),
+        "hackathon": p.hackathon,
+    }
+
+
 @router.get("")
-async def get_matches(user_id: str, k: int = 20, topic: Optional[str] = None, hackathon: Optional[str] = None, db: Session = Depends(get_db)):
-    user = db.get(Profile, user_id)
-    if not user:
+async def get_matches(user_id: str, k: int = 20, topic: Optional[str] = None, hackathon: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    cache_key = (user_id, k, topic, hackathon)
+    cached_response = match_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+    token = match_cache.token(hackathon)
+
+    repo = AsyncProfileRepository(db)
+    user_row = await repo.get(user_id)
+    if not user_row:
         raise HTTPException(status_code=404, detail="User not found")
+    user = row_to_dict(user_row)
 
-    ids, metas, dists = retrieve_candidates(prof_to_dict(user), k=k, topic=topic, exclude_id=user_id, hackathon=hackathon)
-    sv, sk, sb = blend_scores(prof_to_dict(user), metas, dists)
+    # plain (no topic) requests are served from the materialized lists when they can answer
+    cached = await db.run_sync(match_table.lookup, user_id, k, hackathon) if topic is None else None
+    if cached:
+        rows, computed_at = cached
+        source = "table"
+        ids = [r.candidate_id for r in rows]
+        sv = [r.score_vector for r in rows]
+        sk = [r.score_keyword for r in rows]
+        sb = [r.score_blended for r in rows]
+    else:
+        source = "live"
+        materialize = topic is None and MATCH_TABLE_ENABLED
+        n = max(k, MATCH_TABLE_K) if materialize else k
+        ids, metas, dists = await retrieve_candidates(user, k=n, topic=topic, exclude_id=user_id, hackathon=hackathon)
+        sv, sk, sb = blend_scores(user, metas, dists)
+        if materialize:
+            computed_at = await db.run_sync(match_table.store, user_id, hackathon, ids, sv, sk, sb, requested=n)
+        else:
+            computed_at = datetime.utcnow()
 
-    # fetch candidate profiles to return full shape expected by frontend
+    # fetch candidate profiles (one query) to return full shape expected by frontend
+    index = {cid: i for i, cid in enumerate(ids[:k])}
+    user_skills, user_topics = set(user_row.skills_norm), set(user_row.topics)
     out_matches = []
-    for i, cid in enumerate(ids[:k]):
-        p = db.get(Profile, cid)
-        if not p:
-            continue
-        cand = {
-            "id": p.id,
-            "name": p.name,
-            "headline": p.headline,
-            "email": p.email,
-            "school": p.school,
-            "company": p.company,
-            "seniority": p.seniority,
-            "linkedin_url": p.linkedin_url,
-            "resume_file_id": p.resume_file_id,
-            "resume_file_name": p.resume_file_name,
-            "skills_norm": json_to_list(p.skills_norm_json),
-            "interests": json_to_list(p.interests_json),
-            "topics": json_to_list(p.topics_json),
-            "available_now": p.available_now,
-            "contact_info": json_to_dict(getattr(p, "contact_info_json", None)),
-            "created_at": p.created_at.isoformat(),
-            "updated_at": p.updated_at.isoformat(),
-            "hackathon": p.hackathon,
-        }
+    for r in await repo.get_many(ids[:k]):
+        i = index[r.id]
+        cand = candidate_to_dict(r)
         overlap = {
-            "skills": list(set(json_to_list(user.skills_norm_json)) & set(cand["skills_norm"])),
-            "topics": list(set(json_to_list(user.topics_json)) & set(cand["topics"]))
+            "skills": list(user_skills & set(r.skills_norm)),
+            "topics": list(user_topics & set(r.topics)),
         }
-        why = rationale(prof_to_dict(user), cand, overlap)
+        why = rationale(user, cand, overlap)
         out_matches.append({
             "user_id": user_id,
             "candidate": cand,
@@ -72,4 +107,6 @@ async def get_matches(user_id: str, k: int = 20, topic: Optional[str] = None, ha
             "rationale": why,
         })
 
-    return {"matches": out_matches}
+    response = {"matches": out_matches, "source": source, "computed_at": computed_at.isoformat()}
+    match_cache.put(cache_key, response, token)
+    return response
@@ -1,16 +1,21 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header
-from sqlmodel import Session
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
 from typing import Optional
-from ..deps import get_db
+from ..deps import get_async_db
 from ..db.models import Profile, Upload, User
+from ..db.session import get_session
+from ..db import facets, fts, terms
 from ..schemas.profiles import CreateProfileInput, ProfileWithStatus, ProfileModel, PatchProfileInput
-from ..services.pipeline import run as pipeline_run, delete_profile_index
+from ..services.pipeline import delete_profile_index
+from ..services.indexing import refresh_metadata
+from ..services import jobs, match_table, upload_store
+from ..services.match_cache import match_cache
 from ..utils.ids import new_id
 from ..utils.json import list_to_json, json_to_list, dict_to_json, json_to_dict
 from ..config import UPLOAD_DIR
-import os
 from ..services.auth import decode_token
 
 router = APIRouter(prefix="/profiles", tags=["profiles"]) 
@@ -42,8 +47,7 @@ def to_model(p: Profile) -> ProfileModel:
 @router.post("", response_model=ProfileWithStatus)
 async def create_profile(
     input: CreateProfileInput,
-    background: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth and resolve current user
@@ -55,7 +59,7 @@ async def create_profile(
         raise HTTPException(status_code=401, detail="Unauthorized")
     uid = data.get("sub")
     try:
-        current_user = db.get(User, int(uid))
+        current_user = await db.get(User, int(uid))
     except Exception:
         current_user = None
     if current_user is None:
@@ -82,16 +86,21 @@ async def create_profile(
         hackathon=input.hackathon,
     )
     db.add(prof)
-    db.commit()
 
-    background.add_task(pipeline_run, pid)
+    def write_derived(s):
+        terms.sync(s, [prof])
+        jobs.enqueue(s, pid)
+
+    await db.run_sync(write_derived)
+    await db.commit()
+    jobs.job_pool.notify()
     return ProfileWithStatus(profile=to_model(prof), status=prof.status)
 
 
 @router.get("/{profile_id}", response_model=ProfileWithStatus)
 async def get_profile(
     profile_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth and enforce ownership
@@ -103,7 +112,7 @@ async def get_profile(
         raise HTTPException(status_code=401, detail="Unauthorized")
     uid = str(data.get("sub"))
 
-    p = db.get(Profile, profile_id)
+    p = await db.get(Profile, profile_id)
     if not p:
         raise HTTPException(status_code=404, detail="Profile not found")
     if str(p.user_id) != uid:
@@ -115,8 +124,7 @@ async def get_profile(
 async def patch_profile(
     profile_id: str,
     patch: PatchProfileInput,
-    background: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth and enforce ownership
@@ -128,12 +136,14 @@ async def patch_profile(
         raise HTTPException(status_code=401, detail="Unauthorized")
     uid = str(data.get("sub"))
 
-    p = db.get(Profile, profile_id)
+    p = await db.get(Profile, profile_id)
     if not p:
         raise HTTPException(status_code=404, detail="Profile not found")
     if str(p.user_id) != uid:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    old_hackathon = p.hackathon
+    before = facets.snapshot(p)
     changed = False
     for field in ["name", "headline", "linkedin_url", "resume_file_id", "resume_file_name", "hackathon"]:
         val = getattr(patch, field)
@@ -160,14 +170,47 @@ async def patch_profile(
     if changed:
         p.updated_at = datetime.utcnow()
         db.add(p)
-        db.commit()
+        after = facets.snapshot(p)
+
+        def write_derived(s):
+            if patch.skills_norm is not None or patch.topics is not None:
+                terms.sync(s, [p])
+            if p.status == "ready" and any(getattr(patch, f) is not None for f in ("name", "headline", "skills_norm", "topics")):
+                fts.upsert(s, [p])
+            facets.apply(s, [(before, after)])
+
+        await db.run_sync(write_derived)
+        before = after
+        await db.commit()
+        # cached /matches responses embed this profile's fields wherever it appears
+        match_cache.profiles_written([profile_id], {old_hackathon, p.hackathon})
+
+    # filter and keyword fields live in the index too; keep it and the match lists in step
+    rescore = [f for f in ("hackathon", "skills_norm", "topics") if getattr(patch, f) is not None]
+    if p.status == "ready" and (rescore or patch.available_now is not None):
+        # index write, vector scan and re-scoring in a thread with its own session, off the loop
+        def reindex():
+            refresh_metadata(p)
+            with get_session() as s:
+                if not rescore and patch.available_now is False:
+                    match_table.candidate_unavailable(s, profile_id)
+                else:
+                    match_table.profile_changed(s, profile_id)
+
+        await asyncio.to_thread(reindex)
 
     # If resume updated or explicit reembed endpoint used, pipeline will run; here we trigger if resume_file_id changed
     if patch.resume_file_id is not None:
         p.status = "pending"
         db.add(p)
-        db.commit()
-        background.add_task(pipeline_run, db, profile_id)
+
+        def requeue(s):
+            facets.apply(s, [(before, None)])
+            jobs.enqueue(s, profile_id)
+
+        await db.run_sync(requeue)
+        await db.commit()
+        jobs.job_pool.notify()
 
     return {"profile": to_model(p)}
 
@@ -175,8 +218,7 @@ async def patch_profile(
 @router.post("/{profile_id}/reembed")
 async def reembed(
     profile_id: str,
-    background: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth and enforce ownership
@@ -188,23 +230,30 @@ async def reembed(
         raise HTTPException(status_code=401, detail="Unauthorized")
     uid = str(data.get("sub"))
 
-    p = db.get(Profile, profile_id)
+    p = await db.get(Profile, profile_id)
     if not p:
         raise HTTPException(status_code=404, detail="Profile not found")
     if str(p.user_id) != uid:
         raise HTTPException(status_code=403, detail="Forbidden")
+    before = facets.snapshot(p)
     p.status = "pending"
     p.updated_at = datetime.utcnow()
     db.add(p)
-    db.commit()
-    background.add_task(pipeline_run, db, profile_id)
+
+    def requeue(s):
+        facets.apply(s, [(before, None)])
+        jobs.enqueue(s, profile_id)
+
+    await db.run_sync(requeue)
+    await db.commit()
+    jobs.job_pool.notify()
     return {"started": True}
 
 
 @router.delete("/{profile_id}")
 async def delete_profile(
     profile_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth and enforce ownership
@@ -216,26 +265,36 @@ async def delete_profile(
         raise HTTPException(status_code=401, detail="Unauthorized")
     uid = str(data.get("sub"))
 
-    p = db.get(Profile, profile_id)
+    p = await db.get(Profile, profile_id)
     if not p:
         return {"ok": True}
     if str(p.user_id) != uid:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    # delete from chroma
+    # delete from the vector and keyword indexes and the materialized match lists
     delete_profile_index(profile_id)
+    snap = facets.snapshot(p)
+
+    def delete_derived(s):
+        match_table.forget_profile(s, profile_id)
+        fts.delete(s, [profile_id])
+        terms.delete_profiles(s, [profile_id])
+        facets.apply(s, [(snap, None)])
+
+    await db.run_sync(delete_derived)
+
+    # delete the upload, and after the commit its file unless another upload shares it
+    up = await db.get(Upload, p.resume_file_id) if p.resume_file_id else None
+    if up:
+        await db.run_sync(upload_store.release, up)
+
+    await db.delete(p)
+    await db.commit()
+    if up:
+        # file removal takes upload_store's thread lock: a thread with its own session
+        def collect():
+            with get_session() as s:
+                upload_store.collect(s, up.sha256, up.path)
 
-    # delete upload file if present
-    if p.resume_file_id:
-        up = db.get(Upload, p.resume_file_id)
-        if up and up.path and os.path.exists(up.path):
-            try:
-                os.remove(up.path)
-            except Exception:
-                pass
-        if up:
-            db.delete(up)
-
-    db.delete(p)
-    db.commit()
+        await asyncio.to_thread(collect)
     return {"ok": True}
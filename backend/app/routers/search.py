@@ -1,16 +1,23 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, Header
-from typing import Optional, List
-from sqlmodel import Session, select
-from ..deps import get_db
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from typing import Any, Dict, Optional, List, Sequence, Tuple
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..config import SEARCH_CURSOR_DEPTH, SEARCH_KEYWORD_CANDIDATES, SEARCH_RRF_K, BITMAP_INDEX_ENABLED, BITMAP_EXACT_MAX
+from ..deps import get_async_db
+from ..db import fts, terms
 from ..db.models import Profile
-from ..services.embeddings import embed
-from ..services.chroma_store import query as chroma_query
-from ..utils.json import json_to_list
+from ..services.embeddings import aembed
+from ..services.vector_store import query as vector_query, query_ids as vector_query_ids, count as vector_count, ids as vector_ids, all_of, any_of
+from ..services.bitmap_index import bitmap_index
+from ..db.repository import AsyncProfileRepository, ProfileRow
 from ..services.auth import decode_token
+from ..services.search_cursors import ResultSet, result_sets, query_key, encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/search", tags=["search"]) 
 
+SEARCH_MODES = ("vector", "keyword", "hybrid")
+
 
 def _csv_list(s: Optional[str]) -> List[str]:
     if not s:
@@ -18,13 +25,14 @@ def _csv_list(s: Optional[str]) -> List[str]:
     return [x.strip() for x in s.split(",") if x.strip()]
 
 
-def _profile_to_min(p: Profile) -> dict:
+def _profile_to_min(r: ProfileRow) -> dict:
+    p = r.profile
     return {
         "id": p.id,
         "name": p.name,
         "headline": p.headline,
-        "skills_norm": json_to_list(p.skills_norm_json),
-        "topics": json_to_list(p.topics_json),
+        "skills_norm": r.skills_norm,
+        "topics": r.topics,
         "available_now": p.available_now,
         "hackathon": p.hackathon,
         "school": p.school,
@@ -35,6 +43,109 @@ def _profile_to_min(p: Profile) -> dict:
     }
 
 
+# filters that are Profile columns; city/country_code only exist as index metadata
+_SQL_FILTERS = {
+    "available_now": Profile.available_now,
+    "company": Profile.company,
+    "school": Profile.school,
+    "hackathon": Profile.hackathon,
+}
+
+
+def _sql_conds(db: Session, primitives: Dict[str, Any], members: Dict[str, List[str]], exclude_id: Optional[str]) -> List[Any]:
+    """The column and skill/topic filters as Profile conditions (profile_skill/profile_topic)."""
+    conds = [_SQL_FILTERS[k] == v for k, v in primitives.items() if k in _SQL_FILTERS]
+    conds += [Profile.id.in_(terms.having_any(db, field, names)) for field, names in members.items() if names]
+    if exclude_id:
+        conds.append(Profile.id != exclude_id)
+    return conds
+
+
+def _sql_count(db: Session, primitives: Dict[str, Any], members: Dict[str, List[str]], exclude_id: Optional[str]) -> int:
+    """Indexed profiles passing the filters, counted in SQLite: the vector store holds the
+    ready profiles, and asking it for a filtered count means fetching every matching id."""
+    conds = _sql_conds(db, primitives, members, exclude_id)
+    return db.exec(select(func.count()).select_from(Profile).where(Profile.status == "ready", *conds)).one()
+
+
+def _keyword_hits(db: Session, q: Optional[str], primitives: Dict[str, Any], members: Dict[str, List[str]],
+                  exclude_id: Optional[str], where: Optional[Dict[str, Any]], limit: Optional[int]) -> List[str]:
+    """BM25-ranked ids for q that pass the filters. Column and skill/topic filters run in
+    the same SQL statement (profile_skill/profile_topic); the index is only consulted for
+    filters SQLite doesn't hold."""
+    conds = _sql_conds(db, primitives, members, exclude_id)
+    within = select(Profile.id).where(*conds) if conds else None
+    index_only = any(k not in _SQL_FILTERS for k in primitives)
+    hits = fts.search(db, q, None if index_only else limit, within=within)
+    if hits and index_only:
+        allowed = set(vector_ids(all_of(where, {"id": {"$in": hits}})))
+        hits = [h for h in hits if h in allowed][:limit]
+    return hits
+
+
+def _fuse(rankings: Sequence[Sequence[str]], k: int = SEARCH_RRF_K) -> List[str]:
+    """Reciprocal rank fusion: sum of 1/(k + rank) over the lists an id appears in.
+    Ties keep first-seen order, so the first ranking breaks them."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, pid in enumerate(ranking, start=1):
+            scores[pid] = scores.get(pid, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
+
+
+_BITMAP_FILTERS = {"available_now", "hackathon"}
+
+
+async def _rank(db: AsyncSession, mode: str, q: Optional[str], search_text: str, primitives: Dict[str, Any],
+                members: Dict[str, List[str]], exclude_id: Optional[str], where: Optional[Dict[str, Any]],
+                depth: int) -> Tuple[List[str], int]:
+    """The first `depth` ids of the ranking, and the number of matches."""
+    if mode == "keyword":
+        # no embedding and no over-fetch: the FTS index answers selective queries alone
+        ids = await db.run_sync(_keyword_hits, q, primitives, members, exclude_id, where, None)
+        return ids[:depth], len(ids)
+    cand = None
+    if BITMAP_INDEX_ENABLED and bitmap_index.ready and set(primitives) <= _BITMAP_FILTERS:
+        # exact total from the bitmaps; a small candidate set is scored directly
+        total, cand = bitmap_index.candidates(
+            BITMAP_EXACT_MAX, available_now=primitives.get("available_now"), hackathon=primitives.get("hackathon"),
+            skills_any=members["skills_norm"], topics_any=members["topics"], exclude_id=exclude_id,
+        )
+    elif set(primitives) <= set(_SQL_FILTERS):
+        total = await db.run_sync(_sql_count, primitives, members, exclude_id)
+    else:
+        total = vector_count(where)  # city/country_code are only held by the index
+    ids: List[str] = []
+    if total:
+        vec = await aembed(search_text)
+        if cand is not None:
+            res = vector_query_ids(vec, cand, n_results=min(depth, total))
+        else:
+            res = vector_query(vec, n_results=min(depth, total), where=where)
+        ids = res.get("ids", [[]])[0]
+    if mode == "hybrid":
+        # Approximate beyond the vector window: a keyword hit outside the vector top-`depth`
+        # contributes only its keyword rank, so its fused score is a lower bound and it
+        # can rank below where a full fusion would put it.
+        hits = await db.run_sync(_keyword_hits, q, primitives, members, exclude_id, where, SEARCH_KEYWORD_CANDIDATES)
+        ids = _fuse([ids, hits])[:depth]
+    return ids, total
+
+
+async def _page(db: AsyncSession, key: str, rs: ResultSet, start: int, page_size: int) -> Dict[str, Any]:
+    end = start + page_size
+    items = [_profile_to_min(r) for r in await AsyncProfileRepository(db).get_many(rs.ids[start:end])]
+    return {
+        "items": items,
+        "total": rs.total,
+        "page": start // page_size + 1,
+        "page_size": page_size,
+        "mode": rs.mode,
+        "query_text": rs.query_text,
+        "next_cursor": encode_cursor(key, end, page_size) if end < len(rs.ids) else None,
+    }
+
+
 @router.get("")
 async def search(
     q: Optional[str] = None,
@@ -47,9 +158,11 @@ async def search(
     school: Optional[str] = None,
     hackathon: Optional[str] = None,
     exclude_id: Optional[str] = None,
-    page: int = 1,
-    page_size: int = 20,
-    db: Session = Depends(get_db),
+    mode: str = "vector",
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(default=None),
 ):
     # Require auth
@@ -59,6 +172,25 @@ async def search(
     if not decode_token(token):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
+    # A cursor carries its query: later pages slice the stored ranking, nothing is re-run
+    if cursor is not None:
+        state = decode_cursor(cursor)
+        if state is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        key, start, size = state
+        rs = result_sets.get(key)
+        if rs is None:
+            raise HTTPException(status_code=410, detail="Cursor expired; repeat the search")
+        return await _page(db, key, rs, start, size)
+
+    mode = (mode or "vector").lower()
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SEARCH_MODES)}")
+    if mode != "vector" and fts.match_expression(q) is None:
+        if mode == "keyword":
+            raise HTTPException(status_code=400, detail="q is required for keyword search")
+        mode = "vector"  # nothing for the keyword side to match
+
     skills_lst = _csv_list(skills)
     topics_lst = _csv_list(topics)
 
@@ -74,61 +206,33 @@ async def search(
     # Ensure we always have something to embed
     search_text = " | ".join([p for p in query_text_parts if p]) or "general candidate search"
 
-    vec = embed(search_text)
-
-    # We over-fetch and then filter in Python since some metadata fields are JSON-encoded for Chroma
-    n_results = max(page_size * 5, 50)
-    where = {}
-    # Simple primitive filters that we know are primitives in Chroma metadata
-    if available_now is not None:
-        where["available_now"] = bool(available_now)
-    if company:
-        where["company"] = company
-    if school:
-        where["school"] = school
-    if city:
-        where["city"] = city
-    if country_code:
-        where["country_code"] = country_code
-    if hackathon:
-        where["hackathon"] = hackathon
-    where_not = {"id": exclude_id} if exclude_id else None
-
-    res = chroma_query(vec, n_results=n_results, where=where or None, where_not=where_not)
-
-    ids: List[str] = res.get("ids", [[]])[0]
-    # Post-filter by skills/topics overlap when provided
-    filtered: List[str] = []
-    for pid in ids:
-        p = db.get(Profile, pid)
-        if not p:
-            continue
-        # skills/topics filter (array containment via Python)
-        if skills_lst:
-            prof_sk = set(json_to_list(p.skills_norm_json))
-            if not any(s.lower() in (x.lower() for x in prof_sk) for s in skills_lst):
-                continue
-        if topics_lst:
-            prof_tp = set(json_to_list(p.topics_json))
-            if not any(t.lower() in (x.lower() for x in prof_tp) for t in topics_lst):
-                continue
-        filtered.append(pid)
-
-    total = len(filtered)
+    # All filters run inside the index: primitives as equality, skills/topics through the
+    # flat membership keys, so every fetched row is a hit and no over-fetch is needed
+    primitives = {
+        "available_now": bool(available_now) if available_now is not None else None,
+        "company": company,
+        "school": school,
+        "city": city,
+        "country_code": country_code,
+        "hackathon": hackathon,
+    }
+    primitives = {k: v for k, v in primitives.items() if v is not None and v != ""}
+    members = {"skills_norm": skills_lst, "topics": topics_lst}
+    where = all_of(
+        *({k: v} for k, v in primitives.items()),
+        any_of("skills_norm", skills_lst),
+        any_of("topics", topics_lst),
+        {"id": {"$ne": exclude_id}} if exclude_id else None,
+    )
+
     start = max((page - 1) * page_size, 0)
     end = start + page_size
-    page_ids = filtered[start:end]
-
-    items = []
-    for pid in page_ids:
-        p = db.get(Profile, pid)
-        if p:
-            items.append(_profile_to_min(p))
-
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "query_text": search_text,
-    }
+    # Rank once to SEARCH_CURSOR_DEPTH (deeper if this page asks for it) and page from
+    # the stored list until it expires
+    key = query_key({"mode": mode, "q": q, "text": search_text, "where": where})
+    rs = result_sets.get(key)
+    if rs is None or (end > len(rs.ids) and len(rs.ids) < rs.total):
+        depth = max(SEARCH_CURSOR_DEPTH, end)
+        ids, total = await _rank(db, mode, q, search_text, primitives, members, exclude_id, where, depth)
+        rs = result_sets.put(key, ids, total, mode, search_text)
+    return await _page(db, key, rs, start, page_size)
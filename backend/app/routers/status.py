@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import asyncio
 import json
-from ..deps import get_db
+from ..deps import get_async_db
 from ..db.models import Profile
 from ..schemas.common import ParseStatusResponse
 from ..services.sse import broker
@@ -12,8 +12,8 @@ router = APIRouter(prefix="/status", tags=["status"])
 
 
 @router.get("")
-async def get_status(profile_id: str, db: Session = Depends(get_db)):
-    p = db.get(Profile, profile_id)
+async def get_status(profile_id: str, db: AsyncSession = Depends(get_async_db)):
+    p = await db.get(Profile, profile_id)
     return ParseStatusResponse(status=p.status if p else "error")
 
 
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Header
 from sqlmodel import Session
+import asyncio
 import os
-import hashlib
 from typing import Optional
 from ..config import UPLOAD_DIR, ALLOWED_PDF_MB
 from ..schemas.common import UploadPDFResponse
-from ..db.models import Upload, User
+from ..db.models import User
 from ..deps import get_db
-from ..utils.ids import new_id
+from ..services import upload_store
 from ..services.auth import decode_token
 
 router = APIRouter(prefix="/uploads", tags=["uploads"]) 
@@ -39,20 +39,22 @@ async def upload_pdf(
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-    content = await file.read()
-    size_mb = len(content) / (1024 * 1024)
-    if size_mb > ALLOWED_PDF_MB:
+    # reject on the size the form parser saw before copying anything
+    max_bytes = ALLOWED_PDF_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
         raise HTTPException(status_code=400, detail=f"File too large; max {ALLOWED_PDF_MB}MB")
 
-    file_id = new_id("file")
-    filename = f"{file_id}.pdf"
-    path = os.path.join(UPLOAD_DIR, filename)
-    with open(path, "wb") as f:
-        f.write(content)
-
-    upload = Upload(file_id=file_id, user_id=current_user.id, path=path, mime="application/pdf", size=len(content))
-    db.add(upload)
-    db.commit()
-    print(f"[uploads] saved file_id={file_id} path={path} user_id={current_user.id}")
+    # streamed into storage in chunks off the event loop; a re-upload of the same bytes
+    # gets its own file_id but shares the stored file
+    try:
+        sha, size = await asyncio.to_thread(upload_store.ingest, file.file, max_bytes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        upload = upload_store.add(db, sha, size, current_user.id)
+        db.commit()
+    finally:
+        await asyncio.to_thread(upload_store.unpin, sha)  # _files_lock stays off the loop
+    print(f"[uploads] saved file_id={upload.file_id} path={upload.path} user_id={current_user.id}")
 
-    return UploadPDFResponse(file_id=file_id, file_name=filename)
+    return UploadPDFResponse(file_id=upload.file_id, file_name=f"{upload.file_id}.pdf")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from .profiles import ProfileModel
 
 
@@ -11,3 +11,11 @@ class Match(BaseModel):
     score_keyword: float
     score_blended: float
     rationale: str
+
+
+class BatchMatchInput(BaseModel):
+    # user_ids omitted = every ready profile in `hackathon`
+    user_ids: Optional[List[str]] = None
+    hackathon: Optional[str] = None
+    topic: Optional[str] = None
+    k: int = 20
@@ -1,19 +1,24 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from passlib.context import CryptContext
-from jose import jwt, JWTError
 from ..config import JWT_SECRET, JWT_ALG
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# passlib and jose are imported on first use so they stay off the startup path.
+
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return _pwd_context().verify(password, password_hash)
 
 
 def create_token(subject: str, expires_minutes: int = 60 * 24 * 7) -> str:
@@ -23,10 +28,12 @@ def create_token(subject: str, expires_minutes: int = 60 * 24 * 7) -> str:
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(minutes=expires_minutes)).timestamp()),
     }
+    from jose import jwt
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
 
 def decode_token(token: str) -> Optional[dict]:
+    from jose import jwt, JWTError
     try:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
     except JWTError:
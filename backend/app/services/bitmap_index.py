@@ -0,0 +1,155 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import threading
+from . import vector_store
+from .normalize import normalize_list
+from .vocabulary import as_list
+
+# Process-wide inverted index over the profiles in the vector index: each skill, topic,
+# hackathon and available_now value maps to a bitset (a Python int) of profile
+# ordinals. Intersecting a few ints gives the exact candidate set for a filter, and its
+# popcount the exact total, without touching the vector store; when the set is small
+# the caller scores just those vectors. Ordinals of removed profiles are reused, so
+# the bitsets stay as wide as the live profile count.
+#
+# Built from the vector store's metadata at startup and kept in step by listening to every
+# vector-store write, which covers the pipeline, PATCH, DELETE, seeding and reindexing.
+
+Key = Tuple[str, Any]
+
+
+def _keys(skills: Iterable[str], topics: Iterable[str], hackathon: Optional[str], available_now: bool) -> Set[Key]:
+    keys: Set[Key] = {("available_now", bool(available_now))}
+    # normalized like the vector store's membership keys, so both paths match the same rows
+    keys.update(("skills_norm", s) for s in normalize_list(list(skills)) if s)
+    keys.update(("topics", t) for t in normalize_list(list(topics)) if t)
+    if hackathon:
+        keys.add(("hackathon", hackathon))
+    return keys
+
+
+class BitmapIndex:
+    def __init__(self) -> None:
+        self._ord: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._keys: Dict[str, Set[Key]] = {}
+        self._postings: Dict[Key, int] = {}
+        self._all = 0
+        self._lock = threading.RLock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._ord)
+
+    # writes
+
+    def _remove_locked(self, pid: str) -> None:
+        o = self._ord.pop(pid, None)
+        if o is None:
+            return
+        mask = ~(1 << o)
+        for key in self._keys.pop(pid, ()):
+            bits = self._postings.get(key, 0) & mask
+            if bits:
+                self._postings[key] = bits
+            else:
+                self._postings.pop(key, None)
+        self._all &= mask
+        self._ids[o] = None
+        self._free.append(o)
+
+    def _add_locked(self, pid: str, keys: Set[Key]) -> None:
+        self._remove_locked(pid)
+        if self._free:
+            o = self._free.pop()
+            self._ids[o] = pid
+        else:
+            o = len(self._ids)
+            self._ids.append(pid)
+        self._ord[pid] = o
+        self._keys[pid] = keys
+        bit = 1 << o
+        for key in keys:
+            self._postings[key] = self._postings.get(key, 0) | bit
+        self._all |= bit
+
+    def on_index_write(self, ids: Sequence[str], metadatas: Optional[Sequence[Dict[str, Any]]]) -> None:
+        """vector_store write listener: metadatas is None for deletes."""
+        with self._lock:
+            if metadatas is None:
+                for pid in ids:
+                    self._remove_locked(pid)
+                return
+            for pid, m in zip(ids, metadatas):
+                m = m or {}
+                self._add_locked(pid, _keys(as_list(m.get("skills_norm")), as_list(m.get("topics")),
+                                            m.get("hackathon"), bool(m.get("available_now"))))
+
+    def build(self) -> int:
+        """(Re)load from the vector store itself. The pipeline indexes a profile before it
+        commits it as ready, so SQLite can lag the store; the store's own metadata can't.
+        Writes landing meanwhile wait on the lock and are applied on top."""
+        with self._lock:
+            ids, metas = vector_store.metadatas()
+            self._ord.clear()
+            self._ids.clear()
+            self._free.clear()
+            self._keys.clear()
+            self._postings.clear()
+            self._all = 0
+            self.on_index_write(ids, metas)
+            self.ready = True
+            return len(self._ord)
+
+    # reads
+
+    def match(self, available_now: Optional[bool] = None, hackathon: Optional[str] = None,
+              skills_any: Sequence[str] = (), topics_any: Sequence[str] = (), exclude_id: Optional[str] = None) -> int:
+        """Bitset of profiles passing every given filter (skills/topics: any of the values)."""
+        with self._lock:
+            bits = self._all
+            if available_now is not None:
+                bits &= self._postings.get(("available_now", bool(available_now)), 0)
+            if hackathon:
+                bits &= self._postings.get(("hackathon", hackathon), 0)
+            for field, values in (("skills_norm", skills_any), ("topics", topics_any)):
+                if values:
+                    anyof = 0
+                    for v in normalize_list(list(values)):
+                        anyof |= self._postings.get((field, v), 0)
+                    bits &= anyof
+            if exclude_id is not None and exclude_id in self._ord:
+                bits &= ~(1 << self._ord[exclude_id])
+            return bits
+
+    def _ids_locked(self, bits: int) -> List[str]:
+        # scan the binary string in C rather than peeling bits off a big int
+        s = format(bits, "b")[::-1] if bits else ""
+        out: List[str] = []
+        i = s.find("1")
+        while i >= 0:
+            out.append(self._ids[i])
+            i = s.find("1", i + 1)
+        return out
+
+    def candidates(self, limit: int, **filters: Any) -> Tuple[int, Optional[List[str]]]:
+        """(matches, their ids) for match(**filters); ids is None above limit. One lock,
+        so a concurrent write can't move ordinals between counting and listing."""
+        with self._lock:
+            bits = self.match(**filters)
+            n = bits.bit_count()
+            return n, (self._ids_locked(bits) if n <= limit else None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "profiles": len(self._ord),
+                "keys": len(self._postings),
+                "bytes": sum((b.bit_length() + 7) // 8 for b in self._postings.values()),
+            }
+
+
+bitmap_index = BitmapIndex()
+vector_store.on_index_write(bitmap_index.on_index_write)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+import os
+import sqlite3
+import threading
+import time
+
+
+class LRUCache:
+    """Thread-safe in-process LRU map bounded by entry count."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteCache:
+    """Persistent key -> blob cache in its own SQLite file, bounded by total value bytes.
+
+    Each row carries a small `meta` string and the cost (ms) of producing the value,
+    so callers can report how much work a hit saved. When the stored bytes exceed
+    max_bytes the least recently read rows are evicted down to 90% of the budget.
+    With ttl_s, a row written more than ttl_s seconds ago reads as a miss and is
+    dropped then, or with the rest of the expired rows before any eviction.
+    """
+
+    def __init__(self, path: str, table: str, max_bytes: int, ttl_s: Optional[float] = None) -> None:
+        self.path = path
+        self.table = table
+        self.max_bytes = int(max_bytes)
+        self.ttl_s = ttl_s if ttl_s and ttl_s > 0 else None
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, meta TEXT, size INTEGER NOT NULL, "
+            "cost_ms REAL NOT NULL DEFAULT 0, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_accessed ON {table}(accessed_at)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_created ON {table}(created_at)")
+        row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()
+        self._bytes = int(row[0])
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[bytes, Optional[str], float]]:
+        if not keys:
+            return {}
+        out: Dict[str, Tuple[bytes, Optional[str], float]] = {}
+        now = time.time()
+        with self._lock:
+            # stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, meta, cost_ms, created_at FROM {self.table} WHERE key IN ({marks})", chunk
+                ).fetchall()
+                if self.ttl_s is not None:
+                    expired = [r for r in rows if r[4] < now - self.ttl_s]
+                    if expired:
+                        self._delete_locked([r[0] for r in expired])
+                        self._bytes -= sum(len(r[1]) for r in expired)
+                        rows = [r for r in rows if r[4] >= now - self.ttl_s]
+                for k, v, meta, cost, _ in rows:
+                    out[k] = (v, meta, cost)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE {self.table} SET accessed_at = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [now] + [r[0] for r in rows],
+                    )
+        return out
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[str], float]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable[Tuple[str, bytes, Optional[str], float]]) -> None:
+        items = list(items)
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for key, value, meta, cost_ms in items:
+                    old = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, meta, size, cost_ms, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, value, meta, len(value), float(cost_ms), now, now),
+                    )
+                    self._bytes += len(value) - (old[0] if old else 0)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if self._bytes > self.max_bytes:
+                self._purge_expired_locked()
+            if self._bytes > self.max_bytes:
+                self._evict_locked(int(self.max_bytes * 0.9))
+
+    def put(self, key: str, value: bytes, meta: Optional[str] = None, cost_ms: float = 0.0) -> None:
+        self.put_many([(key, value, meta, cost_ms)])
+
+    def _evict_locked(self, target_bytes: int) -> None:
+        rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC").fetchall()
+        victims = []
+        for key, size in rows:
+            if self._bytes <= target_bytes:
+                break
+            victims.append(key)
+            self._bytes -= size
+        self._delete_locked(victims)
+
+    def _delete_locked(self, keys: List[str]) -> None:
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+
+    def _purge_expired_locked(self) -> int:
+        if self.ttl_s is None:
+            return 0
+        cutoff = time.time() - self.ttl_s
+        n, size = self._conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table} WHERE created_at < ?", (cutoff,)
+        ).fetchone()
+        if n:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (cutoff,))
+            self._bytes -= int(size)
+        return int(n)
+
+    def purge_expired(self) -> int:
+        """Drop the rows older than ttl_s; returns how many."""
+        with self._lock:
+            return self._purge_expired_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"entries": rows, "bytes": self._bytes, "max_bytes": self.max_bytes, "ttl_s": self.ttl_s}
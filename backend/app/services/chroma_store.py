@@ -1,33 +1,72 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import chromadb
 from chromadb.config import Settings
-from ..config import CHROMA_DIR, CHROMA_COLLECTION
+from .vector_store import VectorStore, sanitize_metadata
 import os
-import json
 
-os.makedirs(CHROMA_DIR, exist_ok=True)
-_client = chromadb.PersistentClient(path=CHROMA_DIR, settings=Settings(anonymized_telemetry=False))
-_collection = _client.get_or_create_collection(name=CHROMA_COLLECTION, metadata={"hnsw:space": "cosine"})
 
+def _chroma_where(where: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Chroma wants exactly one top-level key; several equality keys mean $and.
+    if not where:
+        return None
+    if len(where) == 1:
+        return where
+    return {"$and": [{k: v} for k, v in where.items()]}
 
-def upsert(profile_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
-    # Chroma requires metadata values to be primitives. JSON-encode others.
-    sanitized: Dict[str, Any] = {}
-    for k, v in (metadata or {}).items():
-        if isinstance(v, (str, int, float, bool)) or v is None:
-            sanitized[k] = v
-        else:
-            try:
-                sanitized[k] = json.dumps(v)
-            except Exception:
-                sanitized[k] = str(v)
-    _collection.upsert(ids=[profile_id], embeddings=[embedding], metadatas=[sanitized])
 
+class ChromaVectorStore(VectorStore):
+    name = "chroma"
 
-def delete(profile_id: str) -> None:
-    _collection.delete(ids=[profile_id])
+    def __init__(self, path: str, collection: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        self._client = chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+        self._collection = self._client.get_or_create_collection(name=collection, metadata={"hnsw:space": "cosine"})
 
+    def upsert(self, profile_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+        self._collection.upsert(ids=[profile_id], embeddings=[embedding], metadatas=[sanitize_metadata(metadata)])
 
-def query(query_embedding: List[float], n_results: int = 50, where: Optional[Dict[str, Any]] = None):
-    return _collection.query(query_embeddings=[query_embedding], n_results=n_results, where=where)
+    def delete(self, profile_id: str) -> None:
+        self._collection.delete(ids=[profile_id])
+
+    def upsert_many(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]) -> None:
+        if len(ids):
+            self._collection.upsert(ids=list(ids), embeddings=embeddings, metadatas=[sanitize_metadata(m) for m in metadatas])
+
+    def delete_many(self, ids: Sequence[str]) -> None:
+        if len(ids):
+            self._collection.delete(ids=list(ids))
+
+    def query(self, query_embedding: List[float], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self._collection.query(query_embeddings=[query_embedding], n_results=n_results, where=_chroma_where(where))
+
+    def query_many(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self._collection.query(query_embeddings=list(query_embeddings), n_results=n_results, where=_chroma_where(where))
+
+    def query_ids(self, query_embedding: List[float], ids: Sequence[str], n_results: int = 50) -> Dict[str, Any]:
+        # Chroma restricts the search to the given ids itself; no metadata filter to evaluate
+        if not len(ids) or n_results <= 0:
+            return {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+        try:
+            return self._collection.query(query_embeddings=[query_embedding], ids=list(ids), n_results=min(n_results, len(ids)))
+        except chromadb.errors.ChromaError:
+            # an id Chroma has never seen fails the whole call; the metadata filter skips it
+            return super().query_ids(query_embedding, ids, n_results=n_results)
+
+    def get_embeddings(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        if not len(ids):
+            return {}
+        res = self._collection.get(ids=list(ids), include=["embeddings"])
+        return {pid: list(map(float, emb)) for pid, emb in zip(res["ids"], res["embeddings"])}
+
+    def metadatas(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        res = self._collection.get(include=["metadatas"])
+        return list(res["ids"]), [m or {} for m in res["metadatas"]]
+
+    def ids(self, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        return list(self._collection.get(where=_chroma_where(where), include=[])["ids"])
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        if not where:
+            return self._collection.count()
+        return len(self._collection.get(where=_chroma_where(where), include=[])["ids"])
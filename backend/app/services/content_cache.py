@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+import json
+import threading
+from ..config import (CONTENT_CACHE_PATH, CONTENT_CACHE_MAX_MB, PARSE_CACHE_MAX_MB, PARSE_CACHE_TTL_S,
+                      PDF_MAX_CHARS, PDF_MAX_PAGES)
+from .cache import SqliteCache
+
+# Pipeline results by content hash, so re-processing a resume seen before costs two
+# lookups instead of a PDF extraction and an LLM call:
+#   text:  sha256(PDF bytes) + extraction budgets          -> extracted text
+#   parse: model + prompt version + sha256(normalized text) -> parsing.extract() output
+# Both live in one SQLite file that survives restarts, each tier with its own size
+# bound; parse results also expire after PARSE_CACHE_TTL_S. Empty results are not
+# stored: they are also what a failed extraction or LLM call returns.
+
+
+class _Kind:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hitRate": (self.hits / lookups) if lookups else 0.0,
+                "savedMs": round(self.saved_ms, 1)}
+
+
+class ContentCache:
+    def __init__(self, path: str, text_max_bytes: int, parse_max_bytes: int,
+                 parse_ttl_s: Optional[float] = None) -> None:
+        self._path = path
+        self._limits = {"text": (text_max_bytes, None), "parse": (parse_max_bytes, parse_ttl_s)}
+        self._tiers: Dict[str, SqliteCache] = {}
+        self._lock = threading.Lock()
+        self._kinds = {"text": _Kind(), "parse": _Kind()}
+
+    def _tier(self, kind: str) -> Optional[SqliteCache]:
+        # opened on first use, not at import
+        if not self._path:
+            return None
+        with self._lock:
+            if kind not in self._tiers:
+                max_bytes, ttl_s = self._limits[kind]
+                self._tiers[kind] = SqliteCache(self._path, f"{kind}_cache", max_bytes, ttl_s=ttl_s)
+            return self._tiers[kind]
+
+    def _get(self, kind: str, key: str, count_miss: bool = True) -> Optional[bytes]:
+        tier = self._tier(kind)
+        if tier is None:
+            return None
+        hit = tier.get(key)
+        with self._lock:
+            stats = self._kinds[kind]
+            if hit is None:
+                stats.misses += count_miss
+                return None
+            stats.hits += 1
+            stats.saved_ms += hit[2]
+        return hit[0]
+
+    def _put(self, kind: str, key: str, value: bytes, cost_ms: float) -> None:
+        tier = self._tier(kind)
+        if tier is None:
+            return
+        try:
+            tier.put(key, value, cost_ms=cost_ms)
+        except Exception as e:
+            print(f"[content_cache] persist failed: {type(e).__name__}: {e}")
+
+    @staticmethod
+    def _text_key(pdf_sha256: str) -> str:
+        # the budgets shape the text, so changing them re-extracts
+        return f"{pdf_sha256}:{PDF_MAX_CHARS}:{PDF_MAX_PAGES}"
+
+    def get_text(self, pdf_sha256: str) -> Optional[str]:
+        blob = self._get("text", self._text_key(pdf_sha256))
+        return blob.decode() if blob is not None else None
+
+    def put_text(self, pdf_sha256: str, text: str, cost_ms: float) -> None:
+        if text:
+            self._put("text", self._text_key(pdf_sha256), text.encode(), cost_ms)
+
+    # parse misses are counted as LLM calls (put_parse), not lookups: the pipeline looks
+    # before waiting for an LLM slot and parsing.extract() looks again once it has one
+
+    def get_parse(self, key: str) -> Optional[Dict[str, Any]]:
+        blob = self._get("parse", key, count_miss=False)
+        return json.loads(blob) if blob is not None else None
+
+    def put_parse(self, key: str, parsed: Dict[str, Any], cost_ms: float, store: bool = True) -> None:
+        """Record an LLM call that took cost_ms, keeping its result if store."""
+        with self._lock:
+            self._kinds["parse"].misses += 1
+        if store:
+            self._put("parse", key, json.dumps(parsed).encode(), cost_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {kind: s.stats() for kind, s in self._kinds.items()}
+            tiers = dict(self._tiers)
+        for kind, tier in tiers.items():
+            out[kind]["disk"] = tier.info()
+        return out
+
+
+content_cache = ContentCache(CONTENT_CACHE_PATH, CONTENT_CACHE_MAX_MB * 1024 * 1024,
+                             PARSE_CACHE_MAX_MB * 1024 * 1024, PARSE_CACHE_TTL_S)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import threading
+from ..config import EMBED_CACHE_PATH, EMBED_CACHE_MAX_MB, EMBED_CACHE_LRU_SIZE
+from .cache import LRUCache, SqliteCache
+
+# Content-addressed embedding cache: (provider, model, sha256(text)) -> vector.
+# Tier 1 is an in-process LRU, tier 2 a size-bounded SQLite file that survives restarts.
+
+
+def cache_key(provider: str, model: str, text: str) -> str:
+    return f"{provider}:{model}:{hashlib.sha256((text or '').encode()).hexdigest()}"
+
+
+def _encode(vec: Sequence[float]) -> Tuple[bytes, str]:
+    # Local vectors are float32-exact, store them at half the size; provider
+    # vectors keep full precision so a hit returns exactly what a miss did.
+    import numpy as np
+    a64 = np.asarray(vec, dtype=np.float64)
+    a32 = a64.astype(np.float32)
+    if np.array_equal(a32.astype(np.float64), a64):
+        return a32.tobytes(), "f4"
+    return a64.tobytes(), "f8"
+
+
+def _decode(blob: bytes, dtype: Optional[str]) -> List[float]:
+    import numpy as np
+    return np.frombuffer(blob, dtype=np.float32 if dtype == "f4" else np.float64).tolist()
+
+
+class EmbeddingCache:
+    def __init__(self, path: str, max_bytes: int, lru_size: int) -> None:
+        self._lru = LRUCache(lru_size)
+        self._path = path
+        self._max_bytes = max_bytes
+        self._disk_tier: Optional[SqliteCache] = None
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.provider_calls_saved = 0
+        self.saved_ms = 0.0
+
+    @property
+    def _disk(self) -> Optional[SqliteCache]:
+        # opened on first use, not at import
+        if self._disk_tier is None and self._path:
+            with self._lock:
+                if self._disk_tier is None:
+                    self._disk_tier = SqliteCache(self._path, "embedding_cache", self._max_bytes)
+        return self._disk_tier
+
+    def _record_hit(self, key: str, cost_ms: float, tier: str) -> None:
+        with self._lock:
+            if tier == "memory":
+                self.hits_memory += 1
+            else:
+                self.hits_disk += 1
+            if not key.startswith("local:"):
+                self.provider_calls_saved += 1
+            self.saved_ms += cost_ms
+
+    def get_many(self, provider: str, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        keys = [cache_key(provider, model, t) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(keys)
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            hit = self._lru.get(key)
+            if hit is not None:
+                out[i] = list(hit[0])
+                self._record_hit(key, hit[1], "memory")
+            else:
+                missing.setdefault(key, []).append(i)
+        if missing and self._disk is not None:
+            for key, (blob, dtype, cost_ms) in self._disk.get_many(list(missing)).items():
+                vec = _decode(blob, dtype)
+                self._lru.put(key, (tuple(vec), cost_ms))
+                for i in missing.pop(key):
+                    out[i] = list(vec)
+                    self._record_hit(key, cost_ms, "disk")
+        with self._lock:
+            self.misses += sum(len(v) for v in missing.values())
+        return out
+
+    def get(self, provider: str, model: str, text: str) -> Optional[List[float]]:
+        return self.get_many(provider, model, [text])[0]
+
+    def put_many(self, provider: str, model: str, texts: Sequence[str], vecs: Sequence[Sequence[float]], cost_ms: float = 0.0) -> None:
+        """Store vectors; cost_ms is the per-item cost of computing them."""
+        rows = []
+        for text, vec in zip(texts, vecs):
+            key = cache_key(provider, model, text)
+            vec = tuple(vec)  # callers get copies, so no one can change a cached vector in place
+            self._lru.put(key, (vec, cost_ms))
+            blob, dtype = _encode(vec)
+            rows.append((key, blob, dtype, cost_ms))
+        if self._disk is not None:
+            try:
+                self._disk.put_many(rows)
+            except Exception as e:
+                print(f"[embedding_cache] persist failed: {type(e).__name__}: {e}")
+
+    def put(self, provider: str, model: str, text: str, vec: Sequence[float], cost_ms: float = 0.0) -> None:
+        self.put_many(provider, model, [text], [vec], cost_ms)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.hits_memory + self.hits_disk
+            lookups = hits + self.misses
+            out: Dict[str, Any] = {
+                "hits": hits,
+                "hitsMemory": self.hits_memory,
+                "hitsDisk": self.hits_disk,
+                "misses": self.misses,
+                "hitRate": (hits / lookups) if lookups else 0.0,
+                "providerCallsSaved": self.provider_calls_saved,
+                "savedMs": round(self.saved_ms, 1),
+                "memoryEntries": len(self._lru),
+            }
+        if self._disk is not None:
+            out["disk"] = self._disk.info()
+        return out
+
+
+embedding_cache = EmbeddingCache(EMBED_CACHE_PATH, EMBED_CACHE_MAX_MB * 1024 * 1024, EMBED_CACHE_LRU_SIZE)
@@ -1,14 +1,26 @@
 from __future__ import annotations
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+from functools import lru_cache
 import hashlib
-import numpy as np
-import httpx
-from ..config import EMBEDDINGS_PROVIDER, GEMINI_API_KEY
+import time
+from ..config import EMBEDDINGS_PROVIDER, GEMINI_API_KEY, GEMINI_EMBED_MODEL
+from .embedding_cache import embedding_cache
+from .gemini_embeddings import gemini_embedder
+
+# numpy is imported inside the functions that need it so importing this module
+# (every router does) doesn't put numpy on the startup path.
+if TYPE_CHECKING:
+    import numpy as np
 
 # Dev-friendly deterministic embedding without external calls.
 # Hash n-grams into a fixed-size vector.
 
 DIM = 768
+LOCAL_MODEL = f"md5-bag-{DIM}"
+MAX_TOKENS = 4000
+# Rows accumulated per np.bincount call in _embed_local_matrix. Bounds the scratch
+# buffer to BATCH_ROWS * DIM float64 counts (~25MB) regardless of batch size.
+BATCH_ROWS = 4096
 
 
 def _tokenize(text: str) -> List[str]:
@@ -19,40 +31,150 @@ def _hash_token(tok: str) -> int:
     return int(hashlib.md5(tok.encode()).hexdigest(), 16)
 
 
+@lru_cache(maxsize=1 << 18)
+def _token_bucket(tok: str) -> int:
+    # Same bucket as _hash_token(tok) % DIM (existing vectors depend on it), but reads
+    # the digest bytes directly and memoizes, so each distinct token is hashed once.
+    return int.from_bytes(hashlib.md5(tok.encode()).digest(), "big") % DIM
+
+
+def _embed_local_matrix(texts: Sequence[str]) -> np.ndarray:
+    """Embed a batch of texts into an (n, DIM) float32 matrix of l2-normalized rows.
+
+    Row i is bit-for-bit equal to the vector _embed_local(texts[i]) used to return:
+    counts are small integers and the squared norm stays below 2**24, so float32
+    accumulation is exact regardless of summation order.
+    """
+    import numpy as np
+    n = len(texts)
+    out = np.zeros((n, DIM), dtype=np.float32)
+    for start in range(0, n, BATCH_ROWS):
+        chunk = texts[start:start + BATCH_ROWS]
+        lengths = np.empty(len(chunk), dtype=np.int64)
+        buckets: List[int] = []
+        for i, text in enumerate(chunk):
+            toks = _tokenize(text or "")[:MAX_TOKENS]
+            lengths[i] = len(toks)
+            buckets.extend(map(_token_bucket, toks))
+        if not buckets:
+            continue
+        rows = np.repeat(np.arange(len(chunk), dtype=np.int64), lengths)
+        flat = rows * DIM + np.asarray(buckets, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(chunk) * DIM)
+        out[start:start + len(chunk)] = counts.reshape(len(chunk), DIM)
+    # l2 normalize all rows at once; zero rows (empty text) stay zero
+    norms = np.sqrt(np.einsum("ij,ij->i", out, out))
+    nz = norms > 0
+    out[nz] /= norms[nz, None]
+    return out
+
+
 def _embed_local(text: str) -> List[float]:
-    vec = np.zeros(DIM, dtype=np.float32)
-    toks = _tokenize(text)[:4000]
-    for t in toks:
-        h = _hash_token(t) % DIM
-        vec[h] += 1.0
-    # l2 normalize
-    norm = np.linalg.norm(vec)
-    if norm > 0:
-        vec = vec / norm
-    return vec.tolist()
-
-
-def _embed_gemini(text: str) -> List[float]:
-    # Uses Google Generative Language API text-embedding-004
-    if not GEMINI_API_KEY:
-        return _embed_local(text)
-    url = "https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:embedContent"
-    params = {"key": GEMINI_API_KEY}
-    payload = {"model": "text-embedding-004", "content": {"parts": [{"text": text[:8000]}]}}
-    try:
-        resp = httpx.post(url, params=params, json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        vec = data.get("embedding", {}).get("values")
-        if isinstance(vec, list) and vec:
-            return vec
-    except Exception:
-        pass
-    return _embed_local(text)
+    return _embed_local_matrix([text])[0].tolist()
 
 
-def embed(text: str) -> List[float]:
+def _provider_model() -> Tuple[str, str]:
     provider = (EMBEDDINGS_PROVIDER or "local").lower()
+    if provider == "gemini" and GEMINI_API_KEY:
+        return "gemini", GEMINI_EMBED_MODEL
+    return "local", LOCAL_MODEL
+
+
+def _finish_batch(
+    provider: str,
+    model: str,
+    cached: List[Optional[List[float]]],
+    miss_idx: List[int],
+    miss_texts: List[str],
+    fresh: Sequence[Optional[Sequence[float]]],
+    cost_ms: float,
+) -> np.ndarray:
+    import numpy as np
+    # Cache what the provider returned, fill its failures from the local embedder
+    # (uncached, so they are retried), and assemble rows in input order.
+    ok = [j for j, v in enumerate(fresh) if v is not None]
+    embedding_cache.put_many(provider, model, [miss_texts[j] for j in ok], [fresh[j] for j in ok], cost_ms)
+    fresh = [v if v is not None else _embed_local(miss_texts[j]) for j, v in enumerate(fresh)]
+    width = len(fresh[0]) if fresh else len(next(v for v in cached if v is not None))
+    out = np.empty((len(cached), width), dtype=np.float32)
+    for i, v in enumerate(cached):
+        if v is not None:
+            out[i] = v
+    for j, i in enumerate(miss_idx):
+        out[i] = fresh[j]
+    return out
+
+
+def embed(text: str) -> List[float]:
+    provider, model = _provider_model()
+    cached = embedding_cache.get(provider, model, text)
+    if cached is not None:
+        return cached
+    t0 = time.perf_counter()
+    if provider == "gemini":
+        vec = gemini_embedder.embed_many_blocking([text])[0]
+        if vec is None:
+            # provider fallback is not cached, so the next call retries Gemini
+            return _embed_local(text)
+    else:
+        vec = _embed_local(text)
+    embedding_cache.put(provider, model, text, vec, (time.perf_counter() - t0) * 1000)
+    return vec
+
+
+def embed_batch(texts: Sequence[str]) -> np.ndarray:
+    """Embed many texts at once into an (n, DIM) float32 matrix; row i equals embed(texts[i])."""
+    import numpy as np
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, DIM), dtype=np.float32)
+    provider, model = _provider_model()
+    cached = embedding_cache.get_many(provider, model, texts)
+    miss_idx = [i for i, v in enumerate(cached) if v is None]
+    miss_texts = [texts[i] for i in miss_idx]
+    if not miss_idx:
+        return np.asarray(cached, dtype=np.float32)
+    t0 = time.perf_counter()
     if provider == "gemini":
-        return _embed_gemini(text)
-    return _embed_local(text)
+        fresh = gemini_embedder.embed_many_blocking(miss_texts)
+    else:
+        fresh = _embed_local_matrix(miss_texts)
+        if len(miss_idx) == len(texts):
+            embedding_cache.put_many(provider, model, texts, fresh, (time.perf_counter() - t0) * 1000 / len(texts))
+            return fresh
+    return _finish_batch(provider, model, cached, miss_idx, miss_texts, fresh, (time.perf_counter() - t0) * 1000 / len(miss_texts))
+
+
+async def aembed(text: str) -> List[float]:
+    """Non-blocking embed(): Gemini calls are pooled and micro-batched across callers."""
+    provider, model = _provider_model()
+    if provider != "gemini":
+        return embed(text)
+    cached = embedding_cache.get(provider, model, text)
+    if cached is not None:
+        return cached
+    t0 = time.perf_counter()
+    vec = await gemini_embedder.embed(text)
+    if vec is None:
+        return _embed_local(text)
+    embedding_cache.put(provider, model, text, vec, (time.perf_counter() - t0) * 1000)
+    return vec
+
+
+async def aembed_batch(texts: Sequence[str]) -> np.ndarray:
+    """Non-blocking embed_batch(); Gemini misses go out as concurrent 100-text requests."""
+    import numpy as np
+    provider, model = _provider_model()
+    if provider != "gemini":
+        return embed_batch(texts)
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, DIM), dtype=np.float32)
+    cached = embedding_cache.get_many(provider, model, texts)
+    miss_idx = [i for i, v in enumerate(cached) if v is None]
+    miss_texts = [texts[i] for i in miss_idx]
+    if not miss_idx:
+        return np.asarray(cached, dtype=np.float32)
+    t0 = time.perf_counter()
+    fresh = await gemini_embedder.embed_many(miss_texts)
+    return _finish_batch(provider, model, cached, miss_idx, miss_texts, fresh, (time.perf_counter() - t0) * 1000 / len(miss_texts))
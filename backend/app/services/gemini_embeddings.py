@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import threading
+import httpx
+from ..config import (
+    GEMINI_API_KEY,
+    GEMINI_EMBED_MODEL,
+    GEMINI_BASE_URL,
+    GEMINI_MAX_IN_FLIGHT,
+    GEMINI_BATCH_WINDOW_MS,
+    GEMINI_TIMEOUT_S,
+)
+
+# batchEmbedContents accepts at most 100 requests per call
+MAX_BATCH = 100
+MAX_CHARS = 8000
+
+
+class GeminiEmbedder:
+    """Pooled, batched client for the Gemini batchEmbedContents endpoint.
+
+    Async callers share one keep-alive httpx.AsyncClient; at most `max_in_flight`
+    HTTP requests run at once. embed() micro-batches: calls arriving within
+    `window_ms` of each other are sent as one request (flushed early at MAX_BATCH).
+    Results are None for any text the provider failed to embed.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        max_in_flight: int = 4,
+        window_ms: float = 5.0,
+        timeout: float = 30.0,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self.timeout = timeout
+        self.max_batch = max(1, min(int(max_batch), MAX_BATCH))
+        self.requests_sent = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+
+    # request shape
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1beta/models/{self.model}:batchEmbedContents"
+
+    def _payload(self, texts: Sequence[str]) -> Dict[str, Any]:
+        return {
+            "requests": [
+                {"model": f"models/{self.model}", "content": {"parts": [{"text": (t or "")[:MAX_CHARS]}]}}
+                for t in texts
+            ]
+        }
+
+    @staticmethod
+    def _parse(data: Any, n: int) -> List[Optional[List[float]]]:
+        embs = data.get("embeddings") if isinstance(data, dict) else None
+        if not isinstance(embs, list) or len(embs) != n:
+            return [None] * n
+        out: List[Optional[List[float]]] = []
+        for e in embs:
+            vals = e.get("values") if isinstance(e, dict) else None
+            out.append(vals if isinstance(vals, list) and vals else None)
+        return out
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+
+    # async path
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # clients and semaphores are tied to the loop that created them
+            if self._aclient is not None:
+                self._discard_client(self._aclient, self._loop)
+            self._loop = loop
+            self._aclient = httpx.AsyncClient(limits=self._limits(), timeout=httpx.Timeout(self.timeout, connect=5.0))
+            self._sem = asyncio.Semaphore(self.max_in_flight)
+            self._pending = []
+            self._timer = None
+        return loop
+
+    def _discard_client(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        # close a client left behind by an earlier loop: on that loop while it still runs,
+        # else here, where only its pool bookkeeping is left to release
+        async def close() -> None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"[gemini] closing a stale client failed: {type(e).__name__}: {e}")
+
+        def spawn(on: asyncio.AbstractEventLoop) -> None:
+            task = on.create_task(close())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            loop.call_soon_threadsafe(spawn, loop)
+        else:
+            spawn(asyncio.get_running_loop())
+
+    async def _post(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        self._bind_loop()
+        async with self._sem:
+            self.requests_sent += 1
+            try:
+                resp = await self._aclient.post(self.url, params={"key": self.api_key}, json=self._payload(texts))
+                resp.raise_for_status()
+                return self._parse(resp.json(), len(texts))
+            except Exception as e:
+                print(f"[gemini] batch of {len(texts)} failed: {type(e).__name__}: {e}")
+                return [None] * len(texts)
+
+    async def embed_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        texts = list(texts)
+        chunks = [texts[i:i + self.max_batch] for i in range(0, len(texts), self.max_batch)]
+        results = await asyncio.gather(*(self._post(c) for c in chunks))
+        return [v for chunk in results for v in chunk]
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        loop = self._bind_loop()
+        fut = loop.create_future()
+        self._pending.append((text, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self._loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        vecs = await self._post([t for t, _ in batch])
+        for (_, fut), vec in zip(batch, vecs):
+            if not fut.done():
+                fut.set_result(vec)
+
+    async def aclose(self) -> None:
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._loop = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # blocking path, for worker threads and scripts without a running loop
+
+    def embed_many_blocking(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits(), timeout=httpx.Timeout(self.timeout, connect=5.0))
+        texts = list(texts)
+        out: List[Optional[List[float]]] = []
+        for i in range(0, len(texts), self.max_batch):
+            chunk = texts[i:i + self.max_batch]
+            self.requests_sent += 1
+            try:
+                resp = self._client.post(self.url, params={"key": self.api_key}, json=self._payload(chunk))
+                resp.raise_for_status()
+                out.extend(self._parse(resp.json(), len(chunk)))
+            except Exception as e:
+                print(f"[gemini] batch of {len(chunk)} failed: {type(e).__name__}: {e}")
+                out.extend([None] * len(chunk))
+        return out
+
+
+gemini_embedder = GeminiEmbedder(
+    api_key=GEMINI_API_KEY,
+    model=GEMINI_EMBED_MODEL,
+    base_url=GEMINI_BASE_URL,
+    max_in_flight=GEMINI_MAX_IN_FLIGHT,
+    window_ms=GEMINI_BATCH_WINDOW_MS,
+    timeout=GEMINI_TIMEOUT_S,
+)
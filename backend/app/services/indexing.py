@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session, select
+from ..db.models import Profile
+from ..db import fts
+from ..config import VECTOR_WRITE_CHUNK
+from ..utils.json import json_to_list
+from .embeddings import embed_batch
+from .vector_store import upsert_many as vector_upsert_many, upsert as vector_upsert, flush as vector_flush, membership_metadata, stored_embedding
+from . import match_table
+
+
+def profile_summary(p: Profile) -> str:
+    skills = ", ".join(json_to_list(p.skills_norm_json))
+    topics = ", ".join(json_to_list(p.topics_json))
+    return f"{p.name or ''} | {p.headline or ''} | {skills} | {topics}"
+
+
+def profile_metadata(p: Profile, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    skills = json_to_list(p.skills_norm_json)
+    topics = json_to_list(p.topics_json)
+    metadata = {
+        "id": p.id,
+        "name": p.name,
+        "headline": p.headline,
+        "skills_norm": skills,
+        "topics": topics,
+        "school": p.school,
+        "company": p.company,
+        "seniority": p.seniority,
+        "available_now": p.available_now,
+        "hackathon": p.hackathon,
+    }
+    # flat membership keys so skill/topic filters run inside the index
+    metadata.update(membership_metadata("skills_norm", skills))
+    metadata.update(membership_metadata("topics", topics))
+    metadata.update(extra or {})
+    return metadata
+
+
+def index_profiles(profiles: List[Profile], extra: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+    """Embed and upsert profiles in one batch. extra maps profile id -> additional metadata."""
+    if not profiles:
+        return 0
+    vecs = embed_batch([profile_summary(p) for p in profiles])
+    metas = [profile_metadata(p, (extra or {}).get(p.id)) for p in profiles]
+    vector_upsert_many([p.id for p in profiles], vecs, metas)
+    return len(profiles)
+
+
+def refresh_metadata(p: Profile) -> bool:
+    """Rewrite an indexed profile's metadata without re-embedding (e.g. after a PATCH).
+    Enrichment-only metadata (city/country_code) is dropped, as in reindex_all."""
+    vec = stored_embedding(p.id)
+    if vec is None:
+        return False
+    vector_upsert(p.id, vec, profile_metadata(p))
+    return True
+
+
+def reindex_all(db: Session, chunk_size: int = VECTOR_WRITE_CHUNK) -> int:
+    """Re-embed every ready profile from SQLite and bulk-upsert it.
+
+    Metadata that only lives in the index (city/country_code from enrichment) is not
+    in the Profile table and is dropped for re-indexed rows.
+    """
+    total = 0
+    offset = 0
+    while True:
+        batch = db.exec(
+            select(Profile).where(Profile.status == "ready").order_by(Profile.id).offset(offset).limit(chunk_size)
+        ).all()
+        if not batch:
+            break
+        total += index_profiles(list(batch))
+        offset += len(batch)
+    vector_flush()
+    fts.rebuild(db)
+    match_table.clear(db)
+    return total
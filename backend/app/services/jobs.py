@@ -0,0 +1,296 @@
+from __future__ import annotations
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import os
+import random
+import socket
+import traceback
+from sqlalchemy import case, delete, func, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from ..config import (
+    JOB_WORKERS, JOB_PDF_CONCURRENCY, JOB_LLM_CONCURRENCY, JOB_EMBED_CONCURRENCY,
+    JOB_LEASE_S, JOB_POLL_S, JOB_MAX_ATTEMPTS, JOB_BACKOFF_S, JOB_BACKOFF_MAX_S,
+)
+from ..db.models import Job
+from ..db.session import engine
+from . import pipeline
+
+# Durable queue for the profile pipeline. Routes enqueue a Job row in the same
+# transaction as the profile's status change, so a committed "pending" profile always
+# has its run on record. Each API process runs a WorkerPool: async workers claim the
+# highest-priority due job with one atomic UPDATE, hold a lease on it that they renew
+# while the pipeline runs, and record the outcome only while they still own it. A
+# failed attempt is requeued with exponential backoff until max_attempts; a job whose
+# lease lapsed (its process crashed or hung) is requeued by the next sweep, in any
+# process. Stage semaphores cap PDF, LLM and embedding calls across the pool.
+# Queue statements run whole in a thread on the sync engine: a transaction that
+# needed the event loop to reach its COMMIT could wait on a writer blocking the loop.
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+KEEP_DONE = timedelta(days=1)  # finished jobs are pruned after this; failed ones are kept
+
+Claimed = Tuple[int, str, int, int]  # id, profile_id, attempts (this one included), max_attempts
+
+
+def enqueue(db: Session, profile_id: str, priority: int = 0) -> Job:
+    """Queue a pipeline run for profile_id in db's transaction (the caller commits).
+
+    A profile whose previous run has not started yet keeps that one job, made due now
+    at the higher of the two priorities. Call WorkerPool.notify() after the commit.
+    """
+    now = datetime.utcnow()
+    job = db.exec(select(Job).where(Job.profile_id == profile_id, Job.state == QUEUED)).first()
+    if job is None:
+        job = Job(profile_id=profile_id, priority=priority, max_attempts=JOB_MAX_ATTEMPTS, run_after=now)
+    else:
+        job.priority = max(job.priority, priority)
+        job.attempts = 0
+        job.run_after = now
+        job.updated_at = now
+    db.add(job)
+    return job
+
+
+def counts(db: Session) -> Dict[str, int]:
+    """Jobs per state, for /admin/stats."""
+    rows = db.exec(select(Job.state, func.count()).group_by(Job.state)).all()
+    return {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED)} | dict(rows)
+
+
+def claim(owner: str, lease_s: float) -> Optional[Claimed]:
+    """Take the highest-priority due job for owner, or None. Skips profiles that already
+    have a job running, so two workers never process the same profile at once."""
+    now = datetime.utcnow()
+    cand, running = aliased(Job), aliased(Job)
+    busy = select(running.id).where(running.profile_id == cand.profile_id, running.state == RUNNING).exists()
+    nxt = (select(cand.id).where(cand.state == QUEUED, cand.run_after <= now, ~busy)
+           .order_by(cand.priority.desc(), cand.id).limit(1).scalar_subquery())
+    stmt = (update(Job).where(Job.id == nxt, Job.state == QUEUED)
+            .values(state=RUNNING, attempts=Job.attempts + 1, lease_owner=owner,
+                    lease_expires_at=now + timedelta(seconds=lease_s), updated_at=now)
+            .returning(Job.id, Job.profile_id, Job.attempts, Job.max_attempts))
+    with engine.begin() as conn:
+        row = conn.execute(stmt).first()
+    return tuple(row) if row else None
+
+
+def _finish(job_id: int, owner: str, **values) -> bool:
+    # only while owner still holds the job: a lease that lapsed may have been recovered
+    stmt = (update(Job).where(Job.id == job_id, Job.lease_owner == owner, Job.state == RUNNING)
+            .values(updated_at=datetime.utcnow(), **values))
+    with engine.begin() as conn:
+        return conn.execute(stmt).rowcount == 1
+
+
+def renew(job_id: int, owner: str, lease_s: float) -> bool:
+    return _finish(job_id, owner, lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_s))
+
+
+def complete(job_id: int, owner: str) -> bool:
+    return _finish(job_id, owner, state=DONE, lease_owner=None, lease_expires_at=None)
+
+
+def retry(job_id: int, owner: str, delay_s: float, error: str) -> bool:
+    return _finish(job_id, owner, state=QUEUED, lease_owner=None, lease_expires_at=None, last_error=error,
+                         run_after=datetime.utcnow() + timedelta(seconds=delay_s))
+
+
+def fail(job_id: int, owner: str, error: str) -> bool:
+    return _finish(job_id, owner, state=FAILED, lease_owner=None, lease_expires_at=None, last_error=error)
+
+
+def release(owner: str) -> int:
+    """Hand owner's running jobs back untried (its pool is stopping); the attempts are not counted."""
+    stmt = (update(Job).where(Job.lease_owner == owner, Job.state == RUNNING)
+            .values(state=QUEUED, lease_owner=None, lease_expires_at=None, attempts=Job.attempts - 1,
+                    updated_at=datetime.utcnow()))
+    with engine.begin() as conn:
+        return conn.execute(stmt).rowcount
+
+
+def recover() -> List[Tuple[str, str]]:
+    """Requeue running jobs whose lease lapsed, or fail those out of attempts; prune old
+    finished jobs. Returns (profile_id, new state) per recovered job."""
+    now = datetime.utcnow()
+    stmt = (update(Job).where(Job.state == RUNNING, Job.lease_expires_at < now)
+            .values(state=case((Job.attempts >= Job.max_attempts, FAILED), else_=QUEUED),
+                    lease_owner=None, lease_expires_at=None, run_after=now, updated_at=now,
+                    last_error=func.coalesce(Job.last_error, "lease expired"))
+            .returning(Job.profile_id, Job.state))
+    with engine.begin() as conn:
+        rows = [tuple(r) for r in conn.execute(stmt).all()]
+        conn.execute(delete(Job).where(Job.state == DONE, Job.updated_at < now - KEEP_DONE))
+    return rows
+
+
+Handler = Callable[..., Awaitable[None]]
+
+
+class WorkerPool:
+    """This process's job workers: `workers` claim loops sharing one set of stage caps.
+
+    handler(profile_id, stages, final) runs a job and raises to fail the attempt;
+    final is True on the job's last attempt. Defaults to pipeline.run.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        pdf: int = JOB_PDF_CONCURRENCY,
+        llm: int = JOB_LLM_CONCURRENCY,
+        embed: int = JOB_EMBED_CONCURRENCY,
+        lease_s: float = JOB_LEASE_S,
+        poll_s: float = JOB_POLL_S,
+        backoff_s: float = JOB_BACKOFF_S,
+        backoff_max_s: float = JOB_BACKOFF_MAX_S,
+        handler: Optional[Handler] = None,
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self.limits = {"pdf": pdf, "llm": llm, "embed": embed}
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.handler = handler
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.stages: Optional[pipeline.Stages] = None
+        self.busy = 0
+        self.completed = self.retried = self.failed = self.recovered = self.lost = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks or not self.workers:
+            return
+        # semaphores and the event belong to the loop the pool runs on
+        self.stages = pipeline.Stages(**self.limits)
+        self._wake = asyncio.Event()
+        await self._sweep()
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper(), name="job-sweeper"))
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue untried."""
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if tasks:
+            await asyncio.to_thread(release, self.owner)
+
+    def notify(self) -> None:
+        """Wake idle workers after enqueueing (otherwise they find the job within poll_s)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    @staticmethod
+    async def _db(fn, *args):
+        # a queue statement runs to completion even if its worker is cancelled, so by
+        # the time stop() releases this pool's jobs no claim is still in flight
+        call = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            await call
+            raise
+
+    def backoff(self, attempts: int) -> float:
+        # exponential, capped, with jitter so a burst of failures doesn't retry in lockstep
+        return min(self.backoff_max_s, self.backoff_s * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+    async def _work(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                job = await self._db(claim, self.owner, self.lease_s)
+            except Exception:
+                print("[jobs] claim failed:\n" + traceback.format_exc())
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_s)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except Exception:
+                # recording the outcome failed (e.g. the database stayed locked); the
+                # lease lapses and the sweep requeues the job, this worker carries on
+                print(f"[jobs] finishing job {job[0]} failed:\n" + traceback.format_exc())
+
+    async def _run(self, job: Claimed) -> None:
+        job_id, profile_id, attempts, max_attempts = job
+        handler = self.handler or pipeline.run
+        self.busy += 1
+        work = asyncio.create_task(handler(profile_id, self.stages, final=attempts >= max_attempts))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, work))
+        try:
+            await work
+        except asyncio.CancelledError:
+            if not heartbeat.done() or heartbeat.cancelled():
+                raise  # the pool is stopping
+            # the heartbeat found the lease gone: the job is another run's now, nothing to record
+            print(f"[jobs] lost the lease on job {job_id}; abandoned {profile_id}")
+            self.lost += 1
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:2000]
+            if attempts >= max_attempts:
+                await self._db(fail, job_id, self.owner, error)
+                self.failed += 1
+            else:
+                await self._db(retry, job_id, self.owner, self.backoff(attempts), error)
+                self.retried += 1
+        else:
+            await self._db(complete, job_id, self.owner)
+            self.completed += 1
+        finally:
+            heartbeat.cancel()
+            self.busy -= 1
+
+    async def _heartbeat(self, job_id: int, work: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.lease_s / 3)
+            try:
+                held = await self._db(renew, job_id, self.owner, self.lease_s)
+            except Exception:
+                print("[jobs] lease renewal failed:\n" + traceback.format_exc())
+                continue
+            if not held:
+                # the lease lapsed and the sweep requeued or failed the job; a second run
+                # of the same profile would race this one's writes
+                work.cancel()
+                return
+
+    async def _sweep(self) -> None:
+        for profile_id, state in await self._db(recover):
+            self.recovered += 1
+            if state == FAILED:
+                await pipeline.mark_failed(profile_id)
+            else:
+                self.notify()
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_s)
+            try:
+                await self._sweep()
+            except Exception:
+                print("[jobs] recovery sweep failed:\n" + traceback.format_exc())
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "busy": self.busy,
+            "stageLimits": self.limits,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "leasesLost": self.lost,
+        }
+
+
+job_pool = WorkerPool()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, Optional, Sequence, Set, Tuple
+from collections import OrderedDict
+import json
+import threading
+import time
+from ..config import MATCH_CACHE_ENABLED, MATCH_CACHE_MAX_MB, MATCH_CACHE_TTL_S
+from . import vector_store
+
+# /matches responses keyed by (user_id, k, topic, hackathon). Entries are validated
+# against generation counters rather than scanned on write:
+#   epoch          - bumped when a write can't be attributed (deletes, hackathon moves)
+#   any            - bumped by every profile write; guards hackathon=None results
+#   hackathon[H]   - bumped by writes of profiles in H; guards hackathon=H results
+# A user's own entries are dropped directly when that user is written, since their
+# query vector and keyword set changed regardless of hackathon.
+
+Token = Tuple[int, int]
+
+
+class MatchCache:
+    def __init__(self, max_bytes: int, ttl_s: float) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[Hashable, Tuple[Any, Token, float, int]]" = OrderedDict()
+        self._by_user: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._epoch = 0
+        self._any = 0
+        self._hack: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._stale = self._expired = self._evictions = 0
+
+    # generations
+
+    def token(self, hackathon: Optional[str]) -> Token:
+        """Generations a result for this hackathon filter depends on; take it before computing."""
+        with self._lock:
+            return self._epoch, (self._hack.get(hackathon, 0) if hackathon else self._any)
+
+    def profiles_written(self, ids: Sequence[str], hackathons: Optional[Set[Optional[str]]]) -> None:
+        with self._lock:
+            self._any += 1
+            if hackathons is None:
+                self._epoch += 1
+            else:
+                for h in hackathons:
+                    if h:
+                        self._hack[h] = self._hack.get(h, 0) + 1
+            for pid in ids:
+                for key in self._by_user.pop(pid, ()):
+                    self._drop_locked(key, track_user=False)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._epoch += 1
+
+    # entries
+
+    def _drop_locked(self, key: Hashable, track_user: bool = True) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[3]
+        if track_user:
+            keys = self._by_user.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[key[0]]
+
+    def get(self, key: Tuple[str, int, Optional[str], Optional[str]]) -> Optional[Any]:
+        if not MATCH_CACHE_ENABLED:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, token, expires, _ = entry
+            hackathon = key[3]
+            current = (self._epoch, self._hack.get(hackathon, 0) if hackathon else self._any)
+            if token != current or now >= expires:
+                if token != current:
+                    self._stale += 1
+                else:
+                    self._expired += 1
+                self._misses += 1
+                self._drop_locked(key)
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Tuple[str, int, Optional[str], Optional[str]], value: Any, token: Token) -> None:
+        if not MATCH_CACHE_ENABLED or self.max_bytes == 0:
+            return
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop_locked(key)
+            self._data[key] = (value, token, time.monotonic() + self.ttl_s, size)
+            self._by_user.setdefault(key[0], set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                self._drop_locked(next(iter(self._data)))
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._by_user.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hitRate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl_s,
+            }
+
+
+match_cache = MatchCache(MATCH_CACHE_MAX_MB * 1024 * 1024, MATCH_CACHE_TTL_S)
+vector_store.on_write(match_cache.profiles_written)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy import func, tuple_, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, delete, update
+from ..config import MATCH_TABLE_ENABLED, MATCH_TABLE_K, MATCH_TABLE_NEIGHBORS
+from ..db.models import MatchCandidate, MatchCandidateSet
+from ..db.repository import ProfileRepository, ProfileRow
+from .matching import blend_scores
+from .vector_store import query as vector_query, stored_embedding
+
+# Materialized /matches lists (no topic) per user and hackathon filter, kept in the
+# same order live retrieval returns them (vector similarity). Each set only claims
+# its first `size` rows are the exact top of the pool; writes shrink or patch sets in
+# place, and a request that needs more than `size` rows falls back to live scoring,
+# which rewrites the set.
+
+Entry = Tuple[str, float, float, float]  # candidate_id, score_vector, score_keyword, score_blended
+
+
+def _key(hackathon: Optional[str]) -> str:
+    return hackathon or ""
+
+
+def lookup(db: Session, user_id: str, k: int, hackathon: Optional[str] = None) -> Optional[Tuple[List[MatchCandidate], datetime]]:
+    """Top-k rows and their computed_at, or None when the table can't answer exactly."""
+    if not MATCH_TABLE_ENABLED:
+        return None
+    s = db.get(MatchCandidateSet, (user_id, _key(hackathon)))
+    if s is None or (k > s.size and not s.exhausted):
+        return None
+    rows = db.exec(
+        select(MatchCandidate)
+        .where(MatchCandidate.user_id == user_id, MatchCandidate.hackathon == s.hackathon)
+        .order_by(MatchCandidate.rank)
+        .limit(k)
+    ).all()
+    return list(rows), s.computed_at
+
+
+def _write_set(db: Session, user_id: str, key: str, entries: Sequence[Entry], exhausted: bool,
+               computed_at: Optional[datetime] = None) -> datetime:
+    # Core statements on the session's connection: a list is rewritten on every change,
+    # and ORM unit-of-work for ~50 rows per list costs more than the scoring itself.
+    computed_at = computed_at or datetime.utcnow()
+    conn = db.connection()
+    conn.execute(delete(MatchCandidate).where(MatchCandidate.user_id == user_id, MatchCandidate.hackathon == key))
+    if entries:
+        conn.execute(insert(MatchCandidate), [
+            {"user_id": user_id, "hackathon": key, "candidate_id": cid, "rank": i,
+             "score_vector": v, "score_keyword": kw, "score_blended": b}
+            for i, (cid, v, kw, b) in enumerate(entries)
+        ])
+    header = {"size": len(entries), "exhausted": exhausted, "computed_at": computed_at}
+    conn.execute(
+        sqlite_insert(MatchCandidateSet)
+        .values(user_id=user_id, hackathon=key, **header)
+        .on_conflict_do_update(index_elements=["user_id", "hackathon"], set_=header)
+    )
+    return computed_at
+
+
+def store(db: Session, user_id: str, hackathon: Optional[str], ids: Sequence[str], sv: Sequence[float],
+          sk: Sequence[float], sb: Sequence[float], requested: int) -> datetime:
+    """Materialize a live result; requested is the n_results it was retrieved with."""
+    if not MATCH_TABLE_ENABLED:
+        return datetime.utcnow()
+    entries = list(zip(ids, sv, sk, sb))
+    exhausted = len(entries) < requested and len(entries) <= MATCH_TABLE_K
+    computed_at = _write_set(db, user_id, _key(hackathon), entries[:MATCH_TABLE_K], exhausted)
+    db.commit()
+    return computed_at
+
+
+def _user_dict(r: ProfileRow) -> Dict:
+    return {"id": r.id, "skills_norm": r.skills_norm, "topics": r.topics}
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    import numpy as np
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    na, nb = float(np.linalg.norm(a)), float(np.linalg.norm(b))
+    return float(a @ b / (na * nb)) if na and nb else 0.0
+
+
+def _sets_for(db: Session, user_ids: Iterable[str]) -> List[MatchCandidateSet]:
+    ids = list(user_ids)
+    out: List[MatchCandidateSet] = []
+    for i in range(0, len(ids), 500):
+        out.extend(db.exec(select(MatchCandidateSet).where(MatchCandidateSet.user_id.in_(ids[i:i + 500]))).all())
+    return out
+
+
+def _entries(db: Session, s: MatchCandidateSet) -> List[Entry]:
+    # plain columns, not entities: _write_set re-inserts the same primary keys
+    rows = db.exec(
+        select(MatchCandidate.candidate_id, MatchCandidate.score_vector,
+               MatchCandidate.score_keyword, MatchCandidate.score_blended)
+        .where(MatchCandidate.user_id == s.user_id, MatchCandidate.hackathon == s.hackathon)
+        .order_by(MatchCandidate.rank)
+    ).all()
+    return [tuple(r) for r in rows]
+
+
+# float32 vectors and backends compute one pair's similarity slightly differently
+_SCORE_EPS = 1e-6
+
+
+def _truncate_proven(db: Session, skip: Iterable[str], hackathon: Optional[str], floor: float) -> int:
+    """Shrink every list (but those in skip) that a candidate scoring below floor for its
+    user could enter, to the rows scoring at least floor: those are still the exact top."""
+    proven = (
+        select(func.count())
+        .where(MatchCandidate.user_id == MatchCandidateSet.user_id,
+               MatchCandidate.hackathon == MatchCandidateSet.hackathon,
+               MatchCandidate.score_vector >= floor)
+        .scalar_subquery()
+    )
+    return db.exec(
+        update(MatchCandidateSet)
+        .where(MatchCandidateSet.user_id.not_in(list(skip)),
+               MatchCandidateSet.hackathon.in_(["", hackathon or ""]),
+               (MatchCandidateSet.size > proven) | MatchCandidateSet.exhausted)
+        .values(size=func.min(MatchCandidateSet.size, proven), exhausted=False)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def profile_changed(db: Session, profile_id: str) -> int:
+    """Re-score one profile after it was (re)indexed: drop its own lists and patch it into
+    the lists of its vector neighbours and of every user already holding it. Other users'
+    lists are cut back to the prefix the profile can't outrank.
+    Returns the number of lists re-scored."""
+    if not MATCH_TABLE_ENABLED:
+        return 0
+    repo = ProfileRepository(db)
+    cand = repo.get(profile_id)
+    vec = stored_embedding(profile_id)
+    if cand is None or vec is None:
+        return forget_profile(db, profile_id)
+
+    # its own lists were scored with its old vector and skills
+    db.exec(delete(MatchCandidate).where(MatchCandidate.user_id == profile_id))
+    db.exec(delete(MatchCandidateSet).where(MatchCandidateSet.user_id == profile_id))
+
+    res = vector_query(vec, n_results=MATCH_TABLE_NEIGHBORS, where={"id": {"$ne": profile_id}})
+    neighbors = res.get("ids", [[]])[0]
+    holders = db.exec(select(MatchCandidate.user_id).where(MatchCandidate.candidate_id == profile_id)).all()
+    sets = _sets_for(db, set(neighbors) | set(holders))
+    if cand.profile.available_now and len(neighbors) >= MATCH_TABLE_NEIGHBORS:
+        # Similarity is symmetric, so every other user is at most as close to the profile
+        # as its farthest neighbour; their lists stay proven only down to that score.
+        floor = 1.0 - max(res["distances"][0]) + _SCORE_EPS
+        _truncate_proven(db, {s.user_id for s in sets} | {profile_id}, cand.profile.hackathon, floor)
+    if not sets:
+        db.commit()
+        return 0
+
+    users = {r.id: r for r in repo.get_many({s.user_id for s in sets})}
+    cand_meta = {"skills_norm": cand.skills_norm, "topics": cand.topics}
+    scores: Dict[str, Entry] = {}
+    now = datetime.utcnow()
+    for s in sets:
+        user = users.get(s.user_id)
+        entries = [e for e in _entries(db, s) if e[0] != profile_id]
+        eligible = (user is not None and cand.profile.available_now
+                    and (not s.hackathon or cand.profile.hackathon == s.hackathon))
+        if eligible:
+            if s.user_id not in scores:
+                uvec = stored_embedding(s.user_id)
+                dist = 1.0 - _cosine(uvec, vec) if uvec is not None else 1.0
+                sv, sk, sb = blend_scores(_user_dict(user), [cand_meta], [dist])
+                scores[s.user_id] = (profile_id, sv[0], sk[0], sb[0])
+            entry = scores[s.user_id]
+            pos = next((i for i, e in enumerate(entries) if e[1] < entry[1]), len(entries))
+            # past the proven prefix of a non-exhausted list its true rank is unknown
+            if pos < len(entries) or s.exhausted:
+                entries.insert(pos, entry)
+        exhausted = s.exhausted
+        if len(entries) > MATCH_TABLE_K:
+            entries, exhausted = entries[:MATCH_TABLE_K], False
+        _write_set(db, s.user_id, s.hackathon, entries, exhausted, computed_at=now)
+    db.commit()
+    return len(sets)
+
+
+def _drop_candidate(db: Session, profile_id: str) -> int:
+    # removing one row keeps the rest an exact (one shorter) top of the pool
+    holding = select(MatchCandidate.user_id, MatchCandidate.hackathon).where(MatchCandidate.candidate_id == profile_id)
+    n = db.exec(
+        update(MatchCandidateSet)
+        .where(tuple_(MatchCandidateSet.user_id, MatchCandidateSet.hackathon).in_(holding))
+        .values(size=MatchCandidateSet.size - 1)
+    ).rowcount
+    db.exec(delete(MatchCandidate).where(MatchCandidate.candidate_id == profile_id))
+    return n
+
+
+def candidate_unavailable(db: Session, profile_id: str) -> int:
+    """Cheap invalidation for an available_now=False toggle: no re-scoring needed."""
+    if not MATCH_TABLE_ENABLED:
+        return 0
+    n = _drop_candidate(db, profile_id)
+    db.commit()
+    return n
+
+
+def forget_profile(db: Session, profile_id: str) -> int:
+    """Remove a deleted profile from every list, and its own lists."""
+    n = _drop_candidate(db, profile_id)
+    db.exec(delete(MatchCandidate).where(MatchCandidate.user_id == profile_id))
+    db.exec(delete(MatchCandidateSet).where(MatchCandidateSet.user_id == profile_id))
+    db.commit()
+    return n
+
+
+def clear(db: Session) -> None:
+    """Drop every list, e.g. after bulk indexing; they are rebuilt on demand."""
+    db.exec(delete(MatchCandidate))
+    db.exec(delete(MatchCandidateSet))
+    db.commit()
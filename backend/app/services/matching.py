@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import Dict, Any, List, Tuple, Optional
-from .embeddings import embed
-from .chroma_store import query as chroma_query
+from .embeddings import aembed, aembed_batch
+from .vector_store import query as vector_query, query_many as vector_query_many, query_ids as vector_query_ids, all_of, stored_embedding
+from .vocabulary import vocabulary
+from .bitmap_index import bitmap_index
+from ..config import MATCH_TOPIC_WEIGHT, BITMAP_INDEX_ENABLED, BITMAP_EXACT_MAX
 
 
 def jaccard(a: List[str], b: List[str]) -> float:
@@ -21,44 +24,114 @@ def build_query_summary(user: Dict[str, Any], topic: Optional[str]) -> str:
     return " | ".join([p for p in parts if p])
 
 
-def retrieve_candidates(user_profile: Dict[str, Any], k: int = 20, topic: Optional[str] = None, exclude_id: Optional[str] = None, hackathon: Optional[str] = None):
-    query_text = build_query_summary(user_profile, topic)
-    qvec = embed(query_text)
+def combine_query(base: List[float], topic_vec: List[float], weight: float = MATCH_TOPIC_WEIGHT) -> List[float]:
+    """Steer a profile vector towards a topic: normalize(base/|base| + weight * topic/|topic|)."""
+    import numpy as np
+    b = np.asarray(base, dtype=np.float32)
+    t = np.asarray(topic_vec, dtype=np.float32)
+    bn, tn = float(np.linalg.norm(b)), float(np.linalg.norm(t))
+    q = (b / bn if bn else b) + weight * (t / tn if tn else t)
+    qn = float(np.linalg.norm(q))
+    return (q / qn if qn else q).tolist()
 
-    where = {"available_now": True}
-    if hackathon:
-        where["hackathon"] = hackathon
 
-    # Chroma python client may not support 'where_not' – query first then filter
-    res = chroma_query(qvec, n_results=max(50, k), where=where)
+async def query_vector(user_profile: Dict[str, Any], topic: Optional[str] = None) -> List[float]:
+    # The profile's indexed vector already embeds its summary, so reuse it; only the
+    # topic needs embedding, and aembed serves repeated topics from the embedding cache.
+    base = stored_embedding(user_profile["id"]) if user_profile.get("id") else None
+    if base is None:
+        # not indexed yet (or index rebuilt): embed the summary as before
+        return await aembed(build_query_summary(user_profile, topic))
+    if not topic:
+        return base
+    return combine_query(base, await aembed(topic))
 
-    # chroma returns dict with metadatas, ids, distances or similar. We'll use metadatas.
+
+async def query_vectors(users: List[Dict[str, Any]], topic: Optional[str] = None) -> List[List[float]]:
+    """query_vector() for many users: stored vectors where indexed, one embed batch for the rest."""
+    out: List[Optional[List[float]]] = [stored_embedding(u["id"]) if u.get("id") else None for u in users]
+    missing = [i for i, v in enumerate(out) if v is None]
+    if missing:
+        embedded = await aembed_batch([build_query_summary(users[i], topic) for i in missing])
+        for i, vec in zip(missing, embedded):
+            out[i] = [float(x) for x in vec]
+    if topic:
+        # summaries embedded above already include the topic
+        tvec = await aembed(topic)
+        embedded_ids = set(missing)
+        out = [v if i in embedded_ids else combine_query(v, tvec) for i, v in enumerate(out)]
+    return out
+
+
+async def retrieve_candidates(user_profile: Dict[str, Any], k: int = 20, topic: Optional[str] = None, exclude_id: Optional[str] = None, hackathon: Optional[str] = None):
+    qvec = await query_vector(user_profile, topic)
+
+    # every filter, including the self-exclusion, runs inside the index so k results are k usable candidates
+    res = None
+    if BITMAP_INDEX_ENABLED and bitmap_index.ready:
+        # a selective filter (one small hackathon) is cheaper to score exactly than to search
+        n, cand = bitmap_index.candidates(BITMAP_EXACT_MAX, available_now=True, hackathon=hackathon, exclude_id=exclude_id)
+        if cand is not None:
+            res = vector_query_ids(qvec, cand, n_results=k)
+    if res is None:
+        where = all_of(
+            {"available_now": True},
+            {"hackathon": hackathon} if hackathon else None,
+            {"id": {"$ne": exclude_id}} if exclude_id else None,
+        )
+        res = vector_query(qvec, n_results=k, where=where)
+
+    # vector store returns Chroma-shaped dict with metadatas, ids, distances. We'll use metadatas.
     ids = res.get("ids", [[]])[0]
     metas = res.get("metadatas", [[]])[0]
     embs_scores = res.get("distances", [[]])[0] if "distances" in res else None
+    return ids, metas, embs_scores
 
-    # filter excluded id if provided
-    if exclude_id:
-        filtered = [(i, m, d) for i, m, d in zip(ids, metas, embs_scores or [None]*len(ids)) if i != exclude_id]
-        if filtered:
-            ids, metas, embs_scores = zip(*filtered)
-            ids, metas, embs_scores = list(ids), list(metas), list(embs_scores)
-        else:
-            ids, metas, embs_scores = [], [], []
 
-    return ids, metas, embs_scores
+async def match_many(users: List[Dict[str, Any]], k: int = 20, topic: Optional[str] = None, hackathon: Optional[str] = None) -> List[Tuple[List[str], List[Dict[str, Any]], List[float], List[float], List[float]]]:
+    """retrieve_candidates + blend_scores for a batch of users: one multi-query to the
+    vector store and one blending pass. Returns (ids, metas, sv, sk, sb) per user."""
+    if not users:
+        return []
+    qvecs = await query_vectors(users, topic)
+    # the filter is shared by the whole batch, so self-exclusion happens here: fetch one
+    # extra row and drop the user's own id
+    where = all_of({"available_now": True}, {"hackathon": hackathon} if hackathon else None)
+    res = vector_query_many(qvecs, n_results=k + 1, where=where)
+    ids_l, metas_l, dists_l = [], [], []
+    for u, ids, metas, dists in zip(users, res["ids"], res["metadatas"], res["distances"]):
+        keep = [j for j, cid in enumerate(ids) if cid != u.get("id")][:k]
+        ids_l.append([ids[j] for j in keep])
+        metas_l.append([metas[j] for j in keep])
+        dists_l.append([dists[j] for j in keep])
+    scores = blend_scores_many(users, metas_l, dists_l)
+    return [(ids, metas, sv, sk, sb) for ids, metas, (sv, sk, sb) in zip(ids_l, metas_l, scores)]
+
+
+def blend_scores_many(users: List[Dict[str, Any]], metas_lists: List[List[Dict[str, Any]]], dists_lists: List[List[float]]) -> List[Tuple[List[float], List[float], List[float]]]:
+    """blend_scores for several users at once: all (user, candidate) pairs scored in one pass."""
+    import numpy as np
+    sizes = [len(m) for m in metas_lists]
+    user_sets = [vocabulary.encode(u.get("skills_norm"), u.get("topics")) for u in users]
+    pairs_user = (us for us, n in zip(user_sets, sizes) for _ in range(n))
+    sk = vocabulary.jaccard_pairs(pairs_user, vocabulary.encode_many([m for ms in metas_lists for m in ms]))
+    sv = 1.0 - np.fromiter((d for ds in dists_lists for d in ds), dtype=np.float64, count=sum(sizes))
+    sb = 0.75 * sv + 0.25 * sk
+    bounds = np.cumsum(sizes)[:-1]
+    return [(v.tolist(), kw.tolist(), b.tolist()) for v, kw, b in zip(np.split(sv, bounds), np.split(sk, bounds), np.split(sb, bounds))]
 
 
 def blend_scores(user: Dict[str, Any], metas: List[Dict[str, Any]], vector_scores: Optional[List[float]] = None) -> Tuple[List[float], List[float], List[float]]:
-    sv = []
-    sk = []
-    sb = []
-    u_skills = user.get("skills_norm") or []
-    u_topics = user.get("topics") or []
-    for i, m in enumerate(metas):
-        kv = jaccard(u_skills + u_topics, (m.get("skills_norm") or []) + (m.get("topics") or []))
-        sk.append(kv)
-        vv = 1.0 - vector_scores[i] if vector_scores else 0.5  # if distances, invert to similarity
-        sv.append(vv)
-        sb.append(0.75 * vv + 0.25 * kv)
-    return sv, sk, sb
+    """Vector, keyword (Jaccard over skills + topics) and blended scores per candidate.
+
+    Candidate skills/topics may be lists or the JSON strings the vector store returns."""
+    import numpy as np
+    n = len(metas)
+    user_set = vocabulary.encode(user.get("skills_norm"), user.get("topics"))
+    sk = vocabulary.jaccard_many(user_set, vocabulary.encode_many(metas))
+    if vector_scores:
+        sv = 1.0 - np.asarray(vector_scores, dtype=np.float64)  # distances -> similarity
+    else:
+        sv = np.full(n, 0.5)
+    sb = 0.75 * sv + 0.25 * sk
+    return sv.tolist(), sk.tolist(), sb.tolist()
@@ -0,0 +1,402 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import json
+import os
+import threading
+import numpy as np
+from ..config import NUMPY_SNAPSHOT_EVERY
+from .vector_store import VectorStore, sanitize_metadata, is_membership_key
+
+# Exact in-process index: a contiguous float32 matrix of l2-normalized rows, an
+# id -> row map and one column per metadata field. Queries score every row that
+# passes the filter (perfect recall) and take the top-k with argpartition.
+# Membership flags ("skill:rust": True) are kept as posting sets rather than columns.
+# The matrix is snapshotted to <dir>/vectors.npy and memory-mapped on restart.
+
+_VECTORS = "vectors.npy"
+_META = "meta.json"
+
+
+class NumpyVectorStore(VectorStore):
+    name = "numpy"
+
+    def __init__(self, path: str, snapshot_every: int = NUMPY_SNAPSHOT_EVERY) -> None:
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._vecs = np.zeros((0, 0), dtype=np.float32)
+        self._cols: Dict[str, List[Any]] = {}
+        self._flags: Dict[str, Set[str]] = {}
+        self._id_flags: Dict[str, Set[str]] = {}
+        # hot filter fields as typed arrays: available_now flag and interned hackathon code (0 = unset)
+        self._available = np.zeros(0, dtype=bool)
+        self._hackathon = np.zeros(0, dtype=np.int32)
+        self._hack_codes: Dict[str, int] = {}
+        self._dirty = 0
+        self._load()
+
+    # storage
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    def _reserve(self, n: int, dim: int) -> None:
+        if self._vecs.shape[1] == 0:
+            self._vecs = np.zeros((0, dim), dtype=np.float32)
+        elif dim != self._vecs.shape[1]:
+            raise ValueError(f"embedding dim {dim} != index dim {self._vecs.shape[1]}")
+        cap = self._vecs.shape[0]
+        if n <= cap:
+            return
+        new_cap = max(n, cap * 2, 1024)
+        vecs = np.zeros((new_cap, dim), dtype=np.float32)
+        vecs[:self.size] = self._vecs[:self.size]
+        self._vecs = vecs
+        avail = np.zeros(new_cap, dtype=bool)
+        avail[:self.size] = self._available[:self.size]
+        self._available = avail
+        hack = np.zeros(new_cap, dtype=np.int32)
+        hack[:self.size] = self._hackathon[:self.size]
+        self._hackathon = hack
+
+    def _hack_code(self, value: Any, create: bool) -> int:
+        if value is None:
+            return 0
+        code = self._hack_codes.get(value)
+        if code is None and create:
+            code = self._hack_codes[value] = len(self._hack_codes) + 1
+        return code or -1
+
+    @staticmethod
+    def _split_flags(meta: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
+        flags = {k for k, v in meta.items() if v is True and is_membership_key(k)}
+        return {k: v for k, v in meta.items() if k not in flags}, flags
+
+    def _set_flags(self, profile_id: str, flags: Set[str]) -> None:
+        for key in self._id_flags.pop(profile_id, set()) - flags:
+            posting = self._flags.get(key)
+            if posting is not None:
+                posting.discard(profile_id)
+                if not posting:
+                    del self._flags[key]
+        for key in flags:
+            self._flags.setdefault(key, set()).add(profile_id)
+        if flags:
+            self._id_flags[profile_id] = set(flags)
+
+    def _set_row(self, row: int, embedding: List[float], meta: Dict[str, Any]) -> None:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        self._vecs[row] = vec / norm if norm > 0 else vec
+        meta, flags = self._split_flags(meta)
+        self._set_flags(self._ids[row], flags)
+        for key in set(self._cols) | set(meta):
+            col = self._cols.setdefault(key, [None] * self.size)
+            col[row] = meta.get(key)
+        self._available[row] = bool(meta.get("available_now"))
+        self._hackathon[row] = self._hack_code(meta.get("hackathon"), create=True)
+
+    def upsert(self, profile_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+        meta = sanitize_metadata(metadata)
+        with self._lock:
+            row = self._row.get(profile_id)
+            if row is None:
+                self._reserve(self.size + 1, len(embedding))
+                row = self.size
+                self._ids.append(profile_id)
+                self._row[profile_id] = row
+                for col in self._cols.values():
+                    col.append(None)
+            self._set_row(row, embedding, meta)
+            self._mark_dirty()
+
+    def upsert_many(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]) -> None:
+        if not len(ids):
+            return
+        mat = np.array(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(mat, axis=1)
+        nz = norms > 0
+        mat[nz] /= norms[nz, None]
+        split = [self._split_flags(sanitize_metadata(m)) for m in metadatas]
+        metas = [m for m, _ in split]
+        with self._lock:
+            # later duplicates win, as with repeated single upserts
+            rows = []
+            self._reserve(self.size + len(ids), mat.shape[1])
+            for pid in ids:
+                row = self._row.get(pid)
+                if row is None:
+                    row = self.size
+                    self._ids.append(pid)
+                    self._row[pid] = row
+                    for col in self._cols.values():
+                        col.append(None)
+                rows.append(row)
+            self._vecs[rows] = mat
+            for pid, (_, flags) in zip(ids, split):
+                self._set_flags(pid, flags)
+            for key in set(self._cols).union(*metas):
+                col = self._cols.setdefault(key, [None] * self.size)
+                for row, meta in zip(rows, metas):
+                    col[row] = meta.get(key)
+            self._available[rows] = [bool(m.get("available_now")) for m in metas]
+            self._hackathon[rows] = [self._hack_code(m.get("hackathon"), create=True) for m in metas]
+            self._mark_dirty(len(ids))
+
+    def delete_many(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for pid in ids:
+                self._delete_locked(pid)
+            self._mark_dirty(len(ids))
+
+    def delete(self, profile_id: str) -> None:
+        with self._lock:
+            self._delete_locked(profile_id)
+            self._mark_dirty()
+
+    def _delete_locked(self, profile_id: str) -> None:
+        row = self._row.pop(profile_id, None)
+        if row is None:
+            return
+        self._set_flags(profile_id, set())
+        last = self.size - 1
+        if row != last:
+            # move the last row into the hole to keep the matrix contiguous
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._row[moved] = row
+            self._vecs[row] = self._vecs[last]
+            self._available[row] = self._available[last]
+            self._hackathon[row] = self._hackathon[last]
+            for col in self._cols.values():
+                col[row] = col[last]
+        self._ids.pop()
+        for col in self._cols.values():
+            col.pop()
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            if not where:
+                return self.size
+            return int(self._mask(where).sum())
+
+    def ids(self, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        with self._lock:
+            if not where:
+                return list(self._ids)
+            return [self._ids[i] for i in np.flatnonzero(self._mask(where))]
+
+    def metadatas(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        with self._lock:
+            cols = list(self._cols.items())
+            metas = [{k: col[i] for k, col in cols if col[i] is not None} for i in range(self.size)]
+            return list(self._ids), metas
+
+    def get_embeddings(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        with self._lock:
+            return {pid: self._vecs[self._row[pid]].tolist() for pid in ids if pid in self._row}
+
+    # filtering
+
+    def _column(self, key: str) -> np.ndarray:
+        col = self._cols.get(key)
+        if col is None:
+            return np.full(self.size, None, dtype=object)
+        arr = np.empty(self.size, dtype=object)
+        arr[:] = col
+        return arr
+
+    def _match(self, key: str, cond: Any) -> np.ndarray:
+        n = self.size
+        op, val = "$eq", cond
+        if isinstance(cond, dict) and len(cond) == 1 and next(iter(cond)).startswith("$"):
+            op, val = next(iter(cond.items()))
+        if is_membership_key(key) and op in ("$eq", "$ne") and isinstance(val, bool):
+            hit = np.zeros(n, dtype=bool)
+            posting = self._flags.get(key)
+            if posting:
+                hit[[self._row[pid] for pid in posting]] = True
+            return hit if (op == "$eq") == val else ~hit
+        if key == "available_now" and op in ("$eq", "$ne") and isinstance(val, bool):
+            col = self._available[:n]
+            return col == val if op == "$eq" else col != val
+        if key == "hackathon" and op in ("$eq", "$ne", "$in", "$nin"):
+            col = self._hackathon[:n]
+            if op in ("$eq", "$ne"):
+                hit = col == self._hack_code(val, create=False)
+                return hit if op == "$eq" else ~hit
+            hit = np.isin(col, [self._hack_code(v, create=False) for v in val])
+            return hit if op == "$in" else ~hit
+        if key == "id" and op in ("$in", "$nin"):
+            hit = np.zeros(n, dtype=bool)
+            hit[[self._row[pid] for pid in val if pid in self._row]] = True
+            return hit if op == "$in" else ~hit
+        col = self._column(key)
+        if op == "$eq":
+            return col == val
+        if op == "$ne":
+            return col != val
+        if op in ("$in", "$nin"):
+            vals = set(val)
+            hit = np.fromiter((v in vals for v in col), dtype=bool, count=n)
+            return hit if op == "$in" else ~hit
+        raise ValueError(f"unsupported filter operator {op}")
+
+    def _mask(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        n = self.size
+        mask = np.ones(n, dtype=bool)
+        for key, cond in (where or {}).items():
+            if key == "$and":
+                for sub in cond:
+                    mask &= self._mask(sub)
+            elif key == "$or":
+                anyof = np.zeros(n, dtype=bool)
+                for sub in cond:
+                    anyof |= self._mask(sub)
+                mask &= anyof
+            else:
+                mask &= np.asarray(self._match(key, cond), dtype=bool)
+        return mask
+
+    # search
+
+    def _meta_for(self, row: int) -> Dict[str, Any]:
+        meta = {k: col[row] for k, col in self._cols.items() if col[row] is not None}
+        meta.update((k, True) for k in self._id_flags.get(self._ids[row], ()))
+        return meta
+
+    def query(self, query_embedding: List[float], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            n = self.size
+            if n == 0 or n_results <= 0:
+                return {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+            q = np.asarray(query_embedding, dtype=np.float32)
+            qn = float(np.linalg.norm(q))
+            if qn > 0:
+                q = q / qn
+            if where:
+                rows = np.flatnonzero(self._mask(where))
+                sims = self._vecs[rows] @ q
+            else:
+                rows = None
+                sims = self._vecs[:n] @ q
+            k = min(n_results, sims.shape[0])
+            if k == 0:
+                return {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+            top = np.argpartition(-sims, k - 1)[:k] if k < sims.shape[0] else np.arange(sims.shape[0])
+            top = top[np.argsort(-sims[top], kind="stable")]
+            picked = rows[top] if rows is not None else top
+            return {
+                "ids": [[self._ids[r] for r in picked]],
+                "metadatas": [[self._meta_for(r) for r in picked]],
+                "distances": [(1.0 - sims[top]).tolist()],
+            }
+
+    def query_ids(self, query_embedding: List[float], ids: Sequence[str], n_results: int = 50) -> Dict[str, Any]:
+        with self._lock:
+            rows = np.fromiter((self._row[pid] for pid in ids if pid in self._row), dtype=np.int64)
+            if rows.size == 0 or n_results <= 0:
+                return {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+            q = np.asarray(query_embedding, dtype=np.float32)
+            qn = float(np.linalg.norm(q))
+            if qn > 0:
+                q = q / qn
+            sims = self._vecs[rows] @ q
+            k = min(n_results, rows.size)
+            top = np.argpartition(-sims, k - 1)[:k] if k < rows.size else np.arange(rows.size)
+            top = top[np.argsort(-sims[top], kind="stable")]
+            picked = rows[top]
+            return {
+                "ids": [[self._ids[r] for r in picked]],
+                "metadatas": [[self._meta_for(r) for r in picked]],
+                "distances": [(1.0 - sims[top]).tolist()],
+            }
+
+    def query_many(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # one (rows x queries) matmul and a column-wise argpartition for the whole batch
+        nq = len(query_embeddings)
+        with self._lock:
+            n = self.size
+            empty = {"ids": [[] for _ in range(nq)], "metadatas": [[] for _ in range(nq)], "distances": [[] for _ in range(nq)]}
+            if n == 0 or n_results <= 0 or nq == 0:
+                return empty
+            q = np.array(query_embeddings, dtype=np.float32).reshape(nq, -1)
+            qn = np.linalg.norm(q, axis=1)
+            q[qn > 0] /= qn[qn > 0, None]
+            rows = np.flatnonzero(self._mask(where)) if where else np.arange(n)
+            if rows.size == 0:
+                return empty
+            sims = self._vecs[rows] @ q.T
+            k = min(n_results, rows.size)
+            top = np.argpartition(-sims, k - 1, axis=0)[:k] if k < rows.size else np.broadcast_to(np.arange(rows.size)[:, None], sims.shape)
+            top_sims = np.take_along_axis(sims, top, axis=0)
+            order = np.argsort(-top_sims, axis=0, kind="stable")
+            top = np.take_along_axis(top, order, axis=0)
+            top_sims = np.take_along_axis(top_sims, order, axis=0)
+            out = {"ids": [], "metadatas": [], "distances": []}
+            metas: Dict[int, Dict[str, Any]] = {}
+            for j in range(nq):
+                picked = rows[top[:, j]]
+                out["ids"].append([self._ids[r] for r in picked])
+                out["metadatas"].append([metas[r] if r in metas else metas.setdefault(r, self._meta_for(r)) for r in picked])
+                out["distances"].append((1.0 - top_sims[:, j]).tolist())
+            return out
+
+    # snapshot
+
+    def _mark_dirty(self, n: int = 1) -> None:
+        self._dirty += n
+        if self.snapshot_every and self._dirty >= self.snapshot_every:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            vec_tmp = os.path.join(self.path, _VECTORS + ".tmp")
+            meta_tmp = os.path.join(self.path, _META + ".tmp")
+            with open(vec_tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(self._vecs[:self.size]))
+            with open(meta_tmp, "w") as f:
+                json.dump({"ids": self._ids, "columns": self._cols,
+                           "flags": {k: sorted(v) for k, v in self._flags.items()}}, f)
+            # a crash between the two renames is caught by the row-count check in _load
+            os.replace(vec_tmp, os.path.join(self.path, _VECTORS))
+            os.replace(meta_tmp, os.path.join(self.path, _META))
+            self._dirty = 0
+
+    def _load(self) -> None:
+        vec_path = os.path.join(self.path, _VECTORS)
+        meta_path = os.path.join(self.path, _META)
+        if not (os.path.exists(vec_path) and os.path.exists(meta_path)):
+            return
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            # copy-on-write mmap: restart cost is independent of index size, pages load on first query
+            vecs = np.load(vec_path, mmap_mode="c")
+            ids = list(meta.get("ids") or [])
+            if vecs.ndim != 2 or vecs.shape[0] != len(ids):
+                print(f"[numpy_store] snapshot mismatch in {self.path}; starting empty")
+                return
+        except Exception as e:
+            print(f"[numpy_store] failed to load snapshot: {type(e).__name__}: {e}")
+            return
+        self._ids = ids
+        self._row = {pid: i for i, pid in enumerate(ids)}
+        self._vecs = vecs
+        self._cols = {k: list(v) for k, v in (meta.get("columns") or {}).items()}
+        for key, pids in (meta.get("flags") or {}).items():
+            self._flags[key] = set(pids)
+            for pid in pids:
+                self._id_flags.setdefault(pid, set()).add(key)
+        n = len(ids)
+        avail = self._cols.get("available_now") or [None] * n
+        self._available = np.fromiter((bool(v) for v in avail), dtype=bool, count=n)
+        self._hackathon = np.fromiter(
+            (self._hack_code(v, create=True) for v in (self._cols.get("hackathon") or [None] * n)), dtype=np.int32, count=n
+        )
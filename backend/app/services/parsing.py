@@ -1,9 +1,13 @@
 from __future__ import annotations
 from typing import Dict, Any, List, Optional
+import hashlib
 import json
+import time
+import unicodedata
 import httpx
 from pydantic import BaseModel, ValidationError
 from ..config import ANTHROPIC_API_KEY, CLAUDE_MODEL
+from .content_cache import content_cache
 import traceback
 
 
@@ -56,6 +60,11 @@ SYSTEM_PROMPT = (
 )
 
 
+# Part of the parse cache key: editing the prompt (or switching CLAUDE_MODEL) misses
+# every entry written before, so no stale result outlives the change.
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()[:16]
+
+
 def _default_output() -> Dict[str, Any]:
     return ParseOutput().model_dump()
 
@@ -126,15 +135,37 @@ async def _call_anthropic(text: str) -> Dict[str, Any]:
         return _default_output()
 
 
+def _cache_key(text: str) -> str:
+    # text the LLM would read the same way (Unicode forms, whitespace runs) shares a key
+    normalized = " ".join(unicodedata.normalize("NFKC", text).split())
+    return f"{CLAUDE_MODEL}:{PROMPT_VERSION}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+
+def cached(raw_text: str) -> Optional[Dict[str, Any]]:
+    """extract()'s result for raw_text if the parse cache has it, without calling the LLM."""
+    text = _chunk_text(raw_text)
+    if not text or not text.strip():
+        return None
+    return content_cache.get_parse(_cache_key(text))
+
+
 async def extract(raw_text: str) -> Dict[str, Any]:
     text = _chunk_text(raw_text)
     if not text or not text.strip():
         # No text to parse; return defaults
         return _default_output()
+    key = _cache_key(text)
+    hit = content_cache.get_parse(key)
+    if hit is not None:
+        return hit
+    t0 = time.perf_counter()
+    result = _default_output()
     # Retry up to 2 times on HTTP errors
     for _ in range(2):
         try:
-            return await _call_anthropic(text)
+            result = await _call_anthropic(text)
+            break
         except Exception:
             continue
-    return _default_output()
+    content_cache.put_parse(key, result, (time.perf_counter() - t0) * 1000, store=result != _default_output())
+    return result
@@ -1,17 +1,108 @@
 import os
-from typing import Optional
-import fitz  # PyMuPDF
+import time
+import asyncio
+import weakref
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from ..config import PDF_WORKERS, PDF_MAX_CHARS, PDF_MAX_PAGES, PDF_TIMEOUT_S
 
-def extract_text(path: str) -> str:
+# PyMuPDF holds the GIL while it lays out a page, so extraction runs in worker
+# processes; the event loop (and the other jobs' threads) never wait on a large PDF.
+# Budgets bound the work per document: pages are read in order until the parser's
+# character budget is filled, the page limit is reached or the time is up.
+
+_GRACE_S = 5.0  # beyond PDF_TIMEOUT_S for one page that is slow to finish
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# pools killed over a timeout, so the other documents they were running get a retry
+_terminated: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def extract_text(path: str, max_chars: int = PDF_MAX_CHARS, max_pages: int = PDF_MAX_PAGES,
+                 timeout_s: float = PDF_TIMEOUT_S) -> str:
+    """Text of the first pages of path, at most max_chars characters ("" if unreadable)."""
+    import fitz  # PyMuPDF; imported on first use to keep app startup light
+    deadline = time.monotonic() + timeout_s
     try:
-        text = []
-        doc = fitz.open(path)
-        for page in doc:
-            text.append(page.get_text())
-        return "\n".join(text)
+        text, size = [], 0
+        with fitz.open(path) as doc:
+            for i, page in enumerate(doc):
+                if i >= max_pages:
+                    break
+                t = page.get_text()
+                text.append(t)
+                size += len(t) + 1
+                if size >= max_chars or time.monotonic() >= deadline:
+                    break
+        return "\n".join(text)[:max_chars]
     except Exception as e:
         print(f"Error extracting text from {path}: {e}")
         return ""
 
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs threads (aiosqlite, the vector store) can deadlock the child
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard(pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        if terminate:
+            _terminated.add(pool)
+    if terminate:
+        # shutdown() leaves a busy worker running; a page stuck in MuPDF would hold it for good
+        for proc in list((getattr(pool, "_processes", None) or {}).values()):
+            proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _in_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    """fn(*args) in a worker process within PDF_TIMEOUT_S (+ grace); "" if it fails."""
+    label = args[0] if args else fn.__name__
+    for attempt in range(2):
+        pool = _executor()
+        try:
+            fut = asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            return await asyncio.wait_for(fut, PDF_TIMEOUT_S + _GRACE_S)
+        except asyncio.TimeoutError:
+            print(f"PDF extraction timed out after {PDF_TIMEOUT_S:.0f}s: {label}; restarting the pool")
+            _discard(pool, terminate=True)
+            return ""
+        except BrokenProcessPool:
+            if pool in _terminated and attempt == 0:
+                continue  # killed for another document's timeout: run this one on the new pool
+            # a worker died (e.g. MuPDF crashed on a malformed file); start a fresh pool
+            print(f"PDF worker crashed on {label}; restarting the pool")
+            _discard(pool)
+            return ""
+    return ""
+
+
+async def aextract_text(path: str) -> str:
+    """extract_text() off the event loop: in the worker processes, or a thread if PDF_WORKERS=0."""
+    if PDF_WORKERS <= 0:
+        return await asyncio.to_thread(extract_text, path)
+    return await _in_pool(extract_text, path)
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 if __name__ == "__main__":
-    print(extract_text(path="./../../pdfs/Resume_(5).pdf"))
\ No newline at end of file
+    print(extract_text(path="./../../pdfs/Resume_(5).pdf"))
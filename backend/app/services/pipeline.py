@@ -2,14 +2,21 @@ from __future__ import annotations
 from typing import Optional, List, Dict, Any
 from sqlmodel import Session, select
 from ..db.models import Profile, Upload
-from ..db.session import get_session
-from .pdf import extract_text
-from .parsing import extract as parse_extract
+from ..db.session import engine, get_session
+from .pdf import aextract_text
+from .parsing import extract as parse_extract, cached as parse_cached
 from .normalize import normalize_list
-from .embeddings import embed
-from .chroma_store import upsert as chroma_upsert, delete as chroma_delete
+from .embeddings import aembed
+from .vector_store import upsert as vector_upsert, delete as vector_delete
+from .indexing import profile_summary, profile_metadata
 from .sse import broker
+from .content_cache import content_cache
+from . import match_table
+from ..db import facets, fts, terms
 from datetime import datetime, timezone
+from contextlib import nullcontext
+import asyncio
+import time
 import traceback
 
 
@@ -26,23 +33,68 @@ def _list_json(lst: Optional[List[str]]) -> str:
     return json.dumps(lst or [])
 
 
-def _summary(profile: Profile) -> str:
-    skills = ", ".join(_json_list(profile.skills_norm_json))
-    topics = ", ".join(_json_list(profile.topics_json))
-    return f"{profile.name or ''} | {profile.headline or ''} | {skills} | {topics}"
+class Stages:
+    """Caps on concurrent PDF extractions, LLM parses and embeddings across the runs
+    sharing this object (a job worker pool's workers); 0 = unlimited."""
 
+    def __init__(self, pdf: int = 0, llm: int = 0, embed: int = 0) -> None:
+        self.pdf = asyncio.Semaphore(pdf) if pdf > 0 else nullcontext()
+        self.llm = asyncio.Semaphore(llm) if llm > 0 else nullcontext()
+        self.embed = asyncio.Semaphore(embed) if embed > 0 else nullcontext()
 
-async def run(profile_id: str) -> None:
-    db = get_session()
+
+_UNLIMITED = Stages()
+
+
+def _set_failed(db: Session, profile_id: str, status: str) -> None:
+    prof = db.get(Profile, profile_id)
+    if prof:
+        before = facets.snapshot(prof)
+        prof.status = status
+        db.add(prof)
+        facets.apply(db, [(before, None)])
+        db.commit()
+
+
+async def mark_failed(profile_id: str) -> None:
+    """Give up on profile_id: status "error", for a job the queue will not retry."""
+    def write():
+        with get_session() as db:
+            _set_failed(db, profile_id, "error")
+
+    await asyncio.to_thread(write)
+    await broker.publish(profile_id, {"status": "error"})
+
+
+async def run(profile_id: str, stages: Optional[Stages] = None, final: bool = True) -> None:
+    """Extract, parse, embed and index one profile, publishing each status change.
+
+    Raises on failure, after setting the profile to "error" or, when final is False
+    (the job queue will try again), back to "pending". Database writes run in a
+    thread: one that waited for SQLite's write lock on the event loop would stall the
+    async sessions holding that lock until busy_timeout. Loaded objects outlive each
+    commit, so no read reopens a transaction (and holds a pooled connection) across
+    the slow awaits in between.
+    """
+    stages = stages or _UNLIMITED
+    db = Session(engine, expire_on_commit=False)
     try:
         prof = db.get(Profile, profile_id)
         if not prof:
             return
         try:
             print(f"[pipeline] start profile_id={profile_id}")
-            prof.status = "parsing"
-            db.add(prof)
-            db.commit()
+
+            def start():
+                before = facets.snapshot(prof)
+                up = db.get(Upload, prof.resume_file_id) if prof.resume_file_id else None
+                prof.status = "parsing"
+                db.add(prof)
+                facets.apply(db, [(before, None)])
+                db.commit()
+                return up
+
+            up = await asyncio.to_thread(start)
             await broker.publish(profile_id, {"status": "parsing"})
 
             raw_text_parts: List[str] = []
@@ -50,7 +102,6 @@ async def run(profile_id: str) -> None:
             # ingest PDF if present
             if prof.resume_file_id:
                 import os as os_module
-                up = db.get(Upload, prof.resume_file_id)
                 if not up:
                     print(f"[pipeline] Upload record not found for file_id={prof.resume_file_id}")
                     # Check if file exists on disk anyway
@@ -62,7 +113,14 @@ async def run(profile_id: str) -> None:
                     print(f"[pipeline] Upload path is empty for file_id={prof.resume_file_id}")
                 else:
                     try:
-                        txt = extract_text(up.path)
+                        # a file uploaded before (same sha256) was extracted before
+                        txt = content_cache.get_text(up.sha256) if up.sha256 else None
+                        if txt is None:
+                            t0 = time.perf_counter()
+                            async with stages.pdf:
+                                txt = await aextract_text(up.path)
+                            if up.sha256:
+                                content_cache.put_text(up.sha256, txt, (time.perf_counter() - t0) * 1000)
                         if txt:
                             raw_text_parts.append(txt)
                         print(f"[pipeline] extracted PDF text bytes={len(txt or '')}")
@@ -74,7 +132,11 @@ async def run(profile_id: str) -> None:
             raw_text = "\n".join([p for p in raw_text_parts if p])
             print(f"[pipeline] total raw_text chars={len(raw_text)}")
 
-            parsed = await parse_extract(raw_text)
+            # unchanged text (a reembed, a duplicate upload) does not wait for an LLM slot
+            parsed = parse_cached(raw_text)
+            if parsed is None:
+                async with stages.llm:
+                    parsed = await parse_extract(raw_text)
             print(f"[pipeline] parsed keys={list(parsed.keys()) if isinstance(parsed, dict) else type(parsed)}")
 
             # update basic fields (best-effort)
@@ -97,58 +159,64 @@ async def run(profile_id: str) -> None:
             prof.status = "embedding"
             prof.updated_at = datetime.now(timezone.utc)
             db.add(prof)
-            db.commit()
+
+            def parsed_write():
+                terms.sync(db, [prof])
+                db.commit()
+
+            await asyncio.to_thread(parsed_write)
             await broker.publish(profile_id, {"status": "embedding"})
 
             # build summary and embed
-            summary = _summary(prof)
+            summary = profile_summary(prof)
             try:
-                vec = embed(summary)
+                async with stages.embed:
+                    vec = await aembed(summary)
                 print(f"[pipeline] embedding_dim={len(vec) if hasattr(vec, '__len__') else 'unknown'}")
             except Exception:
                 print("[pipeline] embed failed:\n" + traceback.format_exc())
                 raise
 
-            metadata = {
-                "id": prof.id,
-                "name": prof.name,
-                "headline": prof.headline,
-                "skills_norm": skills_norm,
-                "topics": topics,
-                "school": prof.school,
-                "company": prof.company,
-                "seniority": prof.seniority,
-                "available_now": prof.available_now,
-                "hackathon": prof.hackathon,
-            }
+            metadata = profile_metadata(prof)
             print(metadata)
             try:
-                chroma_upsert(profile_id, vec, metadata)
-                print("[pipeline] chroma upsert ok")
+                vector_upsert(profile_id, vec, metadata)
+                print("[pipeline] vector upsert ok")
             except Exception:
-                print("[pipeline] chroma upsert failed:\n" + traceback.format_exc())
+                print("[pipeline] vector upsert failed:\n" + traceback.format_exc())
                 raise
 
             prof.status = "ready"
             prof.updated_at = datetime.now(timezone.utc)
             db.add(prof)
-            db.commit()
+
+            def ready():
+                fts.upsert(db, [prof])
+                facets.apply(db, [(None, facets.snapshot(prof))])
+                db.commit()
+
+            await asyncio.to_thread(ready)
             await broker.publish(profile_id, {"status": "ready"})
 
+            try:
+                touched = await asyncio.to_thread(match_table.profile_changed, db, profile_id)
+                print(f"[pipeline] match lists updated={touched}")
+            except Exception:
+                print("[pipeline] match table update failed:\n" + traceback.format_exc())
+
         except Exception:
             print("[pipeline] ERROR:\n" + traceback.format_exc())
-            prof = db.get(Profile, profile_id)
-            if prof:
-                prof.status = "error"
-                db.add(prof)
-                db.commit()
-            await broker.publish(profile_id, {"status": "error"})
+            db.rollback()
+            status = "error" if final else "pending"
+            await asyncio.to_thread(_set_failed, db, profile_id, status)
+            await broker.publish(profile_id, {"status": status})
+            raise
     finally:
         db.close()
 
 
 def delete_profile_index(profile_id: str) -> None:
     try:
-        chroma_delete(profile_id)
+        vector_delete(profile_id)
     except Exception:
         pass
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Sequence, Tuple
+from collections import OrderedDict
+import base64
+import hashlib
+import json
+import threading
+import time
+from ..config import SEARCH_CURSOR_MAX_IDS, SEARCH_CURSOR_TTL_S
+
+# Ranked /search results, computed once per query and paged by slicing. Keyed by a
+# hash of the normalized query, so `page=N` requests for the same query share the
+# entry and cursors stay short. Only ids are kept (items are hydrated per page), so an
+# entry goes stale in ranking and membership only, for at most the TTL. Memory is
+# bounded by the total number of ids held across entries.
+
+
+class ResultSet(NamedTuple):
+    ids: Tuple[str, ...]  # ranked prefix of the matches, possibly shorter than total
+    total: int
+    mode: str
+    query_text: str
+
+
+def query_key(params: Dict[str, Any]) -> str:
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def encode_cursor(key: str, offset: int, page_size: int) -> str:
+    raw = json.dumps([key, offset, page_size], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, int, int]]:
+    """(key, offset, page_size), or None for anything that isn't one of our cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, offset, page_size = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(key, str) or not isinstance(offset, int) or not isinstance(page_size, int):
+        return None
+    if offset < 0 or page_size <= 0:
+        return None
+    return key, offset, page_size
+
+
+class ResultSetCache:
+    def __init__(self, max_ids: int, ttl_s: float) -> None:
+        self.max_ids = max(0, int(max_ids))
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[Hashable, Tuple[ResultSet, float]]" = OrderedDict()
+        self._ids = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._expired = self._evictions = 0
+
+    def _drop_locked(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._ids -= len(entry[0].ids)
+
+    def get(self, key: str) -> Optional[ResultSet]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if now >= entry[1]:
+                self._expired += 1
+                self._misses += 1
+                self._drop_locked(key)
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, ids: Sequence[str], total: int, mode: str, query_text: str) -> ResultSet:
+        rs = ResultSet(tuple(ids), total, mode, query_text)
+        if len(rs.ids) > self.max_ids:
+            return rs
+        with self._lock:
+            self._drop_locked(key)
+            self._data[key] = (rs, time.monotonic() + self.ttl_s)
+            self._ids += len(rs.ids)
+            while self._ids > self.max_ids and self._data:
+                self._drop_locked(next(iter(self._data)))
+                self._evictions += 1
+        return rs
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._ids = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hitRate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._data),
+                "ids": self._ids,
+                "maxIds": self.max_ids,
+                "ttlSeconds": self.ttl_s,
+            }
+
+
+result_sets = ResultSetCache(SEARCH_CURSOR_MAX_IDS, SEARCH_CURSOR_TTL_S)
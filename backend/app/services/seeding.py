@@ -4,10 +4,12 @@ from datetime import datetime
 import random
 from sqlmodel import Session
 from ..db.models import Profile
+from ..db import facets, fts, terms
 from ..utils.ids import new_id
 from ..utils.json import list_to_json
-from .embeddings import embed
-from .chroma_store import upsert as chroma_upsert
+from .indexing import index_profiles
+from .vector_store import flush as vector_flush
+from . import match_table
 
 TOPICS = [
     "Agentic AI","Drones","LLM Eval","RAG","Web3","Data Infra","AR/VR","Open Source","VC chat"
@@ -23,14 +25,14 @@ def _pick_many(src: List[str], n: int) -> List[str]:
 
 
 def generate_synthetic_profiles(db: Session, count: int = 12) -> int:
-    added = 0
+    profiles: List[Profile] = []
     for i in range(count):
         pid = new_id("p")
         topics = _pick_many(TOPICS, 3)
         skills = list(dict.fromkeys(_pick_many(SKILLS, 6)))
         available_now = random.random() > 0.4
         hackathon = random.choice(HACKATHONS)
-        prof = Profile(
+        profiles.append(Profile(
             id=pid,
             name=f"Seed {pid[-4:]}",
             headline=f"Excited about {topics[0]}",
@@ -50,28 +52,23 @@ def generate_synthetic_profiles(db: Session, count: int = 12) -> int:
             updated_at=datetime.utcnow(),
             source=None,
             hackathon=hackathon,
-        )
-        db.add(prof)
-        db.commit()
-        # embed and index
-        summary = f"{prof.name or ''} | {prof.headline or ''} | {', '.join(skills)} | {', '.join(topics)}"
-        vec = embed(summary)
-        metadata = {
-            "id": prof.id,
-            "name": prof.name,
-            "headline": prof.headline,
-            "skills_norm": skills,
-            "topics": topics,
-            "school": prof.school,
-            "company": prof.company,
-            "seniority": prof.seniority,
-            "available_now": prof.available_now,
-            "hackathon": prof.hackathon,
-        }
-        chroma_upsert(prof.id, vec, metadata)
+        ))
+    if not profiles:
+        return 0
+    # INSERT inside the open transaction; committing here would expire every row
+    # and cost one SELECT per profile when indexing reads them back
+    db.add_all(profiles)
+    db.flush()
+    fts.upsert(db, profiles)
+    terms.sync(db, profiles)
+    index_profiles(profiles)
+    vector_flush()
+    now = datetime.utcnow()
+    for prof in profiles:
         prof.status = "ready"
-        prof.updated_at = datetime.utcnow()
-        db.add(prof)
-        db.commit()
-        added += 1
-    return added
+        prof.updated_at = now
+    facets.apply(db, [(None, facets.snapshot(p)) for p in profiles])
+    db.commit()
+    # new candidates may belong in any list; rebuild them on demand
+    match_table.clear(db)
+    return len(profiles)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import Any, BinaryIO, Dict, Optional, Set, Tuple
+import hashlib
+import os
+import tempfile
+import threading
+from sqlalchemy import func
+from sqlmodel import Session, select
+from ..config import UPLOAD_DIR
+from ..db.models import Upload
+from ..utils.ids import new_id
+
+# Content-addressed resume storage. Every upload still gets its own Upload row (file_id,
+# owner), but rows with the same bytes share one file named by their sha256; the rows
+# carrying a hash are that file's references, and the last one removed deletes it.
+# Uploads stored before dedupe (sha256 NULL) own their file_<id>.pdf as before.
+
+CHUNK_BYTES = 1024 * 1024
+PDF_MAGIC = b"%PDF"
+
+# orders storing a file against removing its last reference within this process; held
+# for in-memory bookkeeping and file renames only, never across a database call
+_files_lock = threading.Lock()
+# sha256 -> ingested uploads whose rows are not committed yet
+_pins: Dict[str, int] = {}
+# sha256 -> collect() calls counting its references, and the hashes ingested meanwhile
+_counting: Dict[str, int] = {}
+_ingested_while_counting: Set[str] = set()
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(UPLOAD_DIR, f"{sha256}.pdf")
+
+
+def ingest(src: BinaryIO, max_bytes: int) -> Tuple[str, int]:
+    """Copy src into storage CHUNK_BYTES at a time, hashing as it goes; returns (sha256, size).
+
+    Raises ValueError, leaving nothing behind, as soon as src turns out not to be a PDF
+    or to exceed max_bytes. The copy lands under a temporary name and is renamed to its
+    hash only when complete, so a reader never sees a partial file. The file is pinned
+    until the caller commits its Upload row and calls unpin(): a concurrent collect()
+    of the last other reference cannot remove it in between.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    digest, size = hashlib.sha256(), 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise ValueError("File is not a PDF")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"File too large; max {max_bytes // (1024 * 1024)}MB")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise ValueError("File is empty")
+        sha = digest.hexdigest()
+        with _files_lock:
+            if os.path.exists(blob_path(sha)):
+                os.remove(tmp)  # same bytes stored before
+            else:
+                os.replace(tmp, blob_path(sha))
+            _pins[sha] = _pins.get(sha, 0) + 1
+            if sha in _counting:
+                _ingested_while_counting.add(sha)
+        return sha, size
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def add(db: Session, sha256: str, size: int, user_id: int) -> Upload:
+    """Add an Upload row referencing the file ingest() stored (the caller commits)."""
+    upload = Upload(file_id=new_id("file"), user_id=user_id, sha256=sha256, path=blob_path(sha256),
+                    mime="application/pdf", size=size)
+    db.add(upload)
+    return upload
+
+
+def unpin(sha256: str) -> None:
+    """Drop the pin ingest() took, once the caller's Upload row is committed (or abandoned)."""
+    with _files_lock:
+        n = _pins.get(sha256, 0) - 1
+        if n > 0:
+            _pins[sha256] = n
+        else:
+            _pins.pop(sha256, None)
+
+
+def release(db: Session, upload: Upload) -> None:
+    """Delete upload's row; the caller commits, then calls collect() for its file."""
+    db.delete(upload)
+
+
+def collect(db: Session, sha256: Optional[str], path: Optional[str]) -> bool:
+    """Remove a released upload's file unless a committed row or an upload in progress
+    still references it; returns whether it was removed. Runs after the release commits,
+    so a rolled-back delete never loses the file.
+
+    The references are counted outside _files_lock. An upload of the same bytes that
+    ingests, commits and unpins while they are counted would go unseen, so any ingest
+    of the hash in that window keeps the file; that upload's own release collects it."""
+    if sha256:
+        with _files_lock:
+            _counting[sha256] = _counting.get(sha256, 0) + 1
+        try:
+            refs = db.exec(select(func.count()).select_from(Upload).where(Upload.sha256 == sha256)).one()
+        except BaseException:
+            with _files_lock:
+                _stop_counting(sha256)
+            raise
+        with _files_lock:
+            raced = _stop_counting(sha256)
+            if refs or raced or _pins.get(sha256):
+                return False
+            return _remove(path)
+    with _files_lock:
+        return _remove(path)
+
+
+def _stop_counting(sha256: str) -> bool:
+    # under _files_lock; whether sha256 was ingested since this count started
+    raced = sha256 in _ingested_while_counting
+    n = _counting.pop(sha256) - 1
+    if n:
+        _counting[sha256] = n
+    else:
+        _ingested_while_counting.discard(sha256)
+    return raced
+
+
+def _remove(path: Optional[str]) -> bool:
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        os.remove(path)
+    except OSError:
+        return False
+    return True
+
+
+def stats(db: Session) -> Dict[str, Any]:
+    """Uploads vs stored files, and the bytes dedupe saved, for /admin/stats."""
+    uploads, upload_bytes = db.exec(select(func.count(), func.coalesce(func.sum(Upload.size), 0))).one()
+    shared = (select(Upload.sha256, func.max(Upload.size).label("size"))
+              .where(Upload.sha256.is_not(None)).group_by(Upload.sha256).subquery())
+    blobs, blob_bytes = db.exec(select(func.count(), func.coalesce(func.sum(shared.c.size), 0))).one()
+    legacy, legacy_bytes = db.exec(select(func.count(), func.coalesce(func.sum(Upload.size), 0))
+                                   .where(Upload.sha256.is_(None))).one()
+    stored = blob_bytes + legacy_bytes
+    return {
+        "uploads": uploads,
+        "files": blobs + legacy,
+        "dedupedUploads": uploads - blobs - legacy,
+        "bytesUploaded": upload_bytes,
+        "bytesStored": stored,
+        "bytesSaved": upload_bytes - stored,
+    }
@@ -0,0 +1,286 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import json
+import threading
+from ..config import VECTOR_BACKEND, CHROMA_DIR, CHROMA_COLLECTION, NUMPY_INDEX_DIR, VECTOR_WRITE_CHUNK, STORED_VECTOR_CACHE_SIZE
+from .cache import LRUCache
+from .normalize import normalize_list
+
+# List-valued fields (skills, topics) can't be filtered inside the index once they are
+# JSON-encoded, so each member is also indexed as a flat boolean key: "skill:rust": True.
+MEMBERSHIP_PREFIXES = {"skills_norm": "skill:", "topics": "topic:"}
+
+
+def membership_key(field: str, value: str) -> str:
+    return MEMBERSHIP_PREFIXES[field] + value
+
+
+def is_membership_key(key: str) -> bool:
+    return any(key.startswith(p) for p in MEMBERSHIP_PREFIXES.values())
+
+
+def membership_metadata(field: str, values: Iterable[str]) -> Dict[str, bool]:
+    return {membership_key(field, v): True for v in normalize_list(list(values or [])) if v}
+
+
+def any_of(field: str, values: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Filter matching profiles whose `field` list contains at least one of values."""
+    clauses = [{membership_key(field, v): True} for v in normalize_list(list(values or [])) if v]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def all_of(*clauses: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """AND together filter clauses, skipping empty ones; None when nothing is left."""
+    flat: List[Dict[str, Any]] = []
+    for c in clauses:
+        if not c:
+            continue
+        if len(c) == 1 and "$and" in c:
+            flat.extend(c["$and"])
+        elif len(c) > 1:
+            flat.extend({k: v} for k, v in c.items())
+        else:
+            flat.append(c)
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else {"$and": flat}
+
+
+def sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Vector store metadata values must be primitives. JSON-encode others, drop None.
+    sanitized: Dict[str, Any] = {}
+    for k, v in (metadata or {}).items():
+        if v is None:
+            continue
+        if isinstance(v, (str, int, float, bool)):
+            sanitized[k] = v
+        else:
+            try:
+                sanitized[k] = json.dumps(v)
+            except Exception:
+                sanitized[k] = str(v)
+    return sanitized
+
+
+class VectorStore:
+    """Profile vector index. Query results use Chroma's shape:
+    {"ids": [[...]], "metadatas": [[...]], "distances": [[...]]} with cosine distances.
+    `where` filters follow Chroma's syntax (plain equality, $eq/$ne/$in/$nin, $and/$or).
+    """
+
+    name = "base"
+
+    def upsert(self, profile_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, profile_id: str) -> None:
+        raise NotImplementedError
+
+    def upsert_many(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]) -> None:
+        for pid, emb, meta in zip(ids, embeddings, metadatas):
+            self.upsert(pid, emb, meta)
+
+    def delete_many(self, ids: Sequence[str]) -> None:
+        for pid in ids:
+            self.delete(pid)
+
+    def query(self, query_embedding: List[float], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def query_many(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Several queries sharing one filter; Chroma-shaped result with one list per query."""
+        out: Dict[str, Any] = {"ids": [], "metadatas": [], "distances": []}
+        for q in query_embeddings:
+            res = self.query(q, n_results=n_results, where=where)
+            for field in out:
+                out[field].append(res.get(field, [[]])[0])
+        return out
+
+    def query_ids(self, query_embedding: List[float], ids: Sequence[str], n_results: int = 50) -> Dict[str, Any]:
+        """Exact top-n among the given ids only (unknown ids are skipped); Chroma-shaped."""
+        if not len(ids):
+            return {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+        return self.query(query_embedding, n_results=n_results, where={"id": {"$in": list(ids)}})
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        """Number of vectors, or of those matching `where`."""
+        raise NotImplementedError
+
+    def ids(self, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Ids of the vectors matching `where`, in no particular order."""
+        raise NotImplementedError
+
+    def metadatas(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Every indexed id with its metadata, read in one consistent pass."""
+        raise NotImplementedError
+
+    def get_embeddings(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        """Stored vectors by id; ids that are not indexed are left out."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Persist pending state; a no-op for stores that write through."""
+
+
+# The backend (and chromadb/numpy with it) is opened on first use or by warmup(),
+# never at import time, so workers can answer /health before the index is loaded.
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+_warmup_error: Optional[str] = None
+
+
+def get_store() -> VectorStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = (VECTOR_BACKEND or "chroma").lower()
+                if backend == "numpy":
+                    from .numpy_store import NumpyVectorStore
+                    _store = NumpyVectorStore(NUMPY_INDEX_DIR)
+                else:
+                    from .chroma_store import ChromaVectorStore
+                    _store = ChromaVectorStore(CHROMA_DIR, CHROMA_COLLECTION)
+    return _store
+
+
+def is_ready() -> bool:
+    return _store is not None
+
+
+def warmup() -> None:
+    """Open the configured backend; safe to call from a background thread."""
+    global _warmup_error
+    try:
+        get_store().count()
+        _warmup_error = None
+    except Exception as e:
+        _warmup_error = f"{type(e).__name__}: {e}"
+        print(f"[vector_store] warmup failed: {_warmup_error}")
+
+
+def readiness() -> Dict[str, Any]:
+    info: Dict[str, Any] = {"backend": (VECTOR_BACKEND or "chroma").lower(), "loaded": _store is not None}
+    if _store is not None:
+        try:
+            info["count"] = _store.count()
+        except Exception as e:
+            info["error"] = f"{type(e).__name__}: {e}"
+    elif _warmup_error:
+        info["error"] = _warmup_error
+    return info
+
+
+# Stored vectors double as /matches query vectors, so recently used ones are kept in
+# memory. Every write through this facade drops the affected ids; the generation
+# counter stops a read that raced a write from caching the vector it replaced.
+_stored_vectors = LRUCache(STORED_VECTOR_CACHE_SIZE)
+_write_gen = 0
+_gen_lock = threading.Lock()
+# Callbacks run after every facade write with (ids, hackathons); hackathons is None
+# when the write can't tell which hackathons it touched (deletes).
+_write_listeners: List[Callable[[Sequence[str], Optional[Set[Optional[str]]]], None]] = []
+
+
+# Same, with the written metadatas (None for deletes), for mirrors of the index contents.
+_index_listeners: List[Callable[[Sequence[str], Optional[Sequence[Dict[str, Any]]]], None]] = []
+
+
+def on_write(fn: Callable[[Sequence[str], Optional[Set[Optional[str]]]], None]) -> Callable:
+    _write_listeners.append(fn)
+    return fn
+
+
+def on_index_write(fn: Callable[[Sequence[str], Optional[Sequence[Dict[str, Any]]]], None]) -> Callable:
+    _index_listeners.append(fn)
+    return fn
+
+
+def _invalidate(ids: Sequence[str], metadatas: Optional[Sequence[Dict[str, Any]]] = None) -> None:
+    global _write_gen
+    with _gen_lock:
+        _write_gen += 1
+        for pid in ids:
+            _stored_vectors.pop(pid)
+    hackathons = {(m or {}).get("hackathon") for m in metadatas} if metadatas is not None else None
+    for fn in _write_listeners:
+        fn(ids, hackathons)
+    for fn in _index_listeners:
+        fn(ids, metadatas)
+
+
+def stored_embedding(profile_id: str) -> Optional[List[float]]:
+    """The indexed vector for profile_id, or None if it has not been indexed."""
+    vec = _stored_vectors.get(profile_id)
+    if vec is not None:
+        return vec
+    gen = _write_gen
+    vec = get_store().get_embeddings([profile_id]).get(profile_id)
+    if vec is not None:
+        with _gen_lock:
+            if gen == _write_gen:
+                _stored_vectors.put(profile_id, vec)
+    return vec
+
+
+def upsert(profile_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+    get_store().upsert(profile_id, embedding, metadata)
+    _invalidate([profile_id], [metadata])
+
+
+def delete(profile_id: str) -> None:
+    get_store().delete(profile_id)
+    _invalidate([profile_id])
+
+
+def upsert_many(ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]], chunk_size: int = VECTOR_WRITE_CHUNK) -> None:
+    """Bulk upsert, written to the backend in chunks of chunk_size."""
+    if not (len(ids) == len(embeddings) == len(metadatas)):
+        raise ValueError("ids, embeddings and metadatas must have the same length")
+    store = get_store()
+    step = max(1, chunk_size)
+    for i in range(0, len(ids), step):
+        store.upsert_many(ids[i:i + step], embeddings[i:i + step], metadatas[i:i + step])
+    _invalidate(ids, metadatas)
+
+
+def delete_many(ids: Sequence[str], chunk_size: int = VECTOR_WRITE_CHUNK) -> None:
+    store = get_store()
+    ids = list(ids)
+    step = max(1, chunk_size)
+    for i in range(0, len(ids), step):
+        store.delete_many(ids[i:i + step])
+    _invalidate(ids)
+
+
+def query(query_embedding: List[float], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return get_store().query(query_embedding, n_results=n_results, where=where)
+
+
+def query_many(query_embeddings: Sequence[Sequence[float]], n_results: int = 50, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if not len(query_embeddings):
+        return {"ids": [], "metadatas": [], "distances": []}
+    return get_store().query_many(query_embeddings, n_results=n_results, where=where)
+
+
+def query_ids(query_embedding: List[float], ids: Sequence[str], n_results: int = 50) -> Dict[str, Any]:
+    return get_store().query_ids(query_embedding, ids, n_results=n_results)
+
+
+def count(where: Optional[Dict[str, Any]] = None) -> int:
+    return get_store().count(where)
+
+
+def ids(where: Optional[Dict[str, Any]] = None) -> List[str]:
+    return get_store().ids(where)
+
+
+def metadatas() -> Tuple[List[str], List[Dict[str, Any]]]:
+    return get_store().metadatas()
+
+
+def flush() -> None:
+    if _store is not None:
+        _store.flush()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, TYPE_CHECKING
+from itertools import islice, repeat
+import json
+import threading
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Skills and topics interned to dense integer ids, and each profile's term set packed
+# into a bitset (a Python int: bit i set <=> term i present). Overlap with the user is
+# then one AND + popcount per candidate, and the Jaccard/blend arithmetic runs in
+# NumPy over all candidates at once. Skills and topics share one id space: the
+# keyword score has always treated "rag" the skill and "rag" the topic as one term.
+
+TERM_SET_CACHE_SIZE = 50000
+
+
+def as_list(value: Any) -> List[str]:
+    """A skills/topics value as a list, whether it arrives as a list or as the
+    JSON string vector-store metadata carries."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return [str(v) for v in value] if isinstance(value, (list, tuple)) else []
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+class Vocabulary:
+    """Append-only term -> id map; ids are never reused, so encoded sets stay valid."""
+
+    def __init__(self, cache_size: int = TERM_SET_CACHE_SIZE) -> None:
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._lock = threading.Lock()
+        # (skills, topics) raw values -> (bits, size). Keyed by content, so profile
+        # updates need no invalidation; cleared wholesale when it outgrows cache_size.
+        self._sets: Dict[Tuple[Any, Any], Tuple[int, int]] = {}
+        self.cache_size = cache_size
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def intern(self, term: str) -> int:
+        tid = self._ids.get(term)
+        if tid is None:
+            with self._lock:
+                tid = self._ids.get(term)
+                if tid is None:
+                    tid = self._ids[term] = len(self._terms)
+                    self._terms.append(term)
+        return tid
+
+    def term(self, tid: int) -> str:
+        return self._terms[tid]
+
+    def terms(self, bits: int) -> List[str]:
+        return [self._terms[i] for i in range(bits.bit_length()) if bits >> i & 1]
+
+    def _encode_new(self, key: Tuple[Any, Any], skills: Any, topics: Any) -> Tuple[int, int]:
+        bits = 0
+        for t in as_list(skills) + as_list(topics):
+            bits |= 1 << self.intern(t)
+        entry = (bits, bits.bit_count())
+        if len(self._sets) >= self.cache_size:
+            self._sets.clear()
+        self._sets[key] = entry
+        return entry
+
+    def encode(self, skills: Any, topics: Any = None) -> Tuple[int, int]:
+        """(bitset, size) for the union of a skills and a topics value."""
+        key = (_hashable(skills), _hashable(topics))
+        entry = self._sets.get(key)
+        return entry if entry is not None else self._encode_new(key, skills, topics)
+
+    def encode_many(self, metas: Sequence[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        sets, out = self._sets, []
+        for m in metas:
+            sk, tp = m.get("skills_norm"), m.get("topics")
+            key = (_hashable(sk), _hashable(tp))
+            entry = sets.get(key)
+            out.append(entry if entry is not None else self._encode_new(key, sk, tp))
+        return out
+
+    @staticmethod
+    def jaccard_pairs(users: Iterable[Tuple[int, int]], candidates: Sequence[Tuple[int, int]]) -> "np.ndarray":
+        """Jaccard(u, c) for aligned (user, candidate) pairs of encoded sets, as one float64 array."""
+        import numpy as np
+        n = len(candidates)
+        users = list(islice(users, n))
+        inter = np.fromiter(((u & c).bit_count() for (u, _), (c, _) in zip(users, candidates)), dtype=np.float64, count=n)
+        sizes = np.fromiter((cs + us for (_, us), (_, cs) in zip(users, candidates)), dtype=np.float64, count=n)
+        union = sizes - inter
+        return np.divide(inter, union, out=np.zeros(n, dtype=np.float64), where=union > 0)
+
+    @classmethod
+    def jaccard_many(cls, user: Tuple[int, int], candidates: Sequence[Tuple[int, int]]) -> "np.ndarray":
+        """Jaccard(user, c) for every encoded candidate set, as one float64 array."""
+        return cls.jaccard_pairs(repeat(user, len(candidates)), candidates)
+
+
+vocabulary = Vocabulary()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Selective filters through /search and /matches: vector-store filtering (old) vs
+bitmap candidate sets scored exactly (new).
+
+    python benchmarks/bench_bitmap_filter.py                 # 20000 profiles, 50 queries, numpy backend
+    python benchmarks/bench_bitmap_filter.py 20000 50 chroma
+
+"old" runs the same routes with BITMAP_INDEX_ENABLED switched off in the routers.
+Search queries filter on one hackathon plus one or two skills (a few hundred
+candidates); match queries ask for one hackathon's available profiles. The
+exact scorer and the filtered query must agree on totals and scores.
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["CHROMA_DIR"] = os.path.join(_tmp, "chroma")
+os.environ["VECTOR_BACKEND"] = sys.argv[3] if len(sys.argv) > 3 else "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.main import app
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.routers import search as search_router
+from app.services import matching
+from app.services.auth import create_token
+from app.services.bitmap_index import bitmap_index
+from app.services.search_cursors import result_sets
+from app.services.seeding import generate_synthetic_profiles, SKILLS, HACKATHONS
+
+
+def ms(xs):
+    return sorted(xs)[len(xs) // 2] * 1000
+
+
+def set_enabled(on: bool) -> None:
+    search_router.BITMAP_INDEX_ENABLED = on
+    matching.BITMAP_INDEX_ENABLED = on
+
+
+def main(n: int, queries: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        users = db.exec(select(Profile.id, Profile.name, Profile.skills_norm_json, Profile.topics_json).limit(queries)).all()
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    rnd = random.Random(9)
+    searches = [{"q": f"builder {i}", "hackathon": rnd.choice(HACKATHONS),
+                 "skills": ",".join(rnd.sample(SKILLS, rnd.randint(1, 2)))} for i in range(queries)]
+    hacks = [rnd.choice(HACKATHONS) for _ in range(queries)]
+
+    print(f"{os.environ['VECTOR_BACKEND']}: {n} profiles, {queries} queries")
+    with TestClient(app) as client:
+        print(f"  bitmap index: {bitmap_index.stats()}")
+        client.get("/search", params={"q": "warmup"}, headers=auth)
+        results = {}
+        for label, on in (("old", False), ("new", True)):
+            set_enabled(on)
+            t_search, t_match, got = [], [], []
+            for params in searches:
+                result_sets.clear()
+                t0 = time.perf_counter()
+                r = client.get("/search", params=params, headers=auth).json()
+                t_search.append(time.perf_counter() - t0)
+                got.append(r["total"])
+            for (pid, name, skills, topics), h in zip(users, hacks):
+                user = {"id": pid, "name": name, "skills_norm": skills, "topics": topics}
+                t0 = time.perf_counter()
+                _, _, dists = asyncio.run(matching.retrieve_candidates(user, k=20, exclude_id=pid, hackathon=h))
+                t_match.append(time.perf_counter() - t0)
+                got.append([round(d, 5) for d in dists])
+            results[label] = got
+            print(f"  {label}: /search p50 {ms(t_search):7.2f}ms   retrieve_candidates p50 {ms(t_match):7.2f}ms")
+        # seeded profiles tie often, so candidates are compared by score rather than by id
+        old, new = results["old"], results["new"]
+        totals = sum(a == b for a, b in zip(old[:queries], new[:queries])) / queries
+        scores = sum(a == b for a, b in zip(old[queries:], new[queries:])) / queries
+        print(f"  same /search totals: {totals:.0%}   same candidate scores: {scores:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Throughput of the hot routes under concurrent clients, against a real uvicorn
+server: requests/s and latency for a mix of /status, /profiles/{id}, /matches
+and /search, plus the latency of /health (no database) as a measure of how long
+requests wait for the event loop.
+
+    python benchmarks/bench_concurrency.py                  # 5000 profiles, 50 and 200 clients, 10 s each
+    python benchmarks/bench_concurrency.py 5000 50,200 10
+
+Compare against another checkout (e.g. the sync-session routes before the async
+database layer) by serving that tree on the same seeded data:
+
+    git worktree add /tmp/hinder-before <rev>
+    python benchmarks/bench_concurrency.py 5000 50,200 10 --app-dir /tmp/hinder-before/backend
+"""
+
+import os
+import sys
+import time
+import re
+import random
+import socket
+import asyncio
+import tempfile
+import subprocess
+from urllib.parse import urlencode
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+from sqlalchemy import update
+from sqlmodel import Session, select
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services.auth import create_token
+from app.services.seeding import generate_synthetic_profiles, SKILLS, HACKATHONS
+
+
+def seed(n: int) -> list:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        db.exec(update(Profile).values(user_id=1))  # owned by the benchmark's token
+        db.commit()
+        return list(db.exec(select(Profile.id)).all())
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app_dir: str, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+         "--timeout-keep-alive", "120"],
+        cwd=app_dir, env=os.environ,
+    )
+    for _ in range(200):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(int(len(xs) * p), len(xs) - 1)] * 1000 if xs else 0.0
+
+
+class Conn:
+    """One keep-alive HTTP/1.1 connection. httpx's pool spends more time managing 200
+    connections than the server spends answering them, so the clients speak HTTP directly."""
+
+    def __init__(self, port: int, headers: str) -> None:
+        self.port, self.headers = port, headers
+        self.reader = self.writer = None
+
+    async def get(self, path: str, params=None) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        target = path + ("?" + urlencode(params) if params else "")
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: bench\r\n{self.headers}\r\n".encode())
+        try:
+            head = await self.reader.readuntil(b"\r\n\r\n")
+            length = int(re.search(rb"(?i)content-length: *(\d+)", head).group(1))
+            await self.reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.writer = None
+            raise
+        return int(head.split(b" ", 2)[1])
+
+
+async def load(port: int, ids: list, clients: int, seconds: float, report: bool = True) -> None:
+    headers = f"Authorization: Bearer {create_token('1')}\r\n"
+    rnd = random.Random(clients)
+
+    def request():
+        pid = rnd.choice(ids)
+        kind = rnd.choice(("status", "profile", "matches", "search"))
+        if kind == "status":
+            return "/status", {"profile_id": pid}
+        if kind == "profile":
+            return f"/profiles/{pid}", None
+        if kind == "matches":
+            return "/matches", {"user_id": pid, "k": rnd.choice((10, 20)), "hackathon": rnd.choice(HACKATHONS)}
+        return "/search", {"q": f"{rnd.choice(SKILLS)} {rnd.randrange(1000)}", "page_size": 10}
+
+    lat, health, errors = [], [], 0
+    stop = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal errors
+        conn = Conn(port, headers)
+        while time.perf_counter() < stop:
+            path, params = request()
+            t0 = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(conn.get(path, params), timeout=30.0)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                conn = Conn(port, headers)
+                errors += 1
+                continue
+            lat.append(time.perf_counter() - t0)
+            errors += status >= 400
+
+    async def probe():
+        conn = Conn(port, headers)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                await asyncio.wait_for(conn.get("/health"), timeout=30.0)
+            except asyncio.TimeoutError:
+                conn = Conn(port, headers)
+            health.append(time.perf_counter() - t0)
+            await asyncio.sleep(0.05)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(probe(), *(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+    if report:
+        print(f"  {clients:>4} clients: {len(lat) / elapsed:7.1f} req/s   p50 {pct(lat, 0.5):7.1f}ms   "
+              f"p99 {pct(lat, 0.99):7.1f}ms   /health p99 {pct(health, 0.99):7.1f}ms   errors {errors}")
+
+
+def main(n: int, levels, seconds: float, app_dir: str) -> None:
+    ids = seed(n)
+    port = free_port()
+    proc = serve(app_dir, port)
+    try:
+        print(f"{os.path.abspath(app_dir)}: {n} profiles, {seconds:.0f}s per level")
+        asyncio.run(load(port, ids, 10, 2.0, report=False))  # warm caches and the index
+        for clients in levels:
+            asyncio.run(load(port, ids, clients, seconds))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:  # a wedged server never finishes its in-flight requests
+            proc.kill()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    app_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    if "--app-dir" in args:
+        i = args.index("--app-dir")
+        app_dir = args[i + 1]
+        del args[i:i + 2]
+    main(int(args[0]) if args else 5000,
+         [int(x) for x in (args[1] if len(args) > 1 else "50,200").split(",")],
+         float(args[2]) if len(args) > 2 else 10.0, app_dir)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Local embedder throughput: per-text md5 loop (pre-embed_batch) vs the batched
+NumPy path behind embed_batch() (cache bypassed).
+
+    python benchmarks/bench_embeddings.py            # 10k and 100k summaries
+    python benchmarks/bench_embeddings.py 5000 50000
+"""
+
+import os
+import sys
+import time
+import random
+import hashlib
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.embeddings import DIM, _embed_local_matrix, _token_bucket
+
+SKILLS = ["Python", "TypeScript", "React", "ROS", "Rust", "Go", "RAG", "LLM", "Prompting", "SQL",
+          "Docker", "Kubernetes", "AR", "VR", "Solana", "GraphQL", "PyTorch", "TensorFlow"]
+TOPICS = ["Agentic AI", "Drones", "LLM Eval", "RAG", "Web3", "Data Infra", "AR/VR", "Open Source", "VC chat"]
+
+
+def _legacy_embed(text: str) -> np.ndarray:
+    # Pre-batch implementation: md5 hexdigest per token, one text at a time.
+    vec = np.zeros(DIM, dtype=np.float32)
+    for t in [t.lower() for t in text.strip().split() if t.strip()][:4000]:
+        vec[int(hashlib.md5(t.encode()).hexdigest(), 16) % DIM] += 1.0
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec
+
+
+def make_summaries(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        skills = rnd.sample(SKILLS, 6)
+        topics = rnd.sample(TOPICS, 3)
+        out.append(f"Seed {i:06x} | Excited about {topics[0]} | {', '.join(skills)} | {', '.join(topics)}")
+    return out
+
+
+def run(n: int) -> None:
+    texts = make_summaries(n)
+
+    legacy = np.empty((n, DIM), dtype=np.float32)
+    t0 = time.perf_counter()
+    for i, t in enumerate(texts):
+        legacy[i] = _legacy_embed(t)
+    t_legacy = time.perf_counter() - t0
+
+    _token_bucket.cache_clear()
+    t0 = time.perf_counter()
+    batch = _embed_local_matrix(texts)
+    t_batch = time.perf_counter() - t0
+
+    assert batch.tobytes() == legacy.tobytes(), "embed_batch diverged from the legacy embedder"
+    print(f"n={n:>7}  legacy {n / t_legacy:>10.0f} texts/s ({t_legacy:6.2f}s)   "
+          f"embed_batch {n / t_batch:>10.0f} texts/s ({t_batch:6.2f}s)   "
+          f"speedup x{t_legacy / t_batch:.1f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        run(n)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+/facets latency as the profile count grows: maintained counters (new) vs loading
+every ready profile and parsing its JSON (old, what /admin/stats-style counting costs).
+
+    python benchmarks/bench_facets.py                   # 1000,10000,50000 profiles, 50 requests each
+    python benchmarks/bench_facets.py 1000,20000 100
+
+Each request asks for all five facets of one hackathon among available profiles.
+"write" is the extra time a PATCH spends applying its counter delta.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from collections import Counter
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select, func
+from app.main import app
+from app.db import facets
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services.auth import create_token
+from app.services.seeding import generate_synthetic_profiles, HACKATHONS
+from app.utils.json import json_to_list
+
+
+def scan_facets(db, hackathon):
+    out = {f: Counter() for f in facets.FIELDS}
+    rows = db.exec(select(Profile).where(Profile.status == "ready", Profile.hackathon == hackathon,
+                                         Profile.available_now == True)).all()  # noqa: E712
+    for p in rows:
+        out["skills"].update(set(json_to_list(p.skills_norm_json)))
+        out["topics"].update(set(json_to_list(p.topics_json)))
+        for f in ("hackathon", "school", "company"):
+            if getattr(p, f):
+                out[f][getattr(p, f)] += 1
+    return len(rows), {f: c.most_common(20) for f, c in out.items()}
+
+
+def ms(xs):
+    return sorted(xs)[len(xs) // 2] * 1000
+
+
+def main(sizes, reqs: int) -> None:
+    init_db()
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    rnd = random.Random(5)
+    print(f"{'profiles':>9}  {'scan p50':>9}  {'/facets p50':>11}  {'write p50':>9}")
+    with TestClient(app) as client:
+        for n in sizes:
+            with Session(engine) as db:
+                have = db.exec(select(func.count()).select_from(Profile)).one()
+                generate_synthetic_profiles(db, n - have)
+            t_scan, t_api, t_write = [], [], []
+            for _ in range(reqs):
+                h = rnd.choice(HACKATHONS)
+                with Session(engine) as db:
+                    t0 = time.perf_counter()
+                    total, _ = scan_facets(db, h)
+                    t_scan.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                r = client.get("/facets", params={"hackathon": h, "available_now": True}, headers=auth).json()
+                t_api.append(time.perf_counter() - t0)
+                assert r["total"] == total
+            with Session(engine) as db:
+                ids = db.exec(select(Profile.id).limit(reqs)).all()
+                for pid in ids:
+                    p = db.get(Profile, pid)
+                    before = facets.snapshot(p)
+                    p.available_now = not p.available_now
+                    t0 = time.perf_counter()
+                    facets.apply(db, [(before, facets.snapshot(p))])
+                    t_write.append(time.perf_counter() - t0)
+                    db.commit()
+            print(f"{n:>9}  {ms(t_scan):7.2f}ms  {ms(t_api):9.2f}ms  {ms(t_write):7.2f}ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in (sys.argv[1] if len(sys.argv) > 1 else "1000,10000,50000").split(",")]
+    main(sizes, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Selective filters: over-fetch + Python post-filter (old) vs filters inside the index (new).
+
+    python benchmarks/bench_filters.py                # 20k profiles, 200 queries, numpy backend
+    python benchmarks/bench_filters.py 20000 200 chroma
+
+Each query asks for a 20-row page filtered on one rare skill plus available_now and
+a hackathon, the shape of /search and /matches traffic. "fill" is the fraction of
+the requested page actually returned; the old path runs dry when the filter is
+selective, the new one fills the page whenever enough profiles match.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.embeddings import _embed_local_matrix
+from app.services.numpy_store import NumpyVectorStore
+from app.services.vector_store import membership_metadata, any_of, all_of
+
+SKILLS = ["python", "typescript", "react", "ros", "rust", "go", "rag", "llm", "prompting", "sql",
+          "docker", "kubernetes", "ar", "vr", "solana", "graphql", "pytorch", "tensorflow"]
+RARE = [f"niche-{i}" for i in range(40)]
+HACKATHONS = ["calhacks12.0", "ethglobal-nyc", "hackmit", "treehacks", "la-hacks"]
+PAGE = 20
+
+
+def make_profiles(n: int, rnd: random.Random):
+    texts, metas = [], []
+    for i in range(n):
+        skills = rnd.sample(SKILLS, 5) + ([rnd.choice(RARE)] if rnd.random() < 0.3 else [])
+        texts.append(f"Seed {i:06x} | {', '.join(skills)}")
+        meta = {"id": f"p_{i}", "skills_norm": skills,
+                "available_now": rnd.random() > 0.4, "hackathon": rnd.choice(HACKATHONS)}
+        meta.update(membership_metadata("skills_norm", skills))
+        metas.append(meta)
+    return texts, metas
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def old_path(store, vec, skill, hackathon, exclude_id):
+    # pre-change behaviour: primitive filters in the index, over-fetch, then skill + exclude in Python
+    res = store.query(vec, n_results=max(PAGE * 5, 50), where={"available_now": True, "hackathon": hackathon})
+    out = []
+    for pid, meta in zip(res["ids"][0], res["metadatas"][0]):
+        if pid == exclude_id or skill not in json.loads(meta.get("skills_norm") or "[]"):
+            continue
+        out.append(pid)
+    return out[:PAGE]
+
+
+def new_path(store, vec, skill, hackathon, exclude_id):
+    where = all_of({"available_now": True}, {"hackathon": hackathon},
+                   any_of("skills_norm", [skill]), {"id": {"$ne": exclude_id}})
+    expected = min(PAGE, store.count(where))
+    return store.query(vec, n_results=PAGE, where=where)["ids"][0], expected
+
+
+def main(n: int, q: int, backend: str) -> None:
+    rnd = random.Random(5)
+    texts, metas = make_profiles(n, rnd)
+    vecs = _embed_local_matrix(texts)
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend == "chroma":
+            from app.services.chroma_store import ChromaVectorStore
+            store = ChromaVectorStore(os.path.join(tmp, "chroma"), "bench")
+        else:
+            store = NumpyVectorStore(os.path.join(tmp, "np"), snapshot_every=0)
+        for i in range(0, n, 2000):
+            store.upsert_many([m["id"] for m in metas[i:i + 2000]], vecs[i:i + 2000], metas[i:i + 2000])
+
+        old_t, new_t, old_fill, new_fill = [], [], [], []
+        for _ in range(q):
+            i = rnd.randrange(n)
+            args = (vecs[i].tolist(), rnd.choice(RARE), rnd.choice(HACKATHONS), metas[i]["id"])
+            t0 = time.perf_counter()
+            got_old = old_path(store, *args)
+            old_t.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            got_new, expected = new_path(store, *args)
+            new_t.append(time.perf_counter() - t0)
+            if expected:
+                old_fill.append(len(got_old) / expected)
+                new_fill.append(len(got_new) / expected)
+
+    print(f"{backend}: {n} profiles, {q} queries, page={PAGE}, rare skill on ~{30 / len(RARE):.2f}% of profiles")
+    for name, ts, fill in (("over-fetch + python", old_t, old_fill), ("in-index filters", new_t, new_fill)):
+        print(f"  {name:<20} p50 {pct(ts, 0.5):7.2f}ms  p95 {pct(ts, 0.95):7.2f}ms  "
+              f"page fill {sum(fill) / max(1, len(fill)):.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+         sys.argv[3] if len(sys.argv) > 3 else "numpy")
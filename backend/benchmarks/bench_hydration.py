@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Candidate hydration in /matches and /search: SQL statements and latency per request,
+per-id db.get (old) vs ProfileRepository.get_many (new).
+
+    python benchmarks/bench_hydration.py              # 5000 profiles, 200 requests, k=20
+    python benchmarks/bench_hydration.py 5000 200 50
+
+"old" replays the pre-change hydration loops against the same candidate ids the
+routes retrieve; "route" is the full request through the current routers, with
+the statement count taken from the engine.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+from app.main import app
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.db.repository import ProfileRepository
+from app.routers.matches import candidate_to_dict
+from app.services.auth import create_token
+from app.services.seeding import generate_synthetic_profiles
+from app.utils.json import json_to_list, json_to_dict
+
+statements = []
+event.listen(engine, "before_cursor_execute", lambda conn, cur, stmt, *a: statements.append(stmt))
+
+
+def legacy_prof_to_dict(p):
+    return {"id": p.id, "name": p.name, "headline": p.headline,
+            "skills_norm": json_to_list(p.skills_norm_json), "topics": json_to_list(p.topics_json),
+            "available_now": p.available_now, "hackathon": p.hackathon}
+
+
+def legacy_matches(user_id, ids):
+    # the old /matches body after retrieval: user dict rebuilt and JSON re-parsed per candidate
+    with Session(engine) as db:
+        user = db.get(Profile, user_id)
+        legacy_prof_to_dict(user), legacy_prof_to_dict(user)
+        for cid in ids:
+            p = db.get(Profile, cid)
+            cand = {"id": p.id, "skills_norm": json_to_list(p.skills_norm_json), "interests": json_to_list(p.interests_json),
+                    "topics": json_to_list(p.topics_json), "contact_info": json_to_dict(p.contact_info_json),
+                    "created_at": p.created_at.isoformat(), "updated_at": p.updated_at.isoformat()}
+            set(json_to_list(user.skills_norm_json)) & set(cand["skills_norm"])
+            set(json_to_list(user.topics_json)) & set(cand["topics"])
+            legacy_prof_to_dict(user)
+
+
+def new_matches(user_id, ids):
+    with Session(engine) as db:
+        repo = ProfileRepository(db)
+        u = repo.get(user_id)
+        for r in repo.get_many(ids):
+            candidate_to_dict(r)
+            set(u.skills_norm) & set(r.skills_norm), set(u.topics) & set(r.topics)
+
+
+def legacy_search(ids):
+    # the old /search: db.get in the filter loop, then again for the page
+    with Session(engine) as db:
+        for pid in ids:
+            p = db.get(Profile, pid)
+            json_to_list(p.skills_norm_json), json_to_list(p.topics_json)
+    with Session(engine) as db:
+        for pid in ids:
+            p = db.get(Profile, pid)
+            json_to_list(p.skills_norm_json), json_to_list(p.topics_json)
+
+
+def new_search(ids):
+    with Session(engine) as db:
+        ProfileRepository(db).get_many(ids)
+
+
+def measure(fn, calls):
+    lat, stmts = [], 0
+    for args in calls:
+        before = len(statements)
+        t0 = time.perf_counter()
+        fn(*args)
+        lat.append(time.perf_counter() - t0)
+        stmts += len(statements) - before
+    lat.sort()
+    return stmts / len(calls), lat[len(lat) // 2] * 1000, lat[int(len(lat) * 0.99)] * 1000
+
+
+def main(n: int, n_req: int, k: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        user_ids = list(db.exec(select(Profile.id)).all())
+    rnd = random.Random(2)
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    with TestClient(app) as client:
+        users = [rnd.choice(user_ids) for _ in range(n_req)]
+        cand_ids = [[m["candidate"]["id"] for m in client.get("/matches", params={"user_id": u, "k": k}).json()["matches"]]
+                    for u in users]
+        route_m = measure(lambda u: client.get("/matches", params={"user_id": u, "k": k}), [(u,) for u in users])
+        route_s = measure(lambda: client.get("/search", params={"q": "rust drones", "page_size": k}, headers=auth), [()] * n_req)
+
+    rows = [
+        ("matches old", measure(legacy_matches, list(zip(users, cand_ids)))),
+        ("matches new", measure(new_matches, list(zip(users, cand_ids)))),
+        ("matches route", route_m),
+        ("search old", measure(legacy_search, [(c,) for c in cand_ids])),
+        ("search new", measure(new_search, [(c,) for c in cand_ids])),
+        ("search route", route_s),
+    ]
+    print(f"{n} profiles, {n_req} requests, k/page_size={k}")
+    for name, (stmts, p50, p99) in rows:
+        print(f"  {name:<14} {stmts:6.1f} stmts/req   p50 {p50:7.2f}ms   p99 {p99:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 20)
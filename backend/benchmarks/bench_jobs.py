@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Profile-processing throughput through the job queue: N queued profiles run the real
+pipeline (database writes, embedding, vector upsert, match lists) with the LLM parse
+replaced by a stub that sleeps like a provider call.
+
+    python benchmarks/bench_jobs.py                   # 1000 profiles, 200 ms LLM, 0% LLM failures
+    python benchmarks/bench_jobs.py 1000 200 0.05
+
+"unbounded" is the old scheduling, one BackgroundTasks run per profile all started at
+once; the pool rows are (workers, LLM cap). "peak llm" is the most stub calls in
+flight at once, i.e. what the provider would have seen.
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import contextlib
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+from app.db.session import engine, init_db
+from app.db.models import Job, MatchCandidate, MatchCandidateSet, Profile
+from app.services import jobs, pipeline, vector_store
+from app.services.seeding import SKILLS, HACKATHONS
+
+CONFIGS = [(8, 4), (32, 16), (64, 32)]
+
+
+class StubLLM:
+    def __init__(self, latency_ms: float, fail_rate: float) -> None:
+        self.latency_s = latency_ms / 1000.0
+        self.fail_rate = fail_rate
+        self.rnd = random.Random(7)
+        self.in_flight = self.peak = self.calls = 0
+
+    async def __call__(self, text: str) -> dict:
+        self.in_flight += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_s * self.rnd.uniform(0.5, 1.5))
+            if self.rnd.random() < self.fail_rate:
+                raise RuntimeError("stub provider error")
+            return {"headline": "builder", "skills": {"tech": self.rnd.sample(SKILLS, 3), "domain": []},
+                    "interests": ["ai"]}
+        finally:
+            self.in_flight -= 1
+
+
+def seed(n: int) -> list:
+    init_db()
+    rnd = random.Random(1)
+    with Session(engine) as db:
+        for i in range(n):
+            db.add(Profile(id=f"job_{i}", name=f"Person {i}", hackathon=rnd.choice(HACKATHONS),
+                           available_now=rnd.random() < 0.5, status="pending"))
+        db.commit()
+        return list(db.exec(select(Profile.id)).all())
+
+
+def reset(ids: list, queue: bool) -> None:
+    # every run starts from the same unprocessed state: no vectors or match lists yet
+    vector_store.delete_many(ids)
+    with Session(engine) as db:
+        for table in (Job, MatchCandidate, MatchCandidateSet):
+            db.exec(delete(table))
+        db.exec(update(Profile).values(status="pending", skills_norm_json="[]", topics_json="[]"))
+        if queue:
+            for pid in ids:
+                jobs.enqueue(db, pid)
+        db.commit()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def outcome() -> tuple:
+    with Session(engine) as db:
+        statuses = list(db.exec(select(Profile.status)).all())
+        return statuses.count("ready"), statuses.count("error")
+
+
+async def unbounded(ids: list) -> None:
+    await asyncio.gather(*(pipeline.run(pid) for pid in ids), return_exceptions=True)
+
+
+async def pooled(ids: list, workers: int, llm: int) -> jobs.WorkerPool:
+    pool = jobs.WorkerPool(workers=workers, llm=llm, pdf=2, embed=llm, poll_s=0.05, backoff_s=0.1)
+    await pool.start()
+    try:
+        while True:
+            with Session(engine) as db:
+                left = db.exec(select(Job.id).where(Job.state.in_((jobs.QUEUED, jobs.RUNNING))).limit(1)).first()
+            if left is None:
+                return pool
+            await asyncio.sleep(0.05)
+    finally:
+        await pool.stop()
+
+
+def main(n: int, llm_ms: float, fail_rate: float) -> None:
+    ids = seed(n)
+    print(f"{n} profiles, stub LLM {llm_ms:.0f} ms, {fail_rate:.0%} LLM failures")
+    print(f"{'':>16}  {'jobs/s':>7}  {'wall':>7}  {'peak llm':>8}  {'ready':>5}  {'error':>5}  {'retried':>7}")
+    runs = [("unbounded", None)] + [(f"pool {w:>2} / llm {l:>2}", (w, l)) for w, l in CONFIGS]
+    for label, cfg in runs:
+        reset(ids, queue=cfg is not None)
+        stub = StubLLM(llm_ms, fail_rate)
+        pipeline.parse_extract = stub
+        retried = ""
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # the pipeline logs every step
+            if cfg is None:
+                asyncio.run(unbounded(ids))
+            else:
+                retried = asyncio.run(pooled(ids, *cfg)).retried
+        elapsed = time.perf_counter() - t0
+        ready, error = outcome()
+        print(f"{label:>16}  {n / elapsed:7.1f}  {elapsed:6.1f}s  {stub.peak:>8}  {ready:>5}  {error:>5}  {retried:>7}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000, float(args[1]) if len(args) > 1 else 200.0,
+         float(args[2]) if len(args) > 2 else 0.0)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Refresh storm on /matches: hit rate, vector-store queries and latency with and
+without the match result cache.
+
+    python benchmarks/bench_match_cache.py              # 5000 profiles, 100 users x 10 refreshes
+    python benchmarks/bench_match_cache.py 5000 300 5 500
+
+Requests from the users are shuffled together; every `write_every` requests one
+profile is re-indexed (as the pipeline does when it reaches ready), bumping the
+generation of its hackathon. Half the requests filter on one random hackathon.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.main import app
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.routers import matches as matches_router
+from app.services import matching, match_table, match_cache as match_cache_mod, vector_store
+from app.services.match_cache import match_cache
+from app.services.indexing import index_profiles
+from app.services.seeding import generate_synthetic_profiles, HACKATHONS
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def storm(client, users, rounds, write_every, all_ids):
+    rnd = random.Random(3)
+    hack = {u: rnd.choice(HACKATHONS) for u in users}
+    reqs = [(u, hack[u] if i % 2 else None) for i, u in enumerate(users)] * rounds
+    rnd.shuffle(reqs)
+    lat = []
+    for i, (u, h) in enumerate(reqs):
+        if i and i % write_every == 0:
+            with Session(engine) as db:
+                index_profiles([db.get(Profile, rnd.choice(all_ids))])
+        params = {"user_id": u, "k": 20}
+        if h:
+            params["hackathon"] = h
+        t0 = time.perf_counter()
+        client.get("/matches", params=params)
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+
+def main(n: int, n_users: int, rounds: int, write_every: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        all_ids = list(db.exec(select(Profile.id)).all())
+    users = random.Random(0).sample(all_ids, n_users)
+
+    queries = {"n": 0}
+    real_query = vector_store.query
+
+    def counting_query(*a, **kw):
+        queries["n"] += 1
+        return real_query(*a, **kw)
+
+    matching.vector_query = counting_query
+    # isolate the result cache: live scoring for every miss
+    matches_router.MATCH_TABLE_ENABLED = match_table.MATCH_TABLE_ENABLED = False
+
+    print(f"{n} profiles, {n_users} users x {rounds} refreshes, one profile re-indexed every {write_every} requests")
+    with TestClient(app) as client:
+        for enabled in (False, True):
+            match_cache_mod.MATCH_CACHE_ENABLED = enabled
+            match_cache.clear()
+            queries["n"] = 0
+            lat = storm(client, users, rounds, write_every, all_ids)
+            s = match_cache.stats()
+            label = "cache on " if enabled else "cache off"
+            print(f"  {label} p50 {pct(lat, 0.5):6.2f}ms  p99 {pct(lat, 0.99):6.2f}ms  vector queries {queries['n']:5d}"
+                  + (f"  hit rate {s['hitRate']:.3f} (stale {s['stale']}, expired {s['expired']})" if enabled else ""))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [5000, 100, 10, 100][len(args):]))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+/matches served from the materialized match lists vs live scoring, and the cost of
+keeping the lists current when a profile becomes ready.
+
+    python benchmarks/bench_match_table.py             # 5000 profiles, 500 requests over 200 users
+    python benchmarks/bench_match_table.py 20000 1000 500
+
+Requests repeat over a fixed set of users (users refresh far more often than the
+pool changes). The "table" pass runs after one warm request per user; "update"
+times match_table.profile_changed() for freshly indexed profiles.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.main import app
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.routers import matches as matches_router
+from app.services import match_table
+from app.services.seeding import generate_synthetic_profiles
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def run(client, users, n_req, rnd):
+    lat, sources = [], set()
+    for _ in range(n_req):
+        t0 = time.perf_counter()
+        r = client.get("/matches", params={"user_id": rnd.choice(users), "k": 20})
+        lat.append(time.perf_counter() - t0)
+        sources.add(r.json()["source"])
+    return lat, sources
+
+
+def set_enabled(on: bool) -> None:
+    matches_router.MATCH_TABLE_ENABLED = on
+    match_table.MATCH_TABLE_ENABLED = on
+
+
+def main(n: int, n_req: int, n_users: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        all_ids = list(db.exec(select(Profile.id)).all())
+    users = random.Random(0).sample(all_ids, n_users)
+
+    with TestClient(app) as client:
+        set_enabled(False)
+        live, _ = run(client, users, n_req, random.Random(1))
+        set_enabled(True)
+        for u in users:
+            client.get("/matches", params={"user_id": u, "k": 20})
+        table, sources = run(client, users, n_req, random.Random(1))
+
+        # new profiles becoming ready: index like the pipeline, then patch the lists
+        with Session(engine) as db:
+            before = set(all_ids)
+            match_table.clear = lambda db: None  # keep the warm lists
+            generate_synthetic_profiles(db, 50)
+            fresh = [pid for pid in db.exec(select(Profile.id)).all() if pid not in before]
+            upd, touched = [], 0
+            for pid in fresh:
+                t0 = time.perf_counter()
+                touched += match_table.profile_changed(db, pid)
+                upd.append(time.perf_counter() - t0)
+        after, sources_after = run(client, users, n_req, random.Random(2))
+
+    print(f"{n} profiles, {n_req} /matches requests over {n_users} users, k=20")
+    print(f"  live scoring  p50 {pct(live, 0.5):7.2f}ms  p99 {pct(live, 0.99):7.2f}ms")
+    print(f"  table         p50 {pct(table, 0.5):7.2f}ms  p99 {pct(table, 0.99):7.2f}ms  sources={sorted(sources)}")
+    print(f"  after updates p50 {pct(after, 0.5):7.2f}ms  p99 {pct(after, 0.99):7.2f}ms  sources={sorted(sources_after)}")
+    print(f"  profile_changed p50 {pct(upd, 0.5):7.2f}ms  p99 {pct(upd, 0.99):7.2f}ms  lists touched/profile {touched / len(fresh):.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 200)
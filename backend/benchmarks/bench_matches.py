@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+/matches latency: re-embedding the user's summary per request (old) vs reusing the
+stored profile vector (new), through the real route with a TestClient.
+
+    python benchmarks/bench_matches.py                    # 5000 profiles, 300 requests, 80ms embed
+    python benchmarks/bench_matches.py 5000 300 0         # local embedder only, no network model
+
+The embed latency argument emulates a remote provider (Gemini is typically
+50-150ms a call) by sleeping before the local embedding; 0 measures the local
+md5 embedder alone. Every third request passes a topic, which still embeds the
+topic text; repeated topics come back from the embedding cache.
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.main import app
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services import matching, embeddings
+from app.services.seeding import generate_synthetic_profiles, TOPICS
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def run(client, user_ids, n_req, rnd):
+    lat = []
+    for i in range(n_req):
+        params = {"user_id": rnd.choice(user_ids), "k": 20}
+        if i % 3 == 0:
+            params["topic"] = rnd.choice(TOPICS)
+        t0 = time.perf_counter()
+        r = client.get("/matches", params=params)
+        lat.append(time.perf_counter() - t0)
+        assert r.status_code == 200, r.text
+    return lat
+
+
+def main(n: int, n_req: int, embed_ms: float) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        user_ids = list(db.exec(select(Profile.id)).all())
+
+    calls = {"n": 0}
+    seen = set()
+    real_aembed = embeddings.aembed
+
+    async def remote_aembed(text):
+        # stand-in for a provider round trip, paid only on an embedding-cache miss
+        if text not in seen:
+            seen.add(text)
+            calls["n"] += 1
+            if embed_ms:
+                await asyncio.sleep(embed_ms / 1000)
+        return await real_aembed(text)
+
+    matching.aembed = remote_aembed
+    real_stored = matching.stored_embedding
+    with TestClient(app) as client:
+        results = {}
+        for name, stored in (("re-embed summary", lambda pid: None), ("stored vector", real_stored)):
+            matching.stored_embedding = stored
+            run(client, user_ids, 20, random.Random(0))  # warm up
+            calls["n"] = 0
+            seen.clear()
+            lat = run(client, user_ids, n_req, random.Random(1))
+            results[name] = (lat, calls["n"])
+
+    print(f"{n} profiles, {n_req} requests (1/3 with topic), emulated embed latency {embed_ms:.0f}ms")
+    for name, (lat, c) in results.items():
+        print(f"  {name:<17} p50 {pct(lat, 0.5):7.2f}ms  p99 {pct(lat, 0.99):7.2f}ms  provider calls {c}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 300,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 80)
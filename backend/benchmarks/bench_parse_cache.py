@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Resume parsing with the parse cache: N distinct resume texts parsed 4 at a time (the
+job queue's LLM cap) with the Anthropic call replaced by a stub that sleeps like one,
+then parsed again as a reembed of every profile would.
+
+    python benchmarks/bench_parse_cache.py          # 500 resumes, 800 ms LLM
+    python benchmarks/bench_parse_cache.py 500 800
+
+cold      every text misses and calls the LLM
+reembed   the same texts: every one a cache hit
+edited    SYSTEM_PROMPT changed (a new prompt version): every text misses again
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["CONTENT_CACHE_PATH"] = os.path.join(_tmp, "content_cache.db")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services import parsing
+from app.services.content_cache import content_cache
+from app.services.seeding import SKILLS
+
+LLM_CAP = 4
+
+
+def make_texts(n: int) -> list:
+    rng = random.Random(7)
+    texts = []
+    for i in range(n):
+        skills = ", ".join(rng.sample(SKILLS, 8))
+        roles = "\n".join(f"Engineer at Company{rng.randrange(500)} ({2010 + k}-{2011 + k})" for k in range(6))
+        texts.append(f"Candidate {i}\n{roles}\nSkills: {skills}\n" + "Built and shipped systems. " * 80)
+    return texts
+
+
+async def run(texts: list) -> tuple:
+    sem = asyncio.Semaphore(LLM_CAP)
+    calls = 0
+
+    async def one(text):
+        nonlocal calls
+        hit = parsing.cached(text)
+        if hit is not None:
+            return hit
+        async with sem:
+            calls += 1
+            return await parsing.extract(text)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    return time.perf_counter() - t0, calls
+
+
+def main(n: int, llm_ms: int) -> None:
+    async def stub(text):
+        await asyncio.sleep(llm_ms / 1000)
+        return {**parsing._default_output(), "headline": text[:20]}
+
+    parsing._call_anthropic = stub
+    texts = make_texts(n)
+    print(f"{n} resumes, {llm_ms} ms LLM stub, {LLM_CAP} calls at a time")
+    print(f"{'':>8}  {'elapsed':>8}  {'llm calls':>9}  {'per resume':>10}")
+    for label in ("cold", "reembed", "edited"):
+        if label == "edited":
+            parsing.PROMPT_VERSION = "edited"
+        elapsed, calls = asyncio.run(run(texts))
+        print(f"{label:>8}  {elapsed:7.2f}s  {calls:9d}  {elapsed / n * 1000:8.2f}ms")
+    stats = content_cache.stats()["parse"]
+    print(f"hit rate {stats['hitRate']:.2f}, saved {stats['savedMs'] / 1000:.1f}s of LLM time, "
+          f"{stats['disk']['entries']} entries / {stats['disk']['bytes'] / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 500, int(args[1]) if len(args) > 1 else 800)
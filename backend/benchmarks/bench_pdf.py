@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Resume text extraction under the event loop: documents/s and event-loop lag while a
+corpus of multi-page PDFs is extracted 2 at a time (the pipeline's PDF stage cap).
+
+    python benchmarks/bench_pdf.py              # 40 documents of 60 pages
+    python benchmarks/bench_pdf.py 40 60
+
+inline       extract_text() on the loop, every page (the pipeline before the job queue)
+thread       every page in a thread (the job queue before the process pool)
+process      every page in the worker processes
+process+cap  aextract_text(): worker processes, stopping at PDF_MAX_CHARS / PDF_MAX_PAGES
+
+Lag is how late a 5 ms timer on the loop fires, i.e. how long a request would wait.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ.setdefault("PDF_WORKERS", "2")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services import pdf
+from app.config import PDF_MAX_CHARS, PDF_WORKERS
+
+FULL = (10**9, 10**9, 3600.0)  # max_chars, max_pages, timeout_s: no budget
+CONCURRENCY = 2
+
+
+def make_corpus(n: int, pages: int) -> list:
+    import fitz
+    paths = []
+    words = "distributed systems python rust kubernetes latency throughput caching ".split()
+    for d in range(n):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            for line in range(60):
+                text = " ".join(words[(d + p + line + k) % len(words)] for k in range(12))
+                page.insert_text((36, 40 + line * 12), text, fontsize=8)
+        path = os.path.join(_tmp, f"resume_{d}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(int(len(xs) * p), len(xs) - 1)] * 1000 if xs else 0.0
+
+
+async def run(paths: list, mode: str):
+    lags, done = [], asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - t0 - 0.005)
+
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(path):
+        async with sem:
+            if mode == "inline":
+                return pdf.extract_text(path, *FULL)
+            if mode == "thread":
+                return await asyncio.to_thread(pdf.extract_text, path, *FULL)
+            if mode == "process":
+                return await loop.run_in_executor(pdf._executor(), pdf.extract_text, path, *FULL)
+            return await pdf.aextract_text(path)
+
+    tick = asyncio.create_task(ticker())
+    t0 = time.perf_counter()
+    texts = await asyncio.gather(*(one(p) for p in paths))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await tick
+    return elapsed, sum(len(t) for t in texts) / len(texts), lags
+
+
+def main(n: int, pages: int) -> None:
+    paths = make_corpus(n, pages)
+    mb = sum(os.path.getsize(p) for p in paths) / len(paths) / 1e6
+    print(f"{n} documents x {pages} pages ({mb:.1f} MB each), {CONCURRENCY} at a time, "
+          f"{PDF_WORKERS} worker processes, budget {PDF_MAX_CHARS} chars")
+    asyncio.run(pdf.aextract_text(paths[0]))  # start the worker processes
+    print(f"{'':>12}  {'docs/s':>7}  {'chars/doc':>9}  {'lag p50':>8}  {'lag p99':>8}  {'lag max':>8}")
+    for mode in ("inline", "thread", "process", "process+cap"):
+        elapsed, chars, lags = asyncio.run(run(paths, mode))
+        print(f"{mode:>12}  {n / elapsed:7.1f}  {chars:9.0f}  {pct(lags, 0.5):6.1f}ms  {pct(lags, 0.99):6.1f}ms  "
+              f"{max(lags) * 1000:6.1f}ms")
+    pdf.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 40, int(args[1]) if len(args) > 1 else 60)
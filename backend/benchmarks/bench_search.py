@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Selective keyword queries on /search: vector-only vs keyword (FTS5/BM25) vs hybrid (RRF).
+
+    python benchmarks/bench_search.py                 # 20000 profiles, 300 queries, numpy backend
+    python benchmarks/bench_search.py 20000 300 chroma
+
+One profile in a hundred gets a unique company name, which is not part of the
+embedded summary; each query is one of those names. "hit" is the fraction of
+queries whose profile is on the first 20-row page.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["CHROMA_DIR"] = os.path.join(_tmp, "chroma")
+os.environ["VECTOR_BACKEND"] = sys.argv[3] if len(sys.argv) > 3 else "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.main import app
+from app.db import fts
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services.auth import create_token
+from app.services.seeding import generate_synthetic_profiles
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def main(n: int, queries: int) -> None:
+    init_db()
+    rnd = random.Random(7)
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        profiles = db.exec(select(Profile)).all()
+        named = rnd.sample(profiles, max(1, n // 100))
+        for i, p in enumerate(named):
+            p.company = f"Quill{i:04d} Systems"
+            db.add(p)
+        fts.upsert(db, named)
+        db.commit()
+        targets = [(p.company.split()[0], p.id) for p in named]
+
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    print(f"{os.environ['VECTOR_BACKEND']}: {n} profiles, {queries} queries for a unique company name")
+    with TestClient(app) as client:
+        client.get("/search", params={"q": "warmup"}, headers=auth)
+        for mode in ("vector", "keyword", "hybrid"):
+            lat, hits = [], 0
+            for i in range(queries):
+                q, pid = targets[i % len(targets)]
+                t0 = time.perf_counter()
+                r = client.get("/search", params={"q": q, "mode": mode}, headers=auth).json()
+                lat.append(time.perf_counter() - t0)
+                hits += any(item["id"] == pid for item in r["items"])
+            print(f"  {mode:8s} p50 {pct(lat, 0.5):6.2f} ms  p95 {pct(lat, 0.95):6.2f} ms  hit {hits / queries:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 300)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Paging /search to page 20: re-ranking every page (old) vs one ranking served
+through next_cursor (new).
+
+    python benchmarks/bench_search_pages.py                 # 20000 profiles, 30 queries, numpy backend
+    python benchmarks/bench_search_pages.py 20000 30 chroma
+
+"old" runs the same route with the result cache off and no ranking depth, which
+is the pre-cursor behaviour: every page embeds, counts and re-queries the index
+for `page * page_size` rows. Timings are per query for all 20 pages, plus the
+latency of page 20 alone.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["CHROMA_DIR"] = os.path.join(_tmp, "chroma")
+os.environ["VECTOR_BACKEND"] = sys.argv[3] if len(sys.argv) > 3 else "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["WARMUP_ON_STARTUP"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.main import app
+from app.db.session import engine, init_db
+from app.routers import search as search_router
+from app.services.auth import create_token
+from app.services.search_cursors import result_sets
+from app.services.seeding import generate_synthetic_profiles, SKILLS
+
+PAGES = 20
+PAGE_SIZE = 20
+
+
+def walk_numbered(client, auth, q):
+    ids, last = [], 0.0
+    for page in range(1, PAGES + 1):
+        t0 = time.perf_counter()
+        r = client.get("/search", params={"q": q, "page": page, "page_size": PAGE_SIZE}, headers=auth).json()
+        last = time.perf_counter() - t0
+        ids.extend(i["id"] for i in r["items"])
+    return ids, last
+
+
+def walk_cursor(client, auth, q):
+    r = client.get("/search", params={"q": q, "page_size": PAGE_SIZE}, headers=auth).json()
+    ids, last = [i["id"] for i in r["items"]], 0.0
+    for _ in range(PAGES - 1):
+        t0 = time.perf_counter()
+        r = client.get("/search", params={"cursor": r["next_cursor"]}, headers=auth).json()
+        last = time.perf_counter() - t0
+        ids.extend(i["id"] for i in r["items"])
+    return ids, last
+
+
+def main(n: int, queries: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    qs = [f"{SKILLS[i % len(SKILLS)]} builder {i}" for i in range(queries)]
+
+    print(f"{os.environ['VECTOR_BACKEND']}: {n} profiles, {queries} queries, pages 1-{PAGES} of {PAGE_SIZE}")
+    with TestClient(app) as client:
+        client.get("/search", params={"q": "warmup"}, headers=auth)
+        results = {}
+        for label, walk in (("old", walk_numbered), ("new", walk_cursor)):
+            if label == "old":
+                depth, max_ids = search_router.SEARCH_CURSOR_DEPTH, result_sets.max_ids
+                search_router.SEARCH_CURSOR_DEPTH, result_sets.max_ids = 0, 0
+            t0, last, runs = time.perf_counter(), 0.0, []
+            for q in qs:
+                ids, t_last = walk(client, auth, q)
+                last += t_last
+                runs.append(ids)
+            elapsed = (time.perf_counter() - t0) / queries
+            if label == "old":
+                search_router.SEARCH_CURSOR_DEPTH, result_sets.max_ids = depth, max_ids
+            results[label] = runs
+            print(f"  {label}: {elapsed * 1000:8.1f} ms per 20-page walk   page 20 {last / queries * 1000:6.2f} ms")
+        # each old page is ranked on its own, so tied rows can repeat or go missing across pages
+        for label, runs in results.items():
+            dup = sum(len(ids) - len(set(ids)) for ids in runs) / queries
+            print(f"  {label}: {dup:.1f} repeated ids per walk")
+        print(f"  cache holds {result_sets.stats()['ids']} ids")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 30)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+SQLite under concurrent readers and writers: default settings (old) vs the tuned
+engine (new: WAL, synchronous=NORMAL, busy_timeout, cache/mmap, pool sizing and
+the hot-path indexes from db/migrations.py).
+
+    python benchmarks/bench_sqlite_contention.py                # 20000 profiles, 4 writers, 16 readers, 10 s
+    python benchmarks/bench_sqlite_contention.py 20000 4 16 10
+
+Writers flip a profile's availability and log a match per transaction, as
+/feedback and PATCH do. Readers mix the route lookups that hit the new indexes:
+profiles by owner, match logs by user, ready profiles by hackathon and
+availability, and a primary-key get. "old" runs on a copy of the same database
+with the rollback journal and without the new indexes.
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, func, insert, update
+from sqlmodel import Session, select
+from app.db import tuning
+from app.db.session import engine, init_db
+from app.db.models import MatchLog, Profile
+from app.services.seeding import generate_synthetic_profiles, HACKATHONS
+
+NEW_INDEXES = ("ix_profile_user_id", "ix_profile_status", "ix_profile_hackathon_available",
+               "ix_matchlog_user_id", "ix_matchlog_candidate_id")
+
+
+def seed(n: int) -> list:
+    init_db()
+    rnd = random.Random(1)
+    with Session(engine) as db:
+        generate_synthetic_profiles(db, n)
+        ids = list(db.exec(select(Profile.id)).all())
+        db.exec(update(Profile).values(user_id=func.abs(func.random()) % (n // 2)))  # about two per owner
+        db.connection().execute(insert(MatchLog), [{"user_id": rnd.choice(ids), "candidate_id": rnd.choice(ids), "feedback": "good"}
+                                                   for _ in range(n * 5)])
+        db.commit()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return ids
+
+
+def old_copy() -> str:
+    path = os.path.join(_tmp, "old.db")
+    shutil.copy(os.environ["SQLITE_PATH"], path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    for name in NEW_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(int(len(xs) * p), len(xs) - 1)] * 1000 if xs else 0.0
+
+
+def run(eng, ids, writers: int, readers: int, seconds: float):
+    stop = time.perf_counter() + seconds
+    reads, writes, errors = [], [], [0]
+
+    def writer(seed):
+        rnd = random.Random(seed)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with Session(eng) as db:
+                    pid = rnd.choice(ids)
+                    db.exec(update(Profile).where(Profile.id == pid).values(available_now=rnd.random() > 0.5))
+                    db.add(MatchLog(user_id=pid, candidate_id=rnd.choice(ids), feedback="good"))
+                    db.commit()
+                writes.append(time.perf_counter() - t0)
+            except Exception:
+                errors[0] += 1
+
+    def reader(seed):
+        rnd = random.Random(seed)
+        n = len(ids)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with Session(eng) as db:
+                    kind = rnd.randrange(4)
+                    if kind == 0:
+                        db.exec(select(Profile.id).where(Profile.user_id == rnd.randrange(n // 2))).all()
+                    elif kind == 1:
+                        db.exec(select(func.count()).select_from(MatchLog).where(MatchLog.user_id == rnd.choice(ids))).one()
+                    elif kind == 2:
+                        db.exec(select(Profile.id).where(Profile.status == "ready", Profile.hackathon == rnd.choice(HACKATHONS),
+                                                         Profile.available_now == True).limit(50)).all()  # noqa: E712
+                    else:
+                        db.get(Profile, rnd.choice(ids))
+                reads.append(time.perf_counter() - t0)
+            except Exception:
+                errors[0] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(100 + i,)) for i in range(readers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return len(reads) / elapsed, pct(reads, 0.99), len(writes) / elapsed, pct(writes, 0.99), errors[0]
+
+
+def main(n: int, writers: int, readers: int, seconds: float) -> None:
+    ids = seed(n)
+    old = create_engine(f"sqlite:///{old_copy()}")
+    new = tuning.install(create_engine(f"sqlite:///{os.environ['SQLITE_PATH']}", **tuning.ENGINE_KWARGS))
+    print(f"{n} profiles, {n * 5} match logs, {writers} writer / {readers} reader threads, {seconds:.0f}s")
+    print(f"{'':>4}  {'reads/s':>9}  {'read p99':>9}  {'writes/s':>9}  {'write p99':>9}  {'errors':>6}")
+    for label, eng in (("old", old), ("new", new)):
+        rps, rp99, wps, wp99, errs = run(eng, ids, writers, readers, seconds)
+        print(f"{label:>4}  {rps:9.0f}  {rp99:7.1f}ms  {wps:9.0f}  {wp99:7.1f}ms  {errs:>6}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 20000, int(args[1]) if len(args) > 1 else 4,
+         int(args[2]) if len(args) > 2 else 16, float(args[3]) if len(args) > 3 else 10.0)
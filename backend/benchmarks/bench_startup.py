@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost: `import app.main` time and time from process start to the first
+/health response under uvicorn, plus which heavy modules the import pulled in.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 5 --max-import-ms 1500 --max-health-ms 4000
+
+With thresholds it exits 1 on regression (or if chromadb/fitz/numpy/jose get
+imported eagerly again), so it can run as a CI guard.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY = ["chromadb", "fitz", "numpy", "jose", "passlib"]
+
+IMPORT_PROBE = (
+    "import sys, time, json; t = time.perf_counter(); import app.main; "
+    "print(json.dumps({'ms': (time.perf_counter() - t) * 1000, "
+    f"'heavy': [m for m in {HEAVY!r} if m in sys.modules]}}))"
+)
+
+
+def _env(tmp: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "SQLITE_PATH": os.path.join(tmp, "hinder.db"),
+        "UPLOAD_DIR": os.path.join(tmp, "uploads"),
+        "CHROMA_DIR": os.path.join(tmp, "chroma"),
+        "NUMPY_INDEX_DIR": os.path.join(tmp, "np"),
+        "EMBED_CACHE_PATH": os.path.join(tmp, "embed_cache.db"),
+    })
+    return env
+
+
+def measure_import(tmp: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND, env=_env(tmp),
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_health(tmp: str, timeout: float = 30.0) -> tuple:
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                            cwd=BACKEND, env=_env(tmp), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    health_ms = ready_ms = None
+    try:
+        while time.perf_counter() - t0 < timeout:
+            try:
+                if health_ms is None:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                    health_ms = (time.perf_counter() - t0) * 1000
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1).read()
+                ready_ms = (time.perf_counter() - t0) * 1000
+                break
+            except Exception:
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return health_ms, ready_ms
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--max-import-ms", type=float, default=None)
+    ap.add_argument("--max-health-ms", type=float, default=None)
+    args = ap.parse_args()
+
+    imports, healths, readies, heavy = [], [], [], set()
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            r = measure_import(tmp)
+            imports.append(r["ms"])
+            heavy.update(r["heavy"])
+        with tempfile.TemporaryDirectory() as tmp:
+            h, rd = measure_health(tmp)
+            healths.append(h if h is not None else float("inf"))
+            readies.append(rd if rd is not None else float("inf"))
+
+    best = lambda xs: min(xs)
+    runs = lambda xs: [round(x) if x != float("inf") else "timeout" for x in xs]
+    print(f"import app.main     best {best(imports):8.1f}ms  runs {runs(imports)}")
+    print(f"first /health       best {best(healths):8.1f}ms  runs {runs(healths)}")
+    print(f"first /ready (200)  best {best(readies):8.1f}ms  runs {runs(readies)}")
+    print(f"heavy modules imported eagerly: {sorted(heavy) or 'none'}")
+
+    failed = bool(heavy)
+    if args.max_import_ms is not None and best(imports) > args.max_import_ms:
+        print(f"REGRESSION: import {best(imports):.0f}ms > {args.max_import_ms:.0f}ms")
+        failed = True
+    if args.max_health_ms is not None and best(healths) > args.max_health_ms:
+        print(f"REGRESSION: /health {best(healths):.0f}ms > {args.max_health_ms:.0f}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Skill/topic filters and facet counts: loading profiles and parsing their JSON (old)
+vs indexed SQL over profile_skill / profile_topic (new).
+
+    python benchmarks/bench_terms.py              # 20000 profiles, 50 repetitions
+    python benchmarks/bench_terms.py 50000 20
+
+"filter" is "ready, available profiles in hackathon H with skill A or B";
+"facets" is the top-20 skills among ready profiles, as in /admin/stats.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from collections import Counter
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["EMBED_CACHE_PATH"] = ""
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlmodel import Session, select
+from app.db import terms
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services.seeding import generate_synthetic_profiles, HACKATHONS, SKILLS
+from app.utils.json import json_to_list
+
+
+def old_filter(db, hackathon, skills):
+    rows = db.exec(select(Profile).where(Profile.status == "ready", Profile.available_now == True,  # noqa: E712
+                                         Profile.hackathon == hackathon)).all()
+    want = set(skills)
+    return {p.id for p in rows if want & set(json_to_list(p.skills_norm_json))}
+
+
+def new_filter(db, hackathon, skills):
+    return set(db.exec(select(Profile.id).where(
+        Profile.status == "ready", Profile.available_now == True,  # noqa: E712
+        Profile.hackathon == hackathon, Profile.id.in_(terms.having_any(db, "skills_norm", skills)),
+    )).all())
+
+
+def old_facets(db):
+    c = Counter()
+    for p in db.exec(select(Profile).where(Profile.status == "ready")).all():
+        c.update(set(json_to_list(p.skills_norm_json)))
+    return sorted(c.items(), key=lambda kv: (-kv[1], kv[0]))[:20]
+
+
+def new_facets(db):
+    return terms.counts(db, "skills_norm", [Profile.status == "ready"], limit=20)
+
+
+def timed(fn, reps, *args):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        out = fn(*args)
+    return (time.perf_counter() - t0) / reps * 1000, out
+
+
+def main(n: int, reps: int) -> None:
+    init_db()
+    with Session(engine) as db:
+        t0 = time.perf_counter()
+        generate_synthetic_profiles(db, n)
+        print(f"{n} profiles seeded in {time.perf_counter() - t0:.1f}s (link tables included)")
+        rnd = random.Random(3)
+        hackathon, skills = rnd.choice(HACKATHONS), rnd.sample(SKILLS, 2)
+        for label, old, new, args in (
+            ("filter", old_filter, new_filter, (db, hackathon, skills)),
+            ("facets", old_facets, new_facets, (db,)),
+        ):
+            t_old, r_old = timed(old, reps, *args)
+            t_new, r_new = timed(new, reps, *args)
+            db.expunge_all()
+            same = r_old == r_new if isinstance(r_old, set) else [c for _, c in r_old] == [c for _, c in r_new]
+            print(f"  {label}: json scan {t_old:8.2f} ms   indexed SQL {t_new:7.2f} ms   x{t_old / t_new:.1f}   same={same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
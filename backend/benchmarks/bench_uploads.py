@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Upload ingestion memory: N concurrent multipart uploads of M MB each against a uvicorn
+server in a child process, reporting the server's resident memory before and at peak.
+
+    python benchmarks/bench_uploads.py          # 50 uploads of 10 MB
+    python benchmarks/bench_uploads.py 50 10
+
+read    the old handler: await file.read(), then size check, hash and write
+stream  POST /uploads: copied to storage in CHUNK_BYTES chunks, hashed as it goes
+
+Each mode gets a fresh server and an empty upload directory, so its peak (VmHWM) is
+its own. The files are distinct, so dedupe stores every one.
+"""
+
+import os
+import sys
+import time
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+_tmp = os.environ.get("HINDER_BENCH_TMP") or tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["HINDER_BENCH_TMP"] = _tmp  # the server child shares the database and uploads
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["VECTOR_BACKEND"] = "numpy"
+os.environ["JOB_WORKERS"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+PORT = 8765
+
+
+def serve(mode: str) -> None:
+    import uvicorn
+    from fastapi import Depends, File, HTTPException, UploadFile
+    from sqlmodel import Session
+    from app.main import app
+    from app.config import ALLOWED_PDF_MB
+    from app.deps import get_db
+    from app.services import upload_store
+
+    @app.post("/uploads-read")
+    async def upload_read(file: UploadFile = File(...), db: Session = Depends(get_db)):
+        content = await file.read()
+        if len(content) > ALLOWED_PDF_MB * 1024 * 1024:
+            raise HTTPException(status_code=400, detail="File too large")
+        sha = hashlib.sha256(content).hexdigest()
+        with open(upload_store.blob_path(sha), "wb") as f:
+            f.write(content)
+        upload = upload_store.add(db, sha, len(content), 1)
+        db.commit()
+        return {"file_id": upload.file_id}
+
+    uvicorn.run(app, host="127.0.0.1", port=PORT, log_level="warning")
+
+
+def memory_kb(pid: int) -> dict:
+    with open(f"/proc/{pid}/status") as f:
+        return {k: int(v.split()[0]) for k, v in (line.split(":", 1) for line in f) if k in ("VmRSS", "VmHWM")}
+
+
+def make_files(n: int, mb: int) -> list:
+    size = mb * 1024 * 1024 - 4096  # under ALLOWED_PDF_MB with room for the multipart framing
+    paths = []
+    for i in range(n):
+        path = os.path.join(_tmp, f"resume_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4\n" + os.urandom(size - 9))
+        paths.append(path)
+    return paths
+
+
+def run(mode: str, paths: list, token: str):
+    import httpx
+    proc = subprocess.Popen([sys.executable, __file__, "serve", mode], env=os.environ.copy())
+    try:
+        url = f"http://127.0.0.1:{PORT}"
+        for _ in range(600):
+            try:
+                httpx.get(f"{url}/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        before = memory_kb(proc.pid)["VmRSS"]
+        route = "/uploads" if mode == "stream" else "/uploads-read"
+
+        def post(path):
+            with open(path, "rb") as f, httpx.Client(timeout=300) as client:
+                r = client.post(url + route, files={"file": (os.path.basename(path), f, "application/pdf")},
+                                headers={"Authorization": f"Bearer {token}"})
+                return r.status_code
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(len(paths)) as ex:
+            codes = list(ex.map(post, paths))
+        elapsed = time.perf_counter() - t0
+        peak = memory_kb(proc.pid)["VmHWM"]
+        return before, peak, elapsed, sum(c == 200 for c in codes)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(n: int, mb: int) -> None:
+    from sqlmodel import Session
+    from app.db.session import engine, init_db
+    from app.db.models import User
+    from app.services.auth import create_token, hash_password
+
+    init_db()
+    with Session(engine) as db:
+        user = User(name="bench", email="bench@example.com", password_hash=hash_password("x"))
+        db.add(user)
+        db.commit()
+        token = create_token(str(user.id))
+    paths = make_files(n, mb)
+    print(f"{n} concurrent uploads of {mb} MB")
+    print(f"{'':>8}  {'rss before':>10}  {'rss peak':>9}  {'growth':>8}  {'MB/s':>6}  {'ok':>4}")
+    for mode in ("read", "stream"):
+        shutil.rmtree(os.environ["UPLOAD_DIR"], ignore_errors=True)
+        os.makedirs(os.environ["UPLOAD_DIR"])
+        before, peak, elapsed, ok = run(mode, paths, token)
+        print(f"{mode:>8}  {before / 1024:8.0f}MB  {peak / 1024:7.0f}MB  {(peak - before) / 1024:6.0f}MB  "
+              f"{n * mb / elapsed:6.0f}  {ok:4d}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "serve":
+        serve(args[1])
+    else:
+        main(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 10)
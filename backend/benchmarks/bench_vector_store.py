@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Vector store backends: query latency and recall@k, NumPy (exact) vs Chroma (HNSW).
+
+    python benchmarks/bench_vector_store.py                 # 20k profiles, 200 queries
+    python benchmarks/bench_vector_store.py 50000 500
+
+Ground truth is a brute-force cosine scan with the same metadata filter. Synthetic
+profiles tie often, so a hit counts if its similarity reaches the true k-th best;
+the NumPy backend should report recall 1.000.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.embeddings import _embed_local_matrix
+from app.services.numpy_store import NumpyVectorStore
+from app.services.chroma_store import ChromaVectorStore
+
+SKILLS = ["python", "typescript", "react", "ros", "rust", "go", "rag", "llm", "prompting", "sql",
+          "docker", "kubernetes", "ar", "vr", "solana", "graphql", "pytorch", "tensorflow"]
+TOPICS = ["agentic ai", "drones", "llm eval", "rag", "web3", "data infra", "ar/vr", "open source", "vc chat"]
+HACKATHONS = ["calhacks12.0", "ethglobal-nyc", "hackmit", "treehacks", "la-hacks"]
+K = 20
+
+
+def make_profiles(n: int, rnd: random.Random):
+    texts, metas = [], []
+    for i in range(n):
+        skills = rnd.sample(SKILLS, 6)
+        topics = rnd.sample(TOPICS, 3)
+        texts.append(f"Seed {i:06x} | Excited about {topics[0]} | {', '.join(skills)} | {', '.join(topics)}")
+        metas.append({"id": f"p_{i}", "skills_norm": skills, "topics": topics,
+                      "available_now": rnd.random() > 0.4, "hackathon": rnd.choice(HACKATHONS)})
+    return texts, metas
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))] * 1000
+
+
+def main(n: int, q: int) -> None:
+    rnd = random.Random(11)
+    texts, metas = make_profiles(n, rnd)
+    vecs = _embed_local_matrix(texts)
+    avail = np.array([m["available_now"] for m in metas])
+    hacks = np.array([m["hackathon"] for m in metas])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = [NumpyVectorStore(os.path.join(tmp, "np"), snapshot_every=0),
+                  ChromaVectorStore(os.path.join(tmp, "chroma"), "bench")]
+        for store in stores:
+            t0 = time.perf_counter()
+            if isinstance(store, ChromaVectorStore):
+                from app.services.vector_store import sanitize_metadata
+                for i in range(0, n, 1000):
+                    store._collection.upsert(ids=[m["id"] for m in metas[i:i + 1000]],
+                                             embeddings=vecs[i:i + 1000],
+                                             metadatas=[sanitize_metadata(m) for m in metas[i:i + 1000]])
+            else:
+                for i, m in enumerate(metas):
+                    store.upsert(m["id"], vecs[i], m)
+            print(f"{store.name:>6}: loaded {n} vectors in {time.perf_counter() - t0:.1f}s")
+
+        queries = []
+        for _ in range(q):
+            qtext = " | ".join(rnd.sample(SKILLS, 4) + rnd.sample(TOPICS, 2))
+            queries.append((_embed_local_matrix([qtext])[0], rnd.choice(HACKATHONS)))
+
+        # exact ground truth with the same filter: similarity of the k-th best match
+        truth = []
+        for qv, hack in queries:
+            rows = np.flatnonzero(avail & (hacks == hack))
+            sims = np.sort(vecs[rows] @ qv)[::-1]
+            truth.append(sims[min(K, len(sims)) - 1] if len(sims) else 1.0)
+
+        for store in stores:
+            lat, recall = [], []
+            for (qv, hack), kth in zip(queries, truth):
+                t0 = time.perf_counter()
+                res = store.query(qv.tolist(), n_results=K, where={"available_now": True, "hackathon": hack})
+                lat.append(time.perf_counter() - t0)
+                got = [int(pid[2:]) for pid in res["ids"][0]]
+                sims = vecs[got] @ qv if got else np.zeros(0)
+                recall.append(float(np.sum(sims >= kth - 1e-5)) / K)
+            print(f"{store.name:>6}: p50 {pct(lat, 0.5):7.2f}ms  p99 {pct(lat, 0.99):7.2f}ms  "
+                  f"recall@{K} {sum(recall) / len(recall):.3f}")
+
+        np_store = stores[0]
+        np_store._dirty = 1
+        np_store.flush()
+        t0 = time.perf_counter()
+        reopened = NumpyVectorStore(os.path.join(tmp, "np"), snapshot_every=0)
+        print(f" numpy: reopened {reopened.count()} vectors from snapshot in {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 20_000, args[1] if len(args) > 1 else 200)
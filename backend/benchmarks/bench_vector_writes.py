@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Index write throughput: one upsert per profile (old indexing paths) vs upsert_many.
+
+    python benchmarks/bench_vector_writes.py            # 5000 profiles
+    python benchmarks/bench_vector_writes.py 20000
+
+Also times seeding end to end: the old per-profile commit/embed/upsert loop vs
+generate_synthetic_profiles(). Everything runs against temp directories.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="hinder-bench-")
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hinder.db")
+os.environ["CHROMA_DIR"] = os.path.join(_tmp, "chroma")
+os.environ["NUMPY_INDEX_DIR"] = os.path.join(_tmp, "np")
+os.environ["EMBED_CACHE_PATH"] = ""
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlmodel import Session
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services import vector_store
+from app.services.chroma_store import ChromaVectorStore
+from app.services.numpy_store import NumpyVectorStore
+from app.services.embeddings import embed, _embed_local_matrix
+from app.services.indexing import profile_metadata, profile_summary
+from app.services.seeding import generate_synthetic_profiles, SKILLS, TOPICS, HACKATHONS
+from app.utils.ids import new_id
+from app.utils.json import list_to_json
+
+
+def make_rows(n: int):
+    rnd = random.Random(3)
+    ids, texts, metas = [], [], []
+    for i in range(n):
+        skills, topics = rnd.sample(SKILLS, 6), rnd.sample(TOPICS, 3)
+        ids.append(f"p_{i}")
+        texts.append(f"Seed {i} | Excited about {topics[0]} | {', '.join(skills)} | {', '.join(topics)}")
+        metas.append({"id": f"p_{i}", "skills_norm": skills, "topics": topics,
+                      "available_now": rnd.random() > 0.4, "hackathon": rnd.choice(HACKATHONS), "school": None})
+    return ids, _embed_local_matrix(texts), metas
+
+
+def bench_store(name, make_store, ids, vecs, metas):
+    store = make_store("single")
+    t0 = time.perf_counter()
+    for pid, v, m in zip(ids, vecs, metas):
+        store.upsert(pid, v.tolist(), m)
+    t_single = time.perf_counter() - t0
+
+    vector_store._store = make_store("bulk")
+    t0 = time.perf_counter()
+    vector_store.upsert_many(ids, vecs, metas)
+    t_bulk = time.perf_counter() - t0
+    n = len(ids)
+    print(f"{name:>6}: upsert x{n} {n / t_single:>9.0f}/s   upsert_many {n / t_bulk:>9.0f}/s   speedup x{t_single / t_bulk:.1f}")
+
+
+def legacy_seed(db: Session, count: int) -> None:
+    # the pre-batch generate_synthetic_profiles loop: two commits, one embed, one upsert per profile
+    for _ in range(count):
+        pid = new_id("p")
+        topics, skills = random.sample(TOPICS, 3), random.sample(SKILLS, 6)
+        prof = Profile(id=pid, name=f"Seed {pid[-4:]}", headline=f"Excited about {topics[0]}",
+                       skills_norm_json=list_to_json(skills), topics_json=list_to_json(topics),
+                       interests_json=list_to_json(topics), available_now=True, status="embedding",
+                       hackathon=random.choice(HACKATHONS))
+        db.add(prof)
+        db.commit()
+        vector_store.upsert(prof.id, embed(profile_summary(prof)), profile_metadata(prof))
+        prof.status = "ready"
+        db.add(prof)
+        db.commit()
+
+
+def bench_seed(n: int) -> None:
+    init_db()
+    for backend in ("numpy", "chroma"):
+        for label, fn in (("legacy loop", legacy_seed), ("batched", generate_synthetic_profiles)):
+            if backend == "numpy":
+                vector_store._store = NumpyVectorStore(os.path.join(_tmp, f"seed-{label}"), snapshot_every=0)
+            else:
+                vector_store._store = ChromaVectorStore(os.path.join(_tmp, f"seed-{label}"), "bench")
+            with Session(engine) as db:
+                t0 = time.perf_counter()
+                fn(db, n)
+                dt = time.perf_counter() - t0
+            print(f"seed {backend:>6} {label:>11}: {n} profiles in {dt:6.2f}s ({n / dt:7.0f}/s)")
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ids, vecs, metas = make_rows(n)
+    bench_store("numpy", lambda tag: NumpyVectorStore(os.path.join(_tmp, f"np-{tag}"), snapshot_every=0), ids, vecs, metas)
+    bench_store("chroma", lambda tag: ChromaVectorStore(os.path.join(_tmp, f"chroma-{tag}"), "bench"), ids, vecs, metas)
+    bench_seed(min(n, 2000))
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Keep test runs away from the developer's ./data and ./chroma_data.
+_tmp = tempfile.mkdtemp(prefix="hinder-tests-")
+os.environ.setdefault("SQLITE_PATH", os.path.join(_tmp, "hinder.db"))
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("CHROMA_DIR", os.path.join(_tmp, "chroma"))
+os.environ.setdefault("EMBED_CACHE_PATH", os.path.join(_tmp, "embed_cache.db"))
+os.environ.setdefault("CONTENT_CACHE_PATH", os.path.join(_tmp, "content_cache.db"))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,88 @@
+import os
+import sys
+import asyncio
+import numpy as np
+from sqlmodel import Session, delete
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services import matching, vector_store
+from app.services.bitmap_index import BitmapIndex
+from app.services.numpy_store import NumpyVectorStore
+
+
+def _meta(pid, skills, topics, hackathon, available):
+    return {"id": pid, "skills_norm": skills, "topics": topics, "hackathon": hackathon, "available_now": available}
+
+
+def _state(index):
+    # ordinals differ between an incrementally updated and a rebuilt index; ids must not
+    return {key: sorted(index._ids_locked(bits)) for key, bits in index._postings.items()}
+
+
+def test_match_follows_writes_and_reuses_ordinals():
+    index = BitmapIndex()
+    index.on_index_write(["a", "b", "c"], [
+        _meta("a", ["rust", "go"], ["rag"], "hackmit", True),
+        _meta("b", '["rust"]', "[]", "hackmit", False),  # JSON strings, as the stores keep them
+        _meta("c", ["python"], ["rag"], "treehacks", True),
+    ])
+    assert index.candidates(10, skills_any=["rust"]) == (2, ["a", "b"])
+    assert index.candidates(10, available_now=True, topics_any=["rag"]) == (2, ["a", "c"])
+    assert index.candidates(10, hackathon="hackmit", skills_any=["go", "python"]) == (1, ["a"])
+    assert index.candidates(10, available_now=True, exclude_id="a") == (1, ["c"])
+    assert index.candidates(1, available_now=True) == (2, None)
+    assert index.candidates(10, hackathon="nowhere") == (0, [])
+    assert index.candidates(10, skills_any=[" Rust "]) == (2, ["a", "b"])  # normalized like any_of()
+
+    index.on_index_write(["a"], None)
+    index.on_index_write(["d"], [_meta("d", ["zig"], [], None, True)])
+    assert index._ord["d"] == 0  # a's ordinal is reused
+    assert index.candidates(10, skills_any=["rust", "go"]) == (1, ["b"])
+    assert index.candidates(10, available_now=True) == (2, ["d", "c"])
+    index.on_index_write(["b"], [_meta("b", ["zig"], [], "hackmit", True)])  # re-upsert replaces keys
+    assert index.candidates(10, skills_any=["rust"]) == (0, [])
+    assert ("skills_norm", "rust") not in index._postings
+    assert index.stats()["profiles"] == 3
+
+
+def test_build_matches_incremental_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    live = BitmapIndex()
+    monkeypatch.setattr(vector_store, "_index_listeners", [live.on_index_write])
+    # indexed but not committed ready yet, as the pipeline leaves a profile mid-run
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        db.commit()
+    rows = [
+        _meta("bm_c", ["go"], [], None, True),
+        _meta("bm_b", ["go"], [], "treehacks", False),
+        _meta("bm_a", ["rust"], ["rag"], "hackmit", True),
+    ]
+    vector_store.upsert_many([m["id"] for m in rows], [[1.0, 0.0]] * 3, rows)
+    vector_store.delete("bm_c")
+    built = BitmapIndex()
+    assert built.build() == 2 and built.ready
+    assert _state(live) == _state(built)
+
+
+def test_retrieve_candidates_exact_path_matches_filtered_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    vector_store._stored_vectors.clear()
+    index = BitmapIndex()
+    index.ready = True
+    monkeypatch.setattr(vector_store, "_index_listeners", [index.on_index_write])
+    monkeypatch.setattr(matching, "bitmap_index", index)
+    rnd = np.random.default_rng(3)
+    ids = [f"r{i}" for i in range(60)]
+    vector_store.upsert_many(ids, rnd.normal(size=(60, 8)).tolist(),
+                             [_meta(pid, [], [], f"h{i % 3}", i % 4 > 0) for i, pid in enumerate(ids)])
+    user = {"id": "r5", "skills_norm": [], "topics": []}
+    for hackathon in (None, "h2"):
+        monkeypatch.setattr(matching, "BITMAP_EXACT_MAX", 0)
+        want = asyncio.run(matching.retrieve_candidates(user, k=7, exclude_id="r5", hackathon=hackathon))
+        monkeypatch.setattr(matching, "BITMAP_EXACT_MAX", 1000)
+        got = asyncio.run(matching.retrieve_candidates(user, k=7, exclude_id="r5", hackathon=hackathon))
+        assert got[0] == want[0] and "r5" not in got[0]
+        assert np.allclose(got[2], want[2], atol=1e-6)
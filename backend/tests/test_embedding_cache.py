@@ -0,0 +1,55 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embeddings import _embed_local
+
+
+def test_lru_then_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path, max_bytes=1 << 20, lru_size=8)
+    vec = _embed_local("python | rust")
+    assert cache.get("local", "m", "python | rust") is None
+    cache.put("local", "m", "python | rust", vec, cost_ms=2.0)
+    assert cache.get("local", "m", "python | rust") == vec
+
+    # a fresh process only has the SQLite tier
+    reopened = EmbeddingCache(path, max_bytes=1 << 20, lru_size=8)
+    assert reopened.get("local", "m", "python | rust") == vec
+    stats = reopened.stats()
+    assert stats["hitsDisk"] == 1 and stats["misses"] == 0
+    assert stats["savedMs"] == 2.0
+
+
+def test_key_includes_provider_and_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), max_bytes=1 << 20, lru_size=8)
+    cache.put("gemini", "text-embedding-004", "hello", [0.1, 0.2])
+    assert cache.get("gemini", "text-embedding-004", "hello") == [0.1, 0.2]
+    assert cache.get("gemini", "other-model", "hello") is None
+    assert cache.get("local", "text-embedding-004", "hello") is None
+    assert cache.stats()["providerCallsSaved"] == 1
+
+
+
+def test_mutating_a_returned_vector_leaves_the_cache_intact(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path, max_bytes=1 << 20, lru_size=8)
+    vec = [0.5, 0.25]
+    cache.put("local", "m", "a", vec)
+    vec[0] = 9.0
+    cache.get("local", "m", "a")[1] = 9.0
+    assert cache.get("local", "m", "a") == [0.5, 0.25]
+
+    reopened = EmbeddingCache(path, max_bytes=1 << 20, lru_size=8)
+    reopened.get("local", "m", "a")[0] = 9.0  # the disk hit also fills the LRU
+    assert reopened.get("local", "m", "a") == [0.5, 0.25]
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    vec = _embed_local("x")  # 768 float32 -> 3072 bytes
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), max_bytes=10 * 3072, lru_size=0)
+    for i in range(30):
+        cache.put("local", "m", f"text {i}", vec)
+    info = cache.stats()["disk"]
+    assert info["bytes"] <= 10 * 3072
+    assert cache.get("local", "m", "text 29") == vec
+    assert cache.get("local", "m", "text 0") is None
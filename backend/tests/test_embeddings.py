@@ -0,0 +1,56 @@
+import os
+import sys
+import hashlib
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services import embeddings
+from app.services.embeddings import DIM, embed_batch, _embed_local, _embed_local_matrix
+
+
+def _reference_embed(text: str):
+    """The original per-token md5 loop; stored vectors were produced with it."""
+    vec = np.zeros(DIM, dtype=np.float32)
+    toks = [t.lower() for t in text.strip().split() if t.strip()][:4000]
+    for t in toks:
+        h = int(hashlib.md5(t.encode()).hexdigest(), 16) % DIM
+        vec[h] += 1.0
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec.tolist()
+
+
+TEXTS = [
+    "Seed a1b2 | Excited about RAG | Python, Rust, PyTorch | RAG, Web3, AR/VR",
+    "",
+    "   ",
+    "repeat " * 5000,
+    "Ünïcode naïve café | 東京 | emoji 🚀🚀",
+    "MiXeD CaSe mixed case MIXED",
+]
+
+
+def test_single_matches_reference():
+    for t in TEXTS:
+        assert _embed_local(t) == _reference_embed(t)
+
+
+def test_batch_matches_reference_bit_for_bit():
+    got = _embed_local_matrix(TEXTS)
+    want = np.asarray([_reference_embed(t) for t in TEXTS], dtype=np.float32)
+    assert got.shape == (len(TEXTS), DIM)
+    assert got.dtype == np.float32
+    assert got.tobytes() == want.tobytes()
+
+
+def test_batch_spans_chunks(monkeypatch):
+    monkeypatch.setattr(embeddings, "BATCH_ROWS", 2)
+    assert _embed_local_matrix(TEXTS).tolist() == [_reference_embed(t) for t in TEXTS]
+
+
+def test_embed_batch_matches_embed():
+    assert embed_batch(TEXTS).tolist() == [embeddings.embed(t) for t in TEXTS]
+
+
+def test_empty_batch():
+    assert embed_batch([]).shape == (0, DIM)
@@ -0,0 +1,80 @@
+import os
+import sys
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.main import app
+from app.db import facets
+from app.db.session import engine, init_db
+from app.db.models import FacetCount, Profile, User
+from app.services import jobs
+from app.services.auth import create_token, hash_password
+
+
+def _state(db):
+    return sorted((r.hackathon, r.available_now, r.field, r.value, r.n) for r in db.exec(FacetCount.__table__.select()))
+
+
+def _assert_matches_rebuild():
+    # the incrementally maintained counters must equal a recount from scratch
+    with Session(engine) as db:
+        live = _state(db)
+        facets.rebuild(db)
+        assert _state(db) == live
+
+
+def test_counters_follow_profile_writes(monkeypatch):
+    monkeypatch.setattr(jobs.job_pool, "workers", 0)  # reembed only queues the pipeline
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        db.exec(delete(FacetCount))
+        owner = User(name="f", email="facets@example.com", password_hash=hash_password("x"))
+        db.add(owner)
+        db.commit()
+        rows = [
+            Profile(id="f_a", user_id=owner.id, hackathon="hackmit", available_now=True, status="ready",
+                    skills_norm_json='["rust", "go"]', topics_json='["rag"]', school="MIT"),
+            Profile(id="f_b", user_id=owner.id, hackathon="hackmit", available_now=False, status="ready",
+                    skills_norm_json='["rust"]'),
+            Profile(id="f_c", user_id=owner.id, hackathon="treehacks", available_now=True, status="pending",
+                    skills_norm_json='["rust"]'),
+        ]
+        db.add_all(rows)
+        db.commit()
+        facets.rebuild(db)
+        auth = {"Authorization": f"Bearer {create_token(str(owner.id))}"}
+
+    with TestClient(app) as client:
+        r = client.get("/facets", params={"hackathon": "hackmit", "available_now": True}, headers=auth).json()
+        assert r["total"] == 1
+        assert r["facets"]["skills"] == [{"value": "go", "count": 1}, {"value": "rust", "count": 1}]
+        r = client.get("/facets", params={"fields": "skills"}, headers=auth).json()
+        assert r["total"] == 2 and r["facets"] == {"skills": [{"value": "rust", "count": 2}, {"value": "go", "count": 1}]}
+        assert client.get("/facets", params={"fields": "nope"}, headers=auth).status_code == 400
+
+        client.patch("/profiles/f_b", json={"available_now": True, "skills_norm": ["zig"], "hackathon": "treehacks"}, headers=auth)
+        r = client.get("/facets", params={"hackathon": "treehacks", "available_now": True}, headers=auth).json()
+        assert r["total"] == 1 and r["facets"]["skills"] == [{"value": "zig", "count": 1}]
+        _assert_matches_rebuild()
+
+        client.post("/profiles/f_a/reembed", headers=auth)  # back to pending: no longer counted
+        _assert_matches_rebuild()
+        client.delete("/profiles/f_b", headers=auth)
+        _assert_matches_rebuild()
+        assert client.get("/facets", headers=auth).json()["total"] == 0
+
+
+def test_values_are_counted_normalized():
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        db.add_all([
+            Profile(id="fn_a", status="ready", skills_norm_json='["Rust", " go "]', topics_json='["RAG"]'),
+            Profile(id="fn_b", status="ready", skills_norm_json='["rust"]', topics_json='["rag"]'),
+        ])
+        db.commit()
+        facets.rebuild(db)
+        total, out = facets.counts(db, fields=("skills", "topics"))
+    assert total == 2
+    assert out == {"skills": [("rust", 2), ("go", 1)], "topics": [("rag", 2)]}
@@ -0,0 +1,80 @@
+import os
+import sys
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.main import app
+from app.db import fts
+from app.db.session import engine, init_db
+from app.db.models import Profile
+from app.services import vector_store
+from app.services.auth import create_token
+from app.services.embeddings import embed
+from app.services.indexing import profile_metadata, profile_summary
+from app.services.numpy_store import NumpyVectorStore
+
+
+def _reset(db):
+    db.exec(delete(Profile))
+    fts.rebuild(db)
+
+
+def test_keyword_index_follows_writes():
+    init_db()
+    with Session(engine) as db:
+        _reset(db)
+        a = Profile(id="fts_a", name="Ada", company="Solana Labs", skills_norm_json='["rust"]', status="ready")
+        b = Profile(id="fts_b", name="Bo", headline="rust and solana", status="ready")
+        db.add_all([a, b])
+        fts.upsert(db, [a, b])
+        db.commit()
+        assert set(fts.search(db, "solana")) == {"fts_a", "fts_b"}
+        assert fts.search(db, "solana rust", limit=1) == ["fts_a"]  # company + skill beat headline
+        assert fts.search(db, '"") OR *') == []  # punctuation is never query syntax
+
+        a.company = "Acme"
+        fts.upsert(db, [a])
+        fts.delete(db, ["fts_b"])
+        db.delete(b)
+        db.commit()
+        assert fts.search(db, "solana") == []
+        assert fts.search(db, "acme") == ["fts_a"]
+
+        # rebuild only keeps ready profiles
+        db.add(Profile(id="fts_c", name="Acme Pending", status="pending"))
+        db.commit()
+        assert fts.rebuild(db) == 1
+        assert fts.search(db, "acme") == ["fts_a"]
+
+
+def test_search_modes(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    vector_store._stored_vectors.clear()
+    init_db()
+    with Session(engine) as db:
+        _reset(db)
+        profiles = [
+            Profile(id=f"fts_{i}", name=f"P{i}", headline="builder", available_now=i % 2 == 0, status="ready",
+                    skills_norm_json='["python"]', company="Zeta Corp" if i in (3, 4) else None)
+            for i in range(10)
+        ]
+        db.add_all(profiles)
+        fts.upsert(db, profiles)
+        db.commit()
+        for p in profiles:
+            vector_store.upsert(p.id, embed(profile_summary(p)), profile_metadata(p))
+
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    with TestClient(app) as client:
+        r = client.get("/search", params={"q": "zeta", "mode": "keyword"}, headers=auth).json()
+        assert r["total"] == 2 and {i["id"] for i in r["items"]} == {"fts_3", "fts_4"}
+        # filters still run in the vector index
+        r = client.get("/search", params={"q": "zeta", "mode": "keyword", "available_now": True}, headers=auth).json()
+        assert [i["id"] for i in r["items"]] == ["fts_4"]
+
+        r = client.get("/search", params={"q": "zeta", "mode": "hybrid", "page_size": 4}, headers=auth).json()
+        assert r["mode"] == "hybrid" and r["total"] == 10
+        assert {"fts_3", "fts_4"} <= {i["id"] for i in r["items"]}
+
+        assert client.get("/search", params={"mode": "keyword"}, headers=auth).status_code == 400
+        assert client.get("/search", params={"mode": "hybrid"}, headers=auth).json()["mode"] == "vector"
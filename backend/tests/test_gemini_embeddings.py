@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.gemini_embeddings import GeminiEmbedder
+
+
+class _StubGemini(BaseHTTPRequestHandler):
+    """Minimal batchEmbedContents: each text embeds to [len(text), 1.0]."""
+
+    calls = []
+    in_flight = 0
+    max_in_flight = 0
+    delay = 0.0
+    fail = False
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.calls.append((self.path, len(body["requests"])))
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+        if cls.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        texts = [r["content"]["parts"][0]["text"] for r in body["requests"]]
+        out = json.dumps({"embeddings": [{"values": [float(len(t)), 1.0]} for t in texts]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    _StubGemini.calls = []
+    _StubGemini.in_flight = 0
+    _StubGemini.max_in_flight = 0
+    _StubGemini.delay = 0.0
+    _StubGemini.fail = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGemini)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield _StubGemini, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _embedder(url, **kw):
+    return GeminiEmbedder(api_key="test", model="text-embedding-004", base_url=url, **kw)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_embeds_share_one_request(stub):
+    handler, url = stub
+    emb = _embedder(url, window_ms=20)
+    texts = ["x" * i for i in range(1, 41)]
+    vecs = await asyncio.gather(*(emb.embed(t) for t in texts))
+    await emb.aclose()
+    assert vecs == [[float(i), 1.0] for i in range(1, 41)]
+    assert handler.calls == [("/v1beta/models/text-embedding-004:batchEmbedContents?key=test", 40)]
+
+
+@pytest.mark.asyncio
+async def test_embed_many_chunks_and_limits_in_flight(stub):
+    handler, url = stub
+    handler.delay = 0.05
+    emb = _embedder(url, max_in_flight=2)
+    vecs = await emb.embed_many(["a"] * 450)
+    await emb.aclose()
+    assert len(vecs) == 450 and all(v == [1.0, 1.0] for v in vecs)
+    assert sorted(n for _, n in handler.calls) == [50, 100, 100, 100, 100]
+    assert handler.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_yields_none(stub):
+    handler, url = stub
+    handler.fail = True
+    emb = _embedder(url)
+    assert await emb.embed("hello") is None
+    assert emb.embed_many_blocking(["a", "b"]) == [None, None]
+    await emb.aclose()
+
+
+def test_blocking_path_reuses_client(stub):
+    handler, url = stub
+    emb = _embedder(url)
+    assert emb.embed_many_blocking(["ab", "abc"]) == [[2.0, 1.0], [3.0, 1.0]]
+    assert emb.embed_many_blocking(["a"]) == [[1.0, 1.0]]
+    assert len(handler.calls) == 2
+
+
+def test_loop_change_closes_the_old_client(stub):
+    handler, url = stub
+    emb = _embedder(url)
+    assert asyncio.run(emb.embed("a")) == [1.0, 1.0]
+    first = emb._aclient
+
+    async def again():
+        vec = await emb.embed("bb")
+        await asyncio.sleep(0)  # let the stale client's close run
+        return vec
+
+    assert asyncio.run(again()) == [2.0, 1.0]
+    assert emb._aclient is not first and first.is_closed
+    asyncio.run(emb.aclose())
@@ -0,0 +1,221 @@
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlmodel import Session, delete, select
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db.session import engine, init_db
+from app.db.models import Job, Profile
+from app.services import jobs, pipeline
+
+
+def _reset() -> None:
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Job))
+        db.commit()
+
+
+def _jobs() -> list:
+    with Session(engine) as db:
+        return list(db.exec(select(Job).order_by(Job.id)).all())
+
+
+async def _drain(pool: jobs.WorkerPool, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while pool.busy or any(j.state in (jobs.QUEUED, jobs.RUNNING) for j in _jobs()):
+        assert asyncio.get_running_loop().time() < deadline, _jobs()
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_by_priority_once_per_profile():
+    _reset()
+    with Session(engine) as db:
+        jobs.enqueue(db, "job_low")
+        jobs.enqueue(db, "job_high", priority=5)
+        db.commit()
+        jobs.enqueue(db, "job_low", priority=1)  # still queued: the same job, bumped
+        db.commit()
+    assert [(j.profile_id, j.priority) for j in _jobs()] == [("job_low", 1), ("job_high", 5)]
+
+    seen = []
+
+    async def handler(profile_id, stages, final):
+        seen.append(profile_id)
+
+    pool = jobs.WorkerPool(workers=1, handler=handler, poll_s=0.01)
+    await pool.start()
+    try:
+        await _drain(pool)
+    finally:
+        await pool.stop()
+    assert seen == ["job_high", "job_low"]
+    assert [(j.state, j.attempts, j.lease_owner) for j in _jobs()] == [(jobs.DONE, 1, None)] * 2
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_back_off_then_fail():
+    _reset()
+    with Session(engine) as db:
+        jobs.enqueue(db, "job_flaky")
+        jobs.enqueue(db, "job_broken")
+        db.commit()
+
+    calls = {"job_flaky": [], "job_broken": []}
+
+    async def handler(profile_id, stages, final):
+        calls[profile_id].append(final)
+        if profile_id == "job_broken" or len(calls[profile_id]) == 1:
+            raise RuntimeError("provider down")
+
+    pool = jobs.WorkerPool(workers=2, handler=handler, poll_s=0.01, backoff_s=0.05)
+    for j in _jobs():
+        assert j.max_attempts == 3
+    await pool.start()
+    try:
+        await _drain(pool)
+    finally:
+        await pool.stop()
+    flaky, broken = _jobs()
+    assert (flaky.state, flaky.attempts, calls["job_flaky"]) == (jobs.DONE, 2, [False, False])
+    assert (broken.state, broken.attempts, calls["job_broken"]) == (jobs.FAILED, 3, [False, False, True])
+    assert broken.last_error == "RuntimeError: provider down"
+    assert (pool.completed, pool.retried, pool.failed) == (1, 3, 1)
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_recovered():
+    _reset()
+    now = datetime.utcnow()
+    with Session(engine) as db:
+        db.add(Profile(id="job_orphan_2", status="parsing"))
+        db.commit()
+        # claimed by a process that died mid-run: lease lapsed, one attempt left / none left
+        db.add(Job(profile_id="job_orphan_1", state=jobs.RUNNING, attempts=1, max_attempts=3,
+                   lease_owner="dead:1", lease_expires_at=now - timedelta(seconds=1)))
+        db.add(Job(profile_id="job_orphan_2", state=jobs.RUNNING, attempts=3, max_attempts=3,
+                   lease_owner="dead:1", lease_expires_at=now - timedelta(seconds=1)))
+        db.add(Job(profile_id="job_alive", state=jobs.RUNNING, attempts=1, max_attempts=3,
+                   lease_owner="other:2", lease_expires_at=now + timedelta(minutes=5)))
+        db.commit()
+
+    seen = []
+
+    async def handler(profile_id, stages, final):
+        seen.append(profile_id)
+
+    pool = jobs.WorkerPool(workers=2, handler=handler, poll_s=0.01)
+    await pool.start()
+    try:
+        for _ in range(100):
+            if seen:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await pool.stop()
+    assert seen == ["job_orphan_1"] and pool.recovered == 2
+    states = {j.profile_id: (j.state, j.attempts) for j in _jobs()}
+    assert states == {"job_orphan_1": (jobs.DONE, 2), "job_orphan_2": (jobs.FAILED, 3), "job_alive": (jobs.RUNNING, 1)}
+    with Session(engine) as db:
+        assert db.get(Profile, "job_orphan_2").status == "error"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stages_are_capped(monkeypatch):
+    _reset()
+    ids = [f"job_stage_{i}" for i in range(6)]
+    with Session(engine) as db:
+        for pid in ids:
+            db.merge(Profile(id=pid, name=pid, status="pending"))
+            jobs.enqueue(db, pid)
+        db.commit()
+
+    in_flight, peak = 0, 0
+
+    async def slow_llm(text):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {"skills": {"tech": ["go"]}}
+
+    monkeypatch.setattr(pipeline, "parse_extract", slow_llm)
+    pool = jobs.WorkerPool(workers=6, llm=2, poll_s=0.01)
+    await pool.start()
+    try:
+        await _drain(pool)
+    finally:
+        await pool.stop()
+    assert peak == 2 and pool.completed == 6
+    with Session(engine) as db:
+        assert {db.get(Profile, pid).status for pid in ids} == {"ready"}
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_failed_outcome_write(monkeypatch):
+    _reset()
+    with Session(engine) as db:
+        jobs.enqueue(db, "job_unlucky", priority=1)
+        jobs.enqueue(db, "job_next")
+        db.commit()
+
+    complete, broken = jobs.complete, [True]
+
+    def flaky_complete(job_id, owner):
+        if broken:
+            broken.pop()
+            raise RuntimeError("database is locked")
+        return complete(job_id, owner)
+
+    monkeypatch.setattr(jobs, "complete", flaky_complete)
+    seen = []
+
+    async def handler(profile_id, stages, final):
+        seen.append(profile_id)
+
+    pool = jobs.WorkerPool(workers=1, handler=handler, poll_s=0.01, lease_s=0.3)
+    await pool.start()
+    try:
+        await _drain(pool)
+    finally:
+        await pool.stop()
+    # the one worker went on to the next job; the sweep requeued the unrecorded one
+    assert seen == ["job_unlucky", "job_next", "job_unlucky"]
+    assert [(j.profile_id, j.state) for j in _jobs()] == [("job_unlucky", jobs.DONE), ("job_next", jobs.DONE)]
+
+
+@pytest.mark.asyncio
+async def test_run_is_cancelled_when_its_lease_is_lost():
+    _reset()
+    with Session(engine) as db:
+        jobs.enqueue(db, "job_stolen")
+        db.commit()
+
+    started, finished = asyncio.Event(), []
+
+    async def handler(profile_id, stages, final):
+        started.set()
+        await asyncio.sleep(5)
+        finished.append(profile_id)
+
+    pool = jobs.WorkerPool(workers=1, handler=handler, poll_s=0.01, lease_s=0.3)
+    await pool.start()
+    try:
+        await asyncio.wait_for(started.wait(), 5)
+        # the lease lapsed while the worker stalled and another process took the job over
+        with Session(engine) as db:
+            job = db.exec(select(Job)).one()
+            job.lease_owner = "other:2"
+            db.add(job)
+            db.commit()
+        for _ in range(100):
+            if pool.lost:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await pool.stop()
+    assert pool.lost == 1 and not finished and pool.busy == 0
+    assert [(j.state, j.lease_owner) for j in _jobs()] == [(jobs.RUNNING, "other:2")]
@@ -0,0 +1,45 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services import match_cache as mc
+from app.services.match_cache import MatchCache
+
+
+def _put(c, user, hackathon, value="v"):
+    key = (user, 20, None, hackathon)
+    c.put(key, {"matches": value}, c.token(hackathon))
+    return key
+
+
+def test_generations_invalidate_only_affected_entries():
+    c = MatchCache(1 << 20, ttl_s=60)
+    a_h1, a_any, b_h2 = _put(c, "a", "h1"), _put(c, "a", None), _put(c, "b", "h2")
+    assert c.get(a_h1) == {"matches": "v"}
+
+    c.profiles_written(["x"], {"h2"})  # a write in h2: h1 results stay, unfiltered ones go
+    assert c.get(a_h1) is not None and c.get(a_any) is None and c.get(b_h2) is None
+
+    b_h2 = _put(c, "b", "h2")
+    c.profiles_written(["b"], {"h1"})  # b itself changed: all of b's entries go
+    assert c.get(b_h2) is None and c.get(a_h1) is None
+
+    a_h1 = _put(c, "a", "h1")
+    c.profiles_written(["y"], None)  # unattributed write (delete) invalidates everything
+    assert c.get(a_h1) is None
+    s = c.stats()
+    assert s["hits"] == 2 and s["stale"] == 4 and s["entries"] == 0 and s["bytes"] == 0
+
+
+def test_ttl_and_memory_bound(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mc.time, "monotonic", lambda: now[0])
+    c = MatchCache(200, ttl_s=5)
+    k1 = _put(c, "a", None, "x" * 60)
+    now[0] += 6
+    assert c.get(k1) is None and c.stats()["expired"] == 1
+
+    keys = [_put(c, f"u{i}", None, "x" * 60) for i in range(3)]
+    assert c.stats()["evictions"] == 1 and c.stats()["bytes"] <= 200
+    assert c.get(keys[0]) is None and c.get(keys[2]) is not None
+    _put(c, "big", None, "x" * 500)  # larger than the whole budget: not cached
+    assert c.stats()["entries"] == 2
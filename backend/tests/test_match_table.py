@@ -0,0 +1,112 @@
+import os
+import sys
+import asyncio
+import numpy as np
+from sqlmodel import Session, delete, select
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db.session import engine, init_db
+from app.db.models import Profile, MatchCandidate, MatchCandidateSet
+from app.db.repository import ProfileRepository
+from app.services import match_table, matching, vector_store
+from app.services.indexing import profile_metadata
+from app.services.numpy_store import NumpyVectorStore
+
+K = 5
+
+
+def _live(db, user_id):
+    user = ProfileRepository(db).get(user_id)
+    u = {"id": user.id, "skills_norm": user.skills_norm, "topics": user.topics}
+    ids, metas, dists = asyncio.run(matching.retrieve_candidates(u, k=K, exclude_id=user_id))
+    return ids, matching.blend_scores(u, metas, dists)
+
+
+def _index(db, p, vec):
+    db.add(p)
+    db.commit()
+    vector_store.upsert(p.id, vec, profile_metadata(p))
+
+
+def test_lists_track_live_scoring(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    monkeypatch.setattr(match_table, "MATCH_TABLE_K", K)
+    vector_store._stored_vectors.clear()
+    init_db()
+    rnd = np.random.default_rng(4)
+    with Session(engine) as db:
+        db.exec(delete(MatchCandidate))
+        db.exec(delete(MatchCandidateSet))
+        db.exec(delete(Profile))
+        for i in range(30):
+            _index(db, Profile(id=f"mt_{i}", available_now=True, status="ready",
+                               skills_norm_json=f'["s{i % 4}"]'), rnd.normal(size=8).tolist())
+        users = [f"mt_{i}" for i in range(30)]
+        for u in users:
+            ids, (sv, sk, sb) = _live(db, u)
+            match_table.store(db, u, None, ids, sv, sk, sb, requested=K)
+
+        assert match_table.lookup(db, "mt_0", K + 1) is None
+        rows, _ = match_table.lookup(db, "mt_0", K)
+        assert [r.candidate_id for r in rows] == _live(db, "mt_0")[0]
+
+        # a new profile right next to mt_0 must enter mt_0's list, and every list stays exact
+        near = (np.asarray(vector_store.stored_embedding("mt_0")) + 0.01).tolist()
+        _index(db, Profile(id="mt_new", available_now=True, status="ready", skills_norm_json='["s0"]'), near)
+        assert match_table.profile_changed(db, "mt_new") > 0
+        for u in users[1:]:
+            s = db.get(MatchCandidateSet, (u, ""))
+            rows, _ = match_table.lookup(db, u, s.size)
+            live_ids, (sv, sk, sb) = _live(db, u)
+            assert [r.candidate_id for r in rows] == live_ids[:s.size]
+            assert np.allclose([r.score_blended for r in rows], sb[:s.size])
+        assert match_table.lookup(db, "mt_0", 1)[0][0].candidate_id == "mt_new"
+
+        # an available_now toggle only drops rows; what remains is still the exact top
+        holders = {r.user_id for r in db.exec(select(MatchCandidate).where(MatchCandidate.candidate_id == "mt_new"))}
+        p = db.get(Profile, "mt_new")
+        p.available_now = False
+        db.add(p)
+        db.commit()
+        vector_store.upsert("mt_new", near, profile_metadata(p))
+        assert match_table.candidate_unavailable(db, "mt_new") == len(holders)
+        for u in holders:
+            s = db.get(MatchCandidateSet, (u, ""))
+            rows, _ = match_table.lookup(db, u, s.size)
+            assert [r.candidate_id for r in rows] == _live(db, u)[0][:s.size]
+            assert match_table.lookup(db, u, K) is None
+
+        match_table.forget_profile(db, "mt_0")
+        assert match_table.lookup(db, "mt_0", 1) is None
+
+
+def test_lists_outside_the_neighbourhood_stay_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    monkeypatch.setattr(match_table, "MATCH_TABLE_K", K)
+    monkeypatch.setattr(match_table, "MATCH_TABLE_NEIGHBORS", 3)
+    vector_store._stored_vectors.clear()
+    init_db()
+    rnd = np.random.default_rng(9)
+    with Session(engine) as db:
+        db.exec(delete(MatchCandidate))
+        db.exec(delete(MatchCandidateSet))
+        db.exec(delete(Profile))
+        for i in range(30):
+            _index(db, Profile(id=f"mn_{i}", available_now=True, status="ready",
+                               skills_norm_json=f'["s{i % 4}"]'), rnd.normal(size=8).tolist())
+        users = [f"mn_{i}" for i in range(30)]
+        for u in users:
+            ids, (sv, sk, sb) = _live(db, u)
+            match_table.store(db, u, None, ids, sv, sk, sb, requested=K)
+
+        # a profile close to many users at once, far more than its 3 re-scored neighbours
+        hub = np.mean([vector_store.stored_embedding(u) for u in users], axis=0).tolist()
+        _index(db, Profile(id="mn_hub", available_now=True, status="ready", skills_norm_json='["s1"]'), hub)
+        match_table.profile_changed(db, "mn_hub")
+        entered = 0
+        for u in users:
+            s = db.get(MatchCandidateSet, (u, ""))
+            rows, _ = match_table.lookup(db, u, s.size)
+            live_ids = _live(db, u)[0]
+            assert [r.candidate_id for r in rows] == live_ids[:s.size]
+            entered += "mn_hub" in live_ids
+        assert entered > 3
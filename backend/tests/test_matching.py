@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import asyncio
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services import matching, vector_store
+from app.services.numpy_store import NumpyVectorStore
+
+
+def _unit(i):
+    v = np.zeros(8, dtype=np.float32)
+    v[i] = 1.0
+    return v.tolist()
+
+
+def test_query_vector_reuses_stored_embedding(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    vector_store._stored_vectors.clear()
+    embedded = []
+
+    async def fake_aembed(text):
+        embedded.append(text)
+        return _unit(1)
+
+    monkeypatch.setattr(matching, "aembed", fake_aembed)
+    user = {"id": "u1", "name": "Ada", "skills_norm": ["rust"], "topics": []}
+
+    # not indexed yet: falls back to embedding the summary
+    asyncio.run(matching.query_vector(user))
+    assert embedded == ["Ada | rust"]
+
+    vector_store.upsert("u1", _unit(0), {"id": "u1"})
+    assert asyncio.run(matching.query_vector(user)) == _unit(0)
+    assert len(embedded) == 1
+
+    # a topic embeds only the topic and steers the stored vector towards it
+    q = asyncio.run(matching.query_vector(user, topic="drones"))
+    assert embedded[-1] == "drones"
+    assert np.allclose(q, np.array([1, 0.5, 0, 0, 0, 0, 0, 0]) / np.sqrt(1.25))
+
+    # re-indexing the profile invalidates the cached vector
+    vector_store.upsert("u1", _unit(2), {"id": "u1"})
+    assert asyncio.run(matching.query_vector(user)) == _unit(2)
+    vector_store.delete("u1")
+    assert vector_store.stored_embedding("u1") is None
+
+
+def test_blend_scores_matches_set_jaccard_for_json_metadata():
+    user = {"skills_norm": ["rust", "go", "rag"], "topics": ["rag", "drones"]}
+    cands = [(["rust"], ["drones"]), ([], []), (["python", "go", "rag", "sql"], ["web3"]), (["rag"], ["rag"])]
+    metas = [{"skills_norm": json.dumps(s), "topics": json.dumps(t)} for s, t in cands]
+    metas.append({"skills_norm": ["go"]})  # plain lists and missing fields still work
+    sv, sk, sb = matching.blend_scores(user, metas, [0.2, 0.4, 0.6, 0.0, 1.0])
+    expected = [matching.jaccard(user["skills_norm"] + user["topics"], s + t) for s, t in cands + [(["go"], [])]]
+    assert np.allclose(sk, expected)
+    assert np.allclose(sv, [0.8, 0.6, 0.4, 1.0, 0.0])
+    assert np.allclose(sb, [0.75 * v + 0.25 * k for v, k in zip(sv, sk)])
+    assert matching.blend_scores(user, [], None) == ([], [], [])
+    assert matching.blend_scores({}, [{}], None) == ([0.5], [0.0], [0.375])
+
+
+def test_match_many_matches_per_user_matching(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    vector_store._stored_vectors.clear()
+    rnd = np.random.default_rng(7)
+    users = []
+    for i in range(25):
+        skills, topics = [f"s{i % 5}", f"s{i % 3}"], [f"t{i % 4}"]
+        meta = {"id": f"m{i}", "skills_norm": skills, "topics": topics, "available_now": i % 4 > 0, "hackathon": f"h{i % 2}"}
+        vector_store.upsert(f"m{i}", rnd.normal(size=8).tolist(), meta)
+        users.append({"id": f"m{i}", "skills_norm": skills, "topics": topics})
+    for hackathon in (None, "h1"):
+        batch = asyncio.run(matching.match_many(users, k=6, hackathon=hackathon))
+        for u, (ids, metas, sv, sk, sb) in zip(users, batch):
+            one_ids, one_metas, dists = asyncio.run(matching.retrieve_candidates(u, k=6, exclude_id=u["id"], hackathon=hackathon))
+            assert ids == one_ids and u["id"] not in ids
+            assert np.allclose(sb, matching.blend_scores(u, one_metas, dists)[2])
@@ -0,0 +1,52 @@
+import os
+import sys
+from sqlalchemy import create_engine, text
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db import migrations, tuning
+from app.db.session import engine, init_db
+
+
+def _indexes(conn, table):
+    return {row[1] for row in conn.execute(text(f"PRAGMA index_list('{table}')"))}
+
+
+def test_migrate_brings_an_old_database_forward(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        # the tables as the first release created them: no contact info, no indexes
+        conn.execute(text("CREATE TABLE profile (id VARCHAR PRIMARY KEY, user_id INTEGER, status VARCHAR, "
+                          "hackathon VARCHAR, available_now BOOLEAN)"))
+        conn.execute(text("CREATE TABLE matchlog (id INTEGER PRIMARY KEY, user_id VARCHAR, candidate_id VARCHAR)"))
+        conn.execute(text("INSERT INTO profile (id, status) VALUES ('m1', 'ready')"))
+        conn.execute(text("CREATE TABLE upload (file_id VARCHAR PRIMARY KEY, user_id INTEGER, path VARCHAR, "
+                          "mime VARCHAR, size INTEGER)"))
+
+    assert migrations.migrate(old) == len(migrations.MIGRATIONS)
+    with old.connect() as conn:
+        assert migrations.version(conn) == len(migrations.MIGRATIONS)
+        assert conn.execute(text("SELECT contact_info_json FROM profile")).scalar() == "{}"
+        assert {"ix_profile_user_id", "ix_profile_status", "ix_profile_hackathon_available"} <= _indexes(conn, "profile")
+        assert {"ix_matchlog_user_id", "ix_matchlog_candidate_id"} <= _indexes(conn, "matchlog")
+        plan = " ".join(str(r) for r in conn.execute(text("EXPLAIN QUERY PLAN SELECT id FROM matchlog WHERE user_id = 'x'")))
+        assert "ix_matchlog_user_id" in plan
+        assert "sha256" in {row[1] for row in conn.execute(text("PRAGMA table_info('upload')"))}
+        assert "ix_upload_sha256" in _indexes(conn, "upload")
+
+    # up to date: nothing re-runs
+    ran = []
+    migrations.MIGRATIONS.append(lambda conn: ran.append(1))
+    try:
+        migrations.migrate(old)
+        migrations.migrate(old)
+    finally:
+        migrations.MIGRATIONS.pop()
+    assert ran == [1]
+
+
+def test_engine_connections_are_tuned():
+    init_db()
+    with engine.connect() as conn:
+        settings = tuning.settings(conn)
+        assert settings["journal_mode"] == "wal" and settings["synchronous"] == 1
+        assert settings["busy_timeout"] == 5000 and settings["cache_size"] < 0
+        assert migrations.version(conn) == len(migrations.MIGRATIONS)
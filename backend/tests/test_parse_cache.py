@@ -0,0 +1,65 @@
+import os
+import sys
+import asyncio
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services import cache as cache_module, parsing
+from app.services.cache import SqliteCache
+from app.services.content_cache import ContentCache
+
+
+def test_sqlite_cache_entries_expire(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    c = SqliteCache(str(tmp_path / "ttl.db"), "t", max_bytes=1 << 20, ttl_s=60)
+    c.put("a", b"x" * 10)
+    now[0] += 30
+    c.put("b", b"y" * 10)
+    assert c.get("a") is not None  # reads do not extend a row's life
+    now[0] += 40
+    assert c.get("a") is None and c.get("b") is not None
+    assert c.info()["entries"] == 1 and c.info()["bytes"] == 10
+    now[0] += 60
+    assert c.purge_expired() == 1 and c.info()["bytes"] == 0
+
+    c = SqliteCache(str(tmp_path / "ttl.db"), "forever", max_bytes=1 << 20)
+    c.put("a", b"x")
+    now[0] += 10**9
+    assert c.get("a") is not None
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_key_follows_model_prompt_and_text(tmp_path, monkeypatch):
+    cache = ContentCache(str(tmp_path / "content.db"), 1 << 20, 1 << 20, parse_ttl_s=3600)
+    monkeypatch.setattr(parsing, "content_cache", cache)
+    calls = []
+
+    async def fake_llm(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        if "blank" in text:
+            return parsing._default_output()  # what a failed call returns
+        return {**parsing._default_output(), "headline": "Engineer"}
+
+    monkeypatch.setattr(parsing, "_call_anthropic", fake_llm)
+    resume = "Ada Lovelace\nAnalyst  at   Babbage & Co."
+
+    assert parsing.cached(resume) is None
+    assert (await parsing.extract(resume))["headline"] == "Engineer"
+    assert (await parsing.extract(" Ada Lovelace Analyst at Babbage & Co.\n"))["headline"] == "Engineer"
+    assert parsing.cached(resume)["headline"] == "Engineer" and len(calls) == 1
+
+    monkeypatch.setattr(parsing, "PROMPT_VERSION", "edited")
+    assert parsing.cached(resume) is None
+    await parsing.extract(resume)
+    monkeypatch.setattr(parsing, "CLAUDE_MODEL", "another-model")
+    await parsing.extract(resume)
+    assert len(calls) == 3
+
+    await parsing.extract("blank resume")
+    await parsing.extract("blank resume")  # failures are not cached
+    assert len(calls) == 5
+
+    stats = cache.stats()["parse"]
+    assert stats["hits"] == 2 and stats["misses"] == 5 and stats["savedMs"] > 0
+    assert stats["disk"]["entries"] == 3 and stats["disk"]["ttl_s"] == 3600
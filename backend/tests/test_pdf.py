@@ -0,0 +1,70 @@
+import os
+import sys
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services import pdf
+
+
+def _make_pdf(path, pages: int) -> str:
+    import fitz
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"page-{i}")
+        for line in range(30):
+            page.insert_text((72, 100 + line * 20), f"line {line} of page {i} " + "lorem ipsum " * 4)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_extraction_stops_at_the_budgets(tmp_path):
+    path = _make_pdf(tmp_path / "long.pdf", 40)
+    full = pdf.extract_text(path, max_chars=10**9, max_pages=10**9)
+    assert "page-39" in full
+
+    text = pdf.extract_text(path, max_chars=5000)
+    assert len(text) == 5000 and text == full[:5000]
+    assert "page-1" in text and "page-5" not in text  # later pages never laid out
+
+    text = pdf.extract_text(path, max_chars=10**9, max_pages=2)
+    assert "page-1" in text and "page-2" not in text
+
+    text = pdf.extract_text(path, max_chars=10**9, timeout_s=0)  # deadline checked after each page
+    assert "page-0" in text and "page-1" not in text
+
+    assert pdf.extract_text(str(tmp_path / "missing.pdf")) == ""
+
+
+@pytest.mark.asyncio
+async def test_async_extraction_runs_in_the_process_pool(tmp_path):
+    path = _make_pdf(tmp_path / "resume.pdf", 3)
+    try:
+        assert await pdf.aextract_text(path) == pdf.extract_text(path)
+        assert pdf._pool is not None
+    finally:
+        pdf.shutdown()
+    assert pdf._pool is None
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_the_stuck_worker(tmp_path, monkeypatch):
+    import asyncio
+    import time
+    monkeypatch.setattr(pdf, "PDF_TIMEOUT_S", 0.5)
+    monkeypatch.setattr(pdf, "_GRACE_S", 0.5)
+    path = _make_pdf(tmp_path / "resume.pdf", 1)
+    try:
+        await pdf.aextract_text(path)  # start the workers
+        stuck = pdf._pool
+        procs = list(stuck._processes.values())
+        # a page that never finishes, on every worker
+        assert await asyncio.gather(*(pdf._in_pool(time.sleep, 60) for _ in procs)) == [""] * len(procs)
+        assert pdf._pool is not stuck
+        for p in procs:
+            p.join(5)
+            assert not p.is_alive()
+        # the next document gets a fresh pool instead of waiting behind the stuck ones
+        assert "page-0" in await pdf.aextract_text(path)
+    finally:
+        pdf.shutdown()
@@ -0,0 +1,49 @@
+import os
+import sys
+import asyncio
+from sqlalchemy import event
+from sqlmodel import Session
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db.session import engine, init_db, get_async_session
+from app.db.models import Profile
+from app.db.repository import AsyncProfileRepository, ProfileRepository
+
+
+def test_get_many_one_query_in_input_order():
+    init_db()
+    with Session(engine) as db:
+        for i in range(5):
+            db.add(Profile(id=f"repo_{i}", name=f"P{i}", skills_norm_json=f'["s{i}"]', contact_info_json='{"x": 1}'))
+        db.commit()
+
+    statements = []
+    listener = lambda conn, cursor, stmt, *a: statements.append(stmt)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with Session(engine) as db:
+            rows = ProfileRepository(db).get_many(["repo_3", "missing", "repo_0", "repo_4", "repo_3"])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [r.id for r in rows] == ["repo_3", "repo_0", "repo_4"]
+    assert rows[0].skills_norm == ["s3"] and rows[0].topics == [] and rows[0].contact_info == {"x": 1}
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_async_repository_matches_sync():
+    init_db()
+    with Session(engine) as db:
+        for i in range(3):
+            db.merge(Profile(id=f"arepo_{i}", name=f"A{i}", topics_json=f'["t{i}"]'))
+        db.commit()
+        want = [(r.id, r.topics) for r in ProfileRepository(db).get_many(["arepo_2", "nope", "arepo_0"])]
+
+    async def read():
+        async with get_async_session() as db:
+            repo = AsyncProfileRepository(db)
+            rows = await repo.get_many(["arepo_2", "nope", "arepo_0"])
+            return [(r.id, r.topics) for r in rows], await repo.get("arepo_1"), await repo.get("nope")
+
+    got, one, missing = asyncio.run(read())
+    assert got == want == [("arepo_2", ["t2"]), ("arepo_0", ["t0"])]
+    assert one.profile.name == "A1" and missing is None
@@ -0,0 +1,101 @@
+import os
+import sys
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.main import app
+from app.db.session import engine, init_db
+from app.db import terms
+from app.db.models import Profile
+from app.services import vector_store
+from app.services.auth import create_token
+from app.services.embeddings import embed
+from app.services.indexing import profile_metadata, profile_summary
+from app.services.numpy_store import NumpyVectorStore
+from app.services.search_cursors import ResultSetCache, result_sets, decode_cursor, encode_cursor
+
+
+def test_cache_bounds_and_cursor_format(monkeypatch):
+    cache = ResultSetCache(max_ids=5, ttl_s=60)
+    cache.put("a", ["1", "2", "3"], 3, "vector", "")
+    cache.put("b", ["4", "5"], 2, "vector", "")
+    cache.get("a")
+    cache.put("c", ["6", "7"], 2, "vector", "")  # evicts b, the least recently used
+    assert cache.get("b") is None and cache.get("a").ids == ("1", "2", "3")
+    assert cache.put("d", list("abcdef"), 6, "vector", "").total == 6 and cache.get("d") is None  # too big to hold
+    assert cache.stats()["ids"] <= 5
+
+    clock = [100.0]
+    monkeypatch.setattr("app.services.search_cursors.time.monotonic", lambda: clock[0])
+    cache.put("e", ["8"], 1, "vector", "")
+    clock[0] += 61
+    assert cache.get("e") is None
+
+    assert decode_cursor(encode_cursor("k", 40, 20)) == ("k", 40, 20)
+    assert decode_cursor("not-a-cursor") is None
+
+
+def test_cursor_pages_match_numbered_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "_store", NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0))
+    vector_store._stored_vectors.clear()
+    result_sets.clear()
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        profiles = [Profile(id=f"sc_{i:02d}", name=f"P{i}", skills_norm_json=f'["s{i % 3}"]', status="ready")
+                    for i in range(25)]
+        db.add_all(profiles)
+        db.commit()
+        for p in profiles:
+            vector_store.upsert(p.id, embed(profile_summary(p)), profile_metadata(p))
+
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    with TestClient(app) as client:
+        numbered = [client.get("/search", params={"q": "builder", "page": n, "page_size": 10}, headers=auth).json()
+                    for n in (1, 2, 3)]
+        assert [len(r["items"]) for r in numbered] == [10, 10, 5]
+        assert numbered[2]["next_cursor"] is None
+
+        seen, cursor = [], None
+        first = client.get("/search", params={"q": "builder", "page_size": 10}, headers=auth).json()
+        seen.extend(i["id"] for i in first["items"])
+        cursor = first["next_cursor"]
+        while cursor:
+            r = client.get("/search", params={"cursor": cursor}, headers=auth).json()
+            seen.extend(i["id"] for i in r["items"])
+            cursor = r["next_cursor"]
+        assert seen == [i["id"] for r in numbered for i in r["items"]]
+        assert len(set(seen)) == 25
+
+        assert client.get("/search", params={"cursor": "garbage"}, headers=auth).status_code == 400
+        result_sets.clear()
+        assert client.get("/search", params={"cursor": first["next_cursor"]}, headers=auth).status_code == 410
+        for bad in ({"page_size": 0}, {"page_size": -5}, {"page": 0}, {"page_size": 101}):
+            assert client.get("/search", params={"q": "builder", **bad}, headers=auth).status_code == 422
+
+
+def test_filtered_total_is_counted_in_sql(tmp_path, monkeypatch):
+    store = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    monkeypatch.setattr(vector_store, "_store", store)
+    monkeypatch.setattr("app.routers.search.BITMAP_INDEX_ENABLED", False)
+    vector_store._stored_vectors.clear()
+    result_sets.clear()
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        profiles = [Profile(id=f"sq_{i:02d}", name=f"P{i}", skills_norm_json=f'["s{i % 3}"]', status="ready",
+                            available_now=i % 2 == 0) for i in range(12)]
+        db.add_all(profiles)
+        terms.sync(db, profiles)
+        db.commit()
+        for p in profiles:
+            vector_store.upsert(p.id, embed(profile_summary(p)), profile_metadata(p))
+
+    def no_scan(where=None):
+        raise AssertionError("filtered count went to the vector store")
+
+    monkeypatch.setattr(store, "count", no_scan)
+    auth = {"Authorization": f"Bearer {create_token('1')}"}
+    with TestClient(app) as client:
+        r = client.get("/search", params={"skills": "S0", "available_now": True, "exclude_id": "sq_00"}, headers=auth).json()
+    assert r["total"] == 1 and [i["id"] for i in r["items"]] == ["sq_06"]
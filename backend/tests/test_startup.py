@@ -0,0 +1,19 @@
+import os
+import sys
+import json
+import subprocess
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_app_import_keeps_heavy_dependencies_lazy(tmp_path):
+    # chromadb, PyMuPDF, numpy and jose load on first use / warmup, not on import
+    probe = (
+        "import sys, json; import app.main; "
+        "print(json.dumps([m for m in ('chromadb', 'fitz', 'numpy', 'jose', 'passlib') if m in sys.modules]))"
+    )
+    env = dict(os.environ, SQLITE_PATH=str(tmp_path / "h.db"), UPLOAD_DIR=str(tmp_path / "u"),
+               EMBED_CACHE_PATH=str(tmp_path / "e.db"))
+    out = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+    assert not (tmp_path / "e.db").exists()
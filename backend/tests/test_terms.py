@@ -0,0 +1,61 @@
+import os
+import sys
+from sqlmodel import Session, delete, select
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.db import terms
+from app.db.session import engine, init_db
+from app.db.models import Profile, ProfileSkill
+
+
+def _ids(db, field, names):
+    return set(db.exec(select(Profile.id).where(Profile.id.in_(terms.having_any(db, field, names)))).all())
+
+
+def test_links_follow_json_columns():
+    init_db()
+    with Session(engine) as db:
+        db.exec(delete(Profile))
+        terms.rebuild(db)
+        a = Profile(id="t_a", skills_norm_json='["rust", "go"]', topics_json='["rag"]', status="ready")
+        b = Profile(id="t_b", skills_norm_json='["rust", "rust"]', topics_json='[]', status="ready")
+        c = Profile(id="t_c", skills_norm_json='["go"]', status="pending")
+        db.add_all([a, b, c])
+        terms.sync(db, [a, b, c])
+        db.commit()
+
+        assert _ids(db, "skills_norm", ["rust"]) == {"t_a", "t_b"}
+        assert _ids(db, "skills_norm", ["go", "zig"]) == {"t_a", "t_c"}
+        assert _ids(db, "topics", ["zig"]) == set()
+        assert terms.counts(db, "skills_norm") == [("go", 2), ("rust", 2)]
+        assert terms.counts(db, "skills_norm", [Profile.status == "ready"], limit=1) == [("rust", 2)]
+
+        b.skills_norm_json = '["zig"]'
+        terms.sync(db, [b])
+        terms.delete_profiles(db, ["t_c"])
+        db.delete(c)
+        db.commit()
+        assert _ids(db, "skills_norm", ["rust"]) == {"t_a"}
+        assert terms.counts(db, "skills_norm") == [("go", 1), ("rust", 1), ("zig", 1)]
+
+        # backfill reproduces what the write paths maintain
+        db.exec(delete(ProfileSkill))
+        db.commit()
+        assert terms.rebuild(db) == 2
+        assert terms.counts(db, "skills_norm") == [("go", 1), ("rust", 1), ("zig", 1)]
+        assert terms.counts(db, "topics") == [("rag", 1)]
+
+
+def test_names_match_case_insensitively():
+    init_db()
+    with Session(engine) as db:
+        p = Profile(id="t_case", skills_norm_json='["Rust", "React.js"]', topics_json='["Agentic AI"]', status="ready")
+        db.add(p)
+        terms.sync(db, [p])
+        db.commit()
+
+        # stored as the vector store and bitmap index key them
+        assert _ids(db, "skills_norm", ["rust"]) >= {"t_case"}
+        assert _ids(db, "skills_norm", ["RUST "]) >= {"t_case"}
+        assert _ids(db, "skills_norm", ["react"]) >= {"t_case"}
+        assert _ids(db, "topics", ["agentic ai"]) == _ids(db, "topics", ["Agentic AI"]) >= {"t_case"}
+        assert ("Agentic AI", 1) not in terms.counts(db, "topics")
@@ -0,0 +1,186 @@
+import io
+import os
+import sys
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.main import app
+from app.config import UPLOAD_DIR
+from app.db.session import engine, init_db
+from app.db.models import Profile, Upload, User
+from app.services.auth import create_token, hash_password
+from app.services import parsing, pipeline, upload_store
+from app.services.content_cache import ContentCache
+
+
+def _pdf_bytes(text: str) -> bytes:
+    import fitz
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _store(db, content: bytes, user_id: int) -> Upload:
+    sha, size = upload_store.ingest(io.BytesIO(content), 1 << 20)
+    try:
+        upload = upload_store.add(db, sha, size, user_id)
+        db.commit()
+    finally:
+        upload_store.unpin(sha)
+    return upload
+
+
+def _release(db, upload: Upload) -> bool:
+    upload_store.release(db, upload)
+    db.commit()
+    return upload_store.collect(db, upload.sha256, upload.path)
+
+
+def test_same_bytes_share_one_file():
+    init_db()
+    content = _pdf_bytes("shared resume")
+    with Session(engine) as db:
+        before = upload_store.stats(db)
+        a = _store(db, content, user_id=1)
+        b = _store(db, content, user_id=2)
+        assert a.file_id != b.file_id and a.path == b.path and os.path.exists(a.path)
+        after = upload_store.stats(db)
+        assert after["uploads"] - before["uploads"] == 2 and after["files"] - before["files"] == 1
+        assert after["bytesSaved"] - before["bytesSaved"] == len(content)
+
+        assert not _release(db, a)
+        assert os.path.exists(b.path) and db.get(Upload, a.file_id) is None
+        assert _release(db, b)
+        assert not os.path.exists(b.path)
+
+
+def test_file_survives_concurrent_release_and_reupload():
+    init_db()
+    content = _pdf_bytes("retried onboarding")
+    with Session(engine) as db:
+        old = _store(db, content, user_id=1)
+        # a re-upload of the same bytes has stored (pinned) the file, its row not committed yet
+        sha, size = upload_store.ingest(io.BytesIO(content), 1 << 20)
+        assert not _release(db, old)  # the last committed reference goes meanwhile
+        assert os.path.exists(old.path)
+        new = upload_store.add(db, sha, size, user_id=1)
+        db.commit()
+        upload_store.unpin(sha)
+
+        # a delete that rolls back keeps the file with its row
+        upload_store.release(db, new)
+        db.rollback()
+        assert db.get(Upload, new.file_id) is not None and os.path.exists(new.path)
+        assert _release(db, new) and not os.path.exists(new.path)
+
+
+
+def test_reupload_during_the_reference_count_keeps_the_file():
+    init_db()
+    content = _pdf_bytes("re-uploaded while counting")
+    with Session(engine) as db, Session(engine) as other:
+        old = _store(db, content, user_id=1)
+        upload_store.release(db, old)
+        db.commit()
+        count, new = db.exec, []
+
+        def racing_exec(stmt):
+            assert not upload_store._files_lock.locked()  # no lock across the query
+            refs = count(stmt)
+            # the same bytes are stored, committed and unpinned before the count returns
+            new.append(_store(other, content, user_id=2))
+            return refs
+
+        db.exec = racing_exec
+        assert not upload_store.collect(db, old.sha256, old.path)
+        del db.exec
+        assert os.path.exists(new[0].path)
+        assert _release(other, new[0]) and not os.path.exists(new[0].path)
+
+def test_upload_endpoint_streams_and_rejects(monkeypatch):
+    init_db()
+    with Session(engine) as db:
+        owner = User(name="u", email="uploads@example.com", password_hash=hash_password("x"))
+        db.add(owner)
+        db.commit()
+        auth = {"Authorization": f"Bearer {create_token(str(owner.id))}"}
+    content = _pdf_bytes("streamed resume")
+    monkeypatch.setattr(upload_store, "CHUNK_BYTES", 64)  # many chunks per file
+
+    with TestClient(app) as client:
+        def post(body, name="cv.pdf"):
+            return client.post("/uploads", files={"file": (name, body, "application/pdf")}, headers=auth)
+
+        r = post(content)
+        assert r.status_code == 200
+        with Session(engine) as db:
+            up = db.get(Upload, r.json()["file_id"])
+            assert up.size == len(content) and open(up.path, "rb").read() == content
+
+        assert post(b"GIF89a" + content).status_code == 400
+        assert post(content, name="cv.txt").status_code == 400
+        monkeypatch.setattr("app.routers.uploads.ALLOWED_PDF_MB", 0)
+        assert "too large" in post(content).json()["detail"]
+    # rejected uploads leave no partial files behind
+    assert not [f for f in os.listdir(UPLOAD_DIR) if f.endswith(".part")]
+
+
+def test_ingest_stops_at_the_limit():
+    class Stream(io.RawIOBase):
+        read_bytes = 0
+
+        def read(self, n=-1):
+            self.read_bytes += n
+            return b"%PDF" + b"x" * (n - 4)
+
+    src = Stream()  # endless: only the size limit ends the copy
+    with pytest.raises(ValueError, match="too large"):
+        upload_store.ingest(src, 3 * upload_store.CHUNK_BYTES)
+    assert src.read_bytes == 4 * upload_store.CHUNK_BYTES
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_skips_extraction_and_parse(tmp_path, monkeypatch):
+    init_db()
+    cache = ContentCache(str(tmp_path / "content.db"), 1 << 20, 1 << 20)
+    monkeypatch.setattr(pipeline, "content_cache", cache)
+    monkeypatch.setattr(parsing, "content_cache", cache)
+    calls = {"pdf": 0, "llm": 0}
+    extract = pipeline.aextract_text
+
+    async def counting_pdf(path):
+        calls["pdf"] += 1
+        return await extract(path)
+
+    async def fake_llm(text):
+        calls["llm"] += 1
+        assert "duplicate resume" in text
+        await asyncio.sleep(0.01)
+        return {"headline": "Engineer", "skills": {"tech": ["rust"]}}
+
+    monkeypatch.setattr(pipeline, "aextract_text", counting_pdf)
+    monkeypatch.setattr(parsing, "_call_anthropic", fake_llm)
+
+    content = _pdf_bytes("duplicate resume")
+    with Session(engine) as db:
+        for pid in ("dup_first", "dup_second"):
+            up = _store(db, content, user_id=1)
+            db.merge(Profile(id=pid, name=pid, status="pending", resume_file_id=up.file_id))
+        db.commit()
+
+    await pipeline.run("dup_first")
+    assert calls == {"pdf": 1, "llm": 1}
+    await pipeline.run("dup_second")
+    assert calls == {"pdf": 1, "llm": 1}
+    await pipeline.run("dup_first")  # a reembed of unchanged input
+    assert calls == {"pdf": 1, "llm": 1}
+
+    with Session(engine) as db:
+        second = db.get(Profile, "dup_second")
+        assert second.status == "ready" and second.headline == "Engineer"
+    stats = cache.stats()
+    assert stats["text"]["hits"] == 2 and stats["parse"]["hits"] == 2 and stats["parse"]["savedMs"] > 0
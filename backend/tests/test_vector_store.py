@@ -0,0 +1,113 @@
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.numpy_store import NumpyVectorStore
+
+
+def _vec(*xs):
+    v = np.zeros(8, dtype=np.float32)
+    v[:len(xs)] = xs
+    return v.tolist()
+
+
+def _store(tmp_path):
+    s = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    s.upsert("a", _vec(1, 0), {"id": "a", "available_now": True, "hackathon": "h1", "skills_norm": ["rust"]})
+    s.upsert("b", _vec(1, 1), {"id": "b", "available_now": False, "hackathon": "h1"})
+    s.upsert("c", _vec(0, 1), {"id": "c", "available_now": True, "hackathon": "h2", "school": None})
+    return s
+
+
+def test_query_orders_by_cosine_distance(tmp_path):
+    s = _store(tmp_path)
+    res = s.query(_vec(1, 0), n_results=3)
+    assert res["ids"] == [["a", "b", "c"]]
+    d = res["distances"][0]
+    assert abs(d[0]) < 1e-6 and abs(d[1] - (1 - 2 ** -0.5)) < 1e-6 and abs(d[2] - 1) < 1e-6
+    # list metadata is JSON-encoded and None dropped, as for Chroma
+    assert res["metadatas"][0][0]["skills_norm"] == '["rust"]'
+    assert "school" not in res["metadatas"][0][2]
+
+
+def test_filters(tmp_path):
+    s = _store(tmp_path)
+    q = _vec(1, 0)
+    assert s.query(q, 10, where={"available_now": True})["ids"] == [["a", "c"]]
+    assert s.query(q, 10, where={"available_now": True, "hackathon": "h1"})["ids"] == [["a"]]
+    assert s.query(q, 10, where={"hackathon": "nope"})["ids"] == [[]]
+    assert s.query(q, 10, where={"$and": [{"hackathon": {"$in": ["h1", "h2"]}}, {"id": {"$ne": "a"}}]})["ids"] == [["b", "c"]]
+    assert s.query(q, 10, where={"$or": [{"id": "c"}, {"available_now": False}]})["ids"] == [["b", "c"]]
+
+
+def test_upsert_replaces_and_delete_compacts(tmp_path):
+    s = _store(tmp_path)
+    s.upsert("a", _vec(0, 0, 1), {"id": "a", "available_now": False})
+    s.delete("b")
+    s.delete("missing")
+    assert s.count() == 2
+    assert s.query(_vec(0, 0, 1), 1)["ids"] == [["a"]]
+    assert s.query(_vec(0, 1), 10, where={"available_now": True})["ids"] == [["c"]]
+
+
+def test_snapshot_round_trip(tmp_path):
+    s = _store(tmp_path)
+    s.flush()
+    r = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    assert r.count() == 3
+    assert r.query(_vec(1, 0), 10, where={"hackathon": "h1"}) == s.query(_vec(1, 0), 10, where={"hackathon": "h1"})
+    r.upsert("d", _vec(1, 0), {"id": "d", "hackathon": "h3"})
+    assert r.query(_vec(1, 0), 10, where={"hackathon": "h3"})["ids"] == [["d"]]
+
+
+def test_upsert_many_matches_single_upserts(tmp_path):
+    rows = [("a", _vec(1, 0), {"id": "a", "available_now": True}),
+            ("b", _vec(1, 1), {"id": "b", "hackathon": "h1"}),
+            ("a", _vec(0, 1), {"id": "a", "available_now": False})]
+    single = NumpyVectorStore(str(tmp_path / "single"), snapshot_every=0)
+    for pid, v, m in rows:
+        single.upsert(pid, v, m)
+    bulk = NumpyVectorStore(str(tmp_path / "bulk"), snapshot_every=0)
+    bulk.upsert_many([r[0] for r in rows], np.asarray([r[1] for r in rows]), [r[2] for r in rows])
+    assert bulk.count() == single.count() == 2
+    for where in (None, {"available_now": False}, {"hackathon": "h1"}):
+        assert bulk.query(_vec(0, 1), 5, where=where) == single.query(_vec(0, 1), 5, where=where)
+    bulk.delete_many(["a", "b", "zzz"])
+    assert bulk.count() == 0
+
+
+def test_membership_filters(tmp_path):
+    from app.services.vector_store import membership_metadata, any_of, all_of
+    s = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    s.upsert("a", _vec(1, 0), {"id": "a", **membership_metadata("skills_norm", ["Rust", "go"])})
+    s.upsert("b", _vec(1, 1), {"id": "b", **membership_metadata("skills_norm", ["go"])})
+    s.upsert("c", _vec(0, 1), {"id": "c", **membership_metadata("topics", ["drones"])})
+    q = _vec(1, 0)
+    assert s.query(q, 10, where=any_of("skills_norm", ["rust"]))["ids"] == [["a"]]
+    assert s.query(q, 10, where=any_of("skills_norm", ["RUST", "go"]))["ids"] == [["a", "b"]]
+    where = all_of(any_of("skills_norm", ["go"]), {"id": {"$ne": "a"}})
+    assert s.query(q, 10, where=where)["ids"] == [["b"]]
+    assert s.count(where) == 1 and s.count(any_of("topics", ["drones"])) == 1
+    assert s.query(q, 1, where=any_of("skills_norm", ["go"]))["metadatas"][0][0]["skill:rust"] is True
+    # re-upsert drops stale memberships, delete drops all of them
+    s.upsert("a", _vec(1, 0), {"id": "a", **membership_metadata("skills_norm", ["python"])})
+    s.delete("b")
+    assert s.count(any_of("skills_norm", ["go"])) == 0
+    s.flush()
+    r = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    assert r.query(q, 10, where=any_of("skills_norm", ["python"]))["ids"] == [["a"]]
+
+
+def test_query_many_matches_single_queries(tmp_path):
+    rnd = np.random.default_rng(1)
+    s = NumpyVectorStore(str(tmp_path / "idx"), snapshot_every=0)
+    for i in range(40):
+        s.upsert(f"p{i}", rnd.normal(size=8).tolist(), {"id": f"p{i}", "available_now": i % 3 > 0})
+    queries = rnd.normal(size=(5, 8)).tolist()
+    for where, n in ((None, 7), ({"available_now": True}, 4), ({"available_now": True}, 100), ({"id": "none"}, 3)):
+        many = s.query_many(queries, n_results=n, where=where)
+        for j, q in enumerate(queries):
+            one = s.query(q, n_results=n, where=where)
+            assert many["ids"][j] == one["ids"][0]
+            assert many["metadatas"][j] == one["metadatas"][0]
+            assert np.allclose(many["distances"][j], one["distances"][0], atol=1e-6)